@@ -3,11 +3,20 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
+import sys
+
 import reframe as rfm
 import reframe.utility.sanity as sn
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
 
-class NumpyBaseTest(rfm.RunOnlyRegressionTest):
+class NumpyBaseTest(rfm.RunOnlyRegressionTest, GeneratedReferencesMixin,
+                    TopologyJobSizeMixin):
     def __init__(self):
         self.descr = 'Test a few typical numpy operations'
         self.valid_prog_environs = ['foss']
@@ -56,12 +65,11 @@ class NumpyBaseTest(rfm.RunOnlyRegressionTest):
         }
         self.sanity_patterns = sn.assert_found(r'Numpy version:\s+\S+',
                                                self.stdout)
-        self.variables = {
-            'OMP_NUM_THREADS': '$SLURM_CPUS_PER_TASK',
-        }
         self.executable = 'python'
         self.executable_opts = ['np_ops.py']
-        self.num_tasks_per_node = 1
+        # a single task using all cores of the node, see
+        # TopologyJobSizeMixin
+        self.task_domain = 'node'
         self.use_multithreading = False
         self.tags = {'production'}
         self.maintainers = ['Mandes']
@@ -72,18 +80,15 @@ class NumpyEpyc2Test(NumpyBaseTest):
     def __init__(self):
         super().__init__()
         self.valid_systems = ['ubelix:epyc2']
-        self.num_cpus_per_task = 36
 
 @rfm.simple_test
 class NumpyBroadwellTest(NumpyBaseTest):
     def __init__(self):
         super().__init__()
         self.valid_systems = ['ubelix:bdw']
-        self.num_cpus_per_task = 20
 
 @rfm.simple_test
 class NumpyGpuTest(NumpyBaseTest):
     def __init__(self):
         super().__init__()
         self.valid_systems = ['ubelix:gpu']
-        self.num_cpus_per_task = 3
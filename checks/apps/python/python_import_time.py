@@ -0,0 +1,101 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.stats import median  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+@rfm.simple_test
+class PythonImportTimeTest(rfm.RunOnlyRegressionTest,
+                           GeneratedReferencesMixin, TopologyJobSizeMixin):
+    '''Python interpreter start-up and package import time.
+
+    The interpreter start (from the launcher invocation to the first line
+    of the script) and the import time of numpy, scipy, mpi4py and h5py
+    are measured by a single rank, by one rank per core of a node and of
+    four nodes at once. With location 'node_local' the site-packages of
+    the modules are copied to a node-local directory first, which shows
+    the cost of the shared file system metadata accesses:
+
+    rank=3 interpreter_ms=850.123 numpy_ms=210.456 ... total_ms=2100.789
+    '''
+
+    scale = parameter(['single', 'node', 'nodes'])
+    location = parameter(['shared', 'node_local'])
+    packages = variable(list, value=['numpy', 'scipy.linalg', 'mpi4py.MPI',
+                                     'h5py'])
+    local_dir = variable(str, value='/tmp/rfm_python_$SLURM_JOB_ID')
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss']
+    modules = ['SciPy-bundle', 'h5py']
+    executable = 'python'
+    use_multithreading = False
+    time_limit = '20m'
+    maintainers = ['Mandes']
+    tags = {'benchmark', 'python'}
+
+    @run_after('init')
+    def set_job_layout(self):
+        self.descr = (f'Python import time ({self.scale}, '
+                      f'{self.location} site-packages)')
+        if self.scale == 'single':
+            self.task_domain = 'node'
+            self.num_job_nodes = 1
+            self.domains_per_node = 1
+        else:
+            self.task_domain = 'core'
+            self.num_job_nodes = 4 if self.scale == 'nodes' else 1
+
+    @run_before('run')
+    def set_executable_opts(self):
+        self.executable_opts = ['import_time.py'] + self.packages
+        self.variables['OMP_NUM_THREADS'] = '1'
+        if self.location == 'node_local':
+            self.prerun_cmds = [
+                f'srun --nodes=$SLURM_NNODES --ntasks=$SLURM_NNODES '
+                f'--ntasks-per-node=1 ./stage_site_packages.sh '
+                f'{self.local_dir}'
+            ]
+            self.variables['PYTHONPATH'] = (f'{self.local_dir}/site-packages:'
+                                            f'$PYTHONPATH')
+            self.postrun_cmds = [
+                f'srun --nodes=$SLURM_NNODES --ntasks=$SLURM_NNODES '
+                f'--ntasks-per-node=1 rm -rf {self.local_dir}'
+            ]
+
+        # taken as late as possible, right before the launcher
+        self.prerun_cmds += ['export RFM_LAUNCH_NS="$(date +%s%N)"']
+
+    @sanity_function
+    def assert_imports(self):
+        return sn.assert_eq(sn.count(sn.findall(r'^rank=\d+ .*total_ms=',
+                                                self.stdout)),
+                            self.num_tasks)
+
+    @run_after('setup')
+    def set_perf_patterns(self):
+        self.perf_patterns = {}
+        names = ['interpreter', 'total']
+        names += [p.replace('.', '_') for p in self.packages]
+        for name in names:
+            samples = sn.extractall(rf'^rank=\d+ .*\b{name}_ms=(?P<ms>\S+)',
+                                    self.stdout, 'ms', float)
+            self.perf_patterns[f'{name}_max'] = sn.max(samples)
+            self.perf_patterns[f'{name}_median'] = median(samples)
+
+        self.reference = {
+            '*': {perf_var: (0, None, None, 'ms')
+                  for perf_var in self.perf_patterns}
+        }
@@ -0,0 +1,31 @@
+import time
+T_START = time.time_ns()
+
+import importlib
+import os
+import sys
+
+
+# Time from the launcher invocation (exported by the job script in ns) to
+# the first line of this script, and the import time of every package
+# given on the command line, e.g.
+#
+#   rank=3 interpreter_ms=850.123 numpy_ms=210.456 ... total_ms=2100.789
+
+launch = os.getenv('RFM_LAUNCH_NS')
+rank = os.getenv('SLURM_PROCID', os.getenv('PMI_RANK', '0'))
+timings = []
+if launch:
+    timings.append(('interpreter', (T_START - int(launch)) * 1.0e-6))
+
+for name in sys.argv[1:]:
+    t0 = time.perf_counter()
+    importlib.import_module(name)
+    timings.append((name.replace('.', '_'),
+                    (time.perf_counter() - t0) * 1.0e3))
+
+if launch:
+    timings.append(('total', (time.time_ns() - int(launch)) * 1.0e-6))
+
+print(f'rank={rank} ' + ' '.join(f'{name}_ms={value:.3f}'
+                                 for name, value in timings), flush=True)
@@ -0,0 +1,15 @@
+#!/bin/bash
+#
+# Copy the site-packages of the loaded EasyBuild Python modules to a
+# node-local directory, run once per node.
+#
+# Usage: stage_site_packages.sh <directory>
+
+dest=$1/site-packages
+mkdir -p "$dest"
+for root in $(env | sed -n 's/^EBROOT[A-Z0-9]*=//p' | sort -u); do
+    for dir in "$root"/lib/python*/site-packages; do
+        [ -d "$dir" ] && cp -r "$dir"/. "$dest"/
+    done
+done
+echo "Staged $(ls "$dest" | wc -l) entries to $dest on $(hostname)"
@@ -3,10 +3,18 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
+import re
+import sys
+
 import reframe as rfm
 import reframe.utility.osext as osext
 import reframe.utility.sanity as sn
-from reframe.utility import find_modules, functools
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../..')))
+from utils.modules import latest_module  # noqa: E402
+from utils.parsing import OutputParser  # noqa: E402
 
 @rfm.simple_test
 class HDF5Test(rfm.RegressionTest):
@@ -22,11 +30,11 @@ class HDF5Test(rfm.RegressionTest):
     tags = {'production', 'health'}
 
     valid_prog_environs = ['foss', 'intel']
-    module_list = find_modules('HDF5', environ_mapping={
-                    r'.*-gompi-.*': 'foss',
-                    r'.*-iimpi-.*': 'intel',
-                    })
-    module_list = [tup for tup in module_list]
+    # looked up when the test is set up for a partition, see utils/modules.py
+    module_environs = {
+        r'.*-gompi-.*': 'foss',
+        r'.*-iimpi-.*': 'intel',
+    }
 
     @run_after('init')
     def set_description(self):
@@ -39,14 +47,10 @@ class HDF5Test(rfm.RegressionTest):
     @run_after('setup')
     def set_prog_environs(self):
         env = self.current_environ.name
-        env_mods = [tup[2] for tup in self.module_list if tup[1].startswith(env)]
-        env_mods.sort()
-        if (len(env_mods) == 0):
-            sn.assert_false(True,
-                    f'no HDF5 module found for {env}')
-        else:
-            sel = env_mods[-1]
-            self.modules = [sel]
+        sel = latest_module('HDF5', self.current_partition.fullname, env,
+                            self.module_environs)
+        self.skip_if(sel is None, f'no HDF5 module found for {env}')
+        self.modules = [sel]
 
     @run_before('compile')
     def set_sourcepath(self):
@@ -72,46 +76,38 @@ class HDF5Test(rfm.RegressionTest):
     def set_sanity(self):
         # C and Fortran write transposed matrix
         if self.lang == 'c':
-            self.sanity_patterns = sn.all([
-                sn.assert_found(r'Data as written to disk by hyberslabs',
-                                self.stdout),
-                sn.assert_found(r'Data as read from disk by hyperslab',
-                                self.stdout),
-                sn.assert_found(r'\(0,0\): 0, 1, 0, 0, 1, 0, 0, 1,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(0,0\): 0, 1, 0, 0, 1, 0, 0, 1,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(1,0\): 1, 1, 0, 1, 1, 0, 1, 1,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(2,0\): 0, 0, 0, 0, 0, 0, 0, 0,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(3,0\): 0, 1, 0, 0, 1, 0, 0, 1,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(4,0\): 1, 1, 0, 1, 1, 0, 1, 1,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(5,0\): 0, 0, 0, 0, 0, 0, 0, 0',
-                                'h5dump_out.txt'),
-            ])
+            rows = [
+                '0, 1, 0, 0, 1, 0, 0, 1,',
+                '1, 1, 0, 1, 1, 0, 1, 1,',
+                '0, 0, 0, 0, 0, 0, 0, 0,',
+                '0, 1, 0, 0, 1, 0, 0, 1,',
+                '1, 1, 0, 1, 1, 0, 1, 1,',
+                '0, 0, 0, 0, 0, 0, 0, 0',
+            ]
         else:
-            self.sanity_patterns = sn.all([
-                sn.assert_found(r'Data as written to disk by hyberslabs',
-                                self.stdout),
-                sn.assert_found(r'Data as read from disk by hyperslab',
-                                self.stdout),
-                sn.assert_found(r'\(0,0\): 0, 1, 0, 0, 1, 0,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(1,0\): 1, 1, 0, 1, 1, 0,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(2,0\): 0, 0, 0, 0, 0, 0,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(3,0\): 0, 1, 0, 0, 1, 0,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(4,0\): 1, 1, 0, 1, 1, 0,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(5,0\): 0, 0, 0, 0, 0, 0,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(6,0\): 0, 1, 0, 0, 1, 0,',
-                                'h5dump_out.txt'),
-                sn.assert_found(r'\(7,0\): 1, 1, 0, 1, 1, 0',
-                                'h5dump_out.txt'),
-            ])
+            rows = [
+                '0, 1, 0, 0, 1, 0,',
+                '1, 1, 0, 1, 1, 0,',
+                '0, 0, 0, 0, 0, 0,',
+                '0, 1, 0, 0, 1, 0,',
+                '1, 1, 0, 1, 1, 0,',
+                '0, 0, 0, 0, 0, 0,',
+                '0, 1, 0, 0, 1, 0,',
+                '1, 1, 0, 1, 1, 0',
+            ]
+
+        # each file is read once, see OutputParser
+        stdout = OutputParser(self.stdout, {
+            'written': r'Data as written to disk by hyberslabs',
+            'read': r'Data as read from disk by hyperslab'
+        })
+        h5dump = OutputParser('h5dump_out.txt', {
+            'row': r'\((?P<row>\d+),0\): (?P<data>.*)'
+        })
+        self.sanity_patterns = sn.all([
+            stdout.assert_found('written'),
+            stdout.assert_found('read'),
+            *(h5dump.assert_found('row', row=str(i),
+                                  data=re.escape(data) + '.*')
+              for i, data in enumerate(rows))
+        ])
@@ -0,0 +1,113 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import re
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../..')))
+from utils.modules import latest_module  # noqa: E402
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+
+
+@rfm.simple_test
+class HDF5FilterBenchmark(rfm.RegressionTest, GeneratedReferencesMixin):
+    '''Throughput of the HDF5 compression filters.
+
+    For every available filter (none, shuffle, gzip, shuffle-gzip, szip
+    and the LZF/Blosc plugins if found in HDF5_PLUGIN_PATH) the benchmark
+    reports the compression ratio, the throughput of the filter pipeline
+    alone (in-memory core driver) and the end-to-end file bandwidth:
+
+    filter=gzip chunk=256 ratio=3.760 compress_MBps=16.74 ...
+    '''
+
+    dtype = parameter(['float', 'int'])
+    chunk = parameter([64, 256, 1024])
+    valid_systems = ['ubelix:epyc2', 'ubelix:bdw']
+    valid_prog_environs = ['foss', 'intel']
+    build_system = 'SingleSource'
+    sourcepath = 'h5_filter_bench.c'
+    num_tasks = 1
+    num_tasks_per_node = 1
+    exclusive_access = True
+    time_limit = '30m'
+    # dataset dimensions, 4096x4096 elements are 64 MiB
+    dims = variable(list, value=[4096, 4096])
+    # directory of the output file, defaults to the stage directory
+    test_dir = variable(str, value='.')
+    maintainers = ['Mandes']
+    tags = {'benchmark', 'io'}
+
+    # looked up when the test is set up for a partition, see utils/modules.py
+    module_environs = {
+        r'.*-gompi-.*': 'foss',
+        r'.*-iimpi-.*': 'intel',
+    }
+
+    @run_after('init')
+    def set_description(self):
+        self.descr = (f'HDF5 compression filter benchmark ({self.dtype}, '
+                      f'chunk {self.chunk}x{self.chunk})')
+
+    @run_after('setup')
+    def set_prog_environs(self):
+        env = self.current_environ.name
+        sel = latest_module('HDF5', self.current_partition.fullname, env,
+                            self.module_environs)
+        self.skip_if(sel is None, f'no HDF5 module found for {env}')
+        self.modules = [sel]
+
+    @run_before('compile')
+    def set_ldflags(self):
+        self.build_system.cflags = ['-O2']
+        self.build_system.cppflags = ['-I$EBROOTHDF5/include']
+        self.build_system.ldflags = ['-L$EBROOTHDF5/lib', '-lhdf5', '-lm']
+
+    @run_before('run')
+    def set_executable_opts(self):
+        self.executable_opts = [
+            self.dtype, str(self.chunk), str(self.dims[0]),
+            str(self.dims[1]),
+            f'{self.test_dir}/h5_filter_bench.{self.current_partition.name}'
+            f'.{self.dtype}.{self.chunk}.h5'
+        ]
+
+    @sanity_function
+    def eval_sanity(self):
+        # the perf patterns are generated for the filters actually run
+        filters = sn.evaluate(sn.extractall(
+            r'^filter=(?P<filter>\S+) chunk=\d+ ratio=',
+            self.stdout, 'filter'))
+        sn.evaluate(sn.assert_ge(len(filters), 1,
+                                 msg='no HDF5 filter could be run'))
+        sn.evaluate(sn.assert_not_found(r'verify=FAILED', self.stdout,
+                                        msg='data read back differs'))
+
+        metrics = {
+            'ratio': ('ratio', 'ratio'),
+            'compress': ('compress_MBps', 'MB/s'),
+            'decompress': ('decompress_MBps', 'MB/s'),
+            'file_write': ('file_write_MBps', 'MB/s'),
+            'file_read': ('file_read_MBps', 'MB/s'),
+        }
+        self.perf_patterns = {}
+        self.reference = {}
+        partition_name = self.current_partition.fullname
+        for name in filters:
+            for metric, (key, unit) in metrics.items():
+                perf_var = f'{name}_{metric}'
+                ref_name = f'{partition_name}:{perf_var}'
+                self.reference[ref_name] = (0.0, None, None, unit)
+                self.perf_patterns[perf_var] = sn.extractsingle(
+                    rf'^filter={re.escape(name)} chunk=\d+.* '
+                    rf'{key}=(?P<value>\S+)',
+                    self.stdout, 'value', float)
+
+        return True
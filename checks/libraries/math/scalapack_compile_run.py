@@ -3,35 +3,32 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
+import sys
+
 import reframe as rfm
 import reframe.utility.sanity as sn
-from reframe.utility import find_modules, functools
 
-@rfm.simple_test
-class ScaLAPACKTest(rfm.RegressionTest):
-    linkage = parameter(['static', 'dynamic'])
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../..')))
+from utils.modules import latest_module  # noqa: E402
+from utils.references import GeneratedReferencesMixin  # noqa: E402
 
-    sourcepath = 'sample_pdsyev_call.f'
-    valid_systems = ['ubelix:epyc2', 'ubelix:bdw']
-    valid_prog_environs = ['foss']
-    num_tasks = 16
-    num_tasks_per_node = 8
+
+class ScaLAPACKBaseTest(rfm.RegressionTest):
     build_system = 'SingleSource'
     maintainers = ['Mandes']
-    tags = {'production', 'external-resources'}
 
-    module_list = find_modules('ScaLAPACK', environ_mapping={
-                    r'.*-gompi-.*': 'foss',
-                    })
-
-    @run_after('setup')
-    def set_build_flags(self):
-        env = self.current_environ.name
-        if env == 'foss':
-            self.build_system.fflags = ['-O3 -lscalapack']
-        elif env == 'intel':
-            self.build_system.fflags = ['-O3 -L${EBROOTIMKL}/lib/intel64 -lmkl_blacs_intelmpi_ilp64 -lmkl_lapack95_ilp64 -lmkl_scalapack_ilp64 -lmkl_blas95_ilp64 -lmkl_intel_ilp64 -lmkl_core -mkl -ldl -lm']
+    # looked up when the test is set up for a partition, see utils/modules.py
+    module_environs = {
+        r'.*-gompi-.*': 'foss',
+    }
 
+    # link flags of the ScaLAPACK implementation per programming environment
+    scalapack_libs = {
+        'foss': ['-lscalapack'],
+        'intel': ['-L${EBROOTIMKL}/lib/intel64 -lmkl_blacs_intelmpi_ilp64 -lmkl_lapack95_ilp64 -lmkl_scalapack_ilp64 -lmkl_blas95_ilp64 -lmkl_intel_ilp64 -lmkl_core -mkl -ldl -lm'],
+    }
 
     @run_after('setup')
     def set_module(self):
@@ -42,15 +39,27 @@ class ScaLAPACKTest(rfm.RegressionTest):
         ## neglecting gompic versions
         env = self.current_environ.name
         if env in ['foss']:
-            env_mods = [tup[2] for tup in self.module_list
-                        if tup[1].startswith(env)]
-            env_mods.sort()
-            if (len(env_mods) == 0):
-                sn.assert_false(True,
-                        f'no ScaLAPACK module for gompi')
-            else:
-                sel = env_mods[-1]
-                self.modules = [sel]
+            sel = latest_module('ScaLAPACK', self.current_partition.fullname,
+                                env, self.module_environs)
+            self.skip_if(sel is None, 'no ScaLAPACK module for gompi')
+            self.modules = [sel]
+
+
+@rfm.simple_test
+class ScaLAPACKTest(ScaLAPACKBaseTest):
+    linkage = parameter(['static', 'dynamic'])
+
+    sourcepath = 'sample_pdsyev_call.f'
+    valid_systems = ['ubelix:epyc2', 'ubelix:bdw']
+    valid_prog_environs = ['foss']
+    num_tasks = 16
+    num_tasks_per_node = 8
+    tags = {'production', 'external-resources'}
+
+    @run_after('setup')
+    def set_build_flags(self):
+        env = self.current_environ.name
+        self.build_system.fflags = ['-O3'] + self.scalapack_libs.get(env, [])
 
     @run_before('sanity')
     def set_sanity_patterns(self):
@@ -83,3 +92,93 @@ class ScaLAPACKTest(rfm.RegressionTest):
             scalapack_sanity(4, 3, 0.2483911184660867),
             scalapack_sanity(4, 4, 0.1701907253504270)
         ])
+
+
+@rfm.simple_test
+class ScaLAPACKBenchmark(ScaLAPACKBaseTest, GeneratedReferencesMixin):
+    '''Performance of PDGEMM, PDPOTRF, PDSYEV and PDSYEVD.
+
+    The process grid shape and the block size are swept, for each routine
+    the time and the Gflop/s are reported:
+
+    pdpotrf: N=8192 NB=64 grid=4x4 info=0 time=1.234 s gflops=890.12
+
+    PDSYEV solves a smaller matrix than the others, it takes several
+    times longer than PDSYEVD and would not finish on the smallest grids
+    within the time limit.
+    '''
+
+    grid = parameter([(2, 2), (2, 4), (4, 2), (4, 4), (2, 8), (8, 2),
+                      (4, 8)])
+    block_size = parameter([32, 64, 128, 256])
+    matrix_size = variable(int, value=8192)
+    pdsyev_matrix_size = variable(int, value=4096)
+    routines = variable(list, value=['pdgemm', 'pdpotrf', 'pdsyev',
+                                     'pdsyevd'])
+
+    sourcepath = 'scalapack_bench.c'
+    valid_systems = ['ubelix:epyc2', 'ubelix:bdw']
+    valid_prog_environs = ['foss', 'intel']
+    num_tasks_per_node = 8
+    exclusive_access = True
+    time_limit = '1h'
+    variables = {
+        'OMP_NUM_THREADS': '1',
+        'MKL_NUM_THREADS': '1',
+    }
+    tags = {'benchmark'}
+
+    @run_after('init')
+    def set_description(self):
+        nprow, npcol = self.grid
+        self.descr = (f'ScaLAPACK benchmark N={self.matrix_size} '
+                      f'NB={self.block_size} grid={nprow}x{npcol}')
+        self.num_tasks = nprow * npcol
+        self.num_tasks_per_node = min(self.num_tasks,
+                                      self.num_tasks_per_node)
+
+    @run_after('setup')
+    def set_build_flags(self):
+        env = self.current_environ.name
+        self.build_system.cflags = ['-O3']
+        if env == 'foss':
+            self.build_system.ldflags = self.scalapack_libs['foss'] + [
+                '-L$EBROOTOPENBLAS/lib', '-lopenblas', '-lgfortran', '-lm'
+            ]
+        elif env == 'intel':
+            self.build_system.cppflags = ['-DMKL_ILP64']
+            self.build_system.ldflags = self.scalapack_libs['intel']
+
+    @run_before('run')
+    def set_executable_opts(self):
+        nprow, npcol = self.grid
+        self.executable_opts = [str(self.matrix_size), str(self.block_size),
+                                str(nprow), str(npcol),
+                                str(self.pdsyev_matrix_size)]
+
+    @run_after('setup')
+    def set_perf_patterns(self):
+        self.perf_patterns = {}
+        self.reference = {}
+        partition_name = self.current_partition.fullname
+        for routine in self.routines:
+            for key, unit in [('time', 's'), ('gflops', 'Gflop/s')]:
+                perf_var = f'{routine}_{key}'
+                self.reference[f'{partition_name}:{perf_var}'] = (
+                    0.0, None, None, unit
+                )
+                self.perf_patterns[perf_var] = sn.extractsingle(
+                    rf'^{routine}: .* {key}=\s*(?P<value>\S+)',
+                    self.stdout, 'value', float)
+
+    @sanity_function
+    def assert_routines(self):
+        assertions = []
+        for routine in self.routines:
+            # PDGEMM has no info argument, only that it ran is checked
+            status = 'time=' if routine == 'pdgemm' else 'info=0 '
+            assertions.append(sn.assert_found(
+                rf'^{routine}: N=\d+ .* {status}', self.stdout,
+                msg=f'{routine} failed or did not run'))
+
+        return sn.all(assertions)
@@ -0,0 +1,232 @@
+/*
+ * ScaLAPACK performance benchmark
+ *
+ * Times PDGEMM, PDPOTRF, PDSYEV and PDSYEVD on a distributed N x N
+ * matrix using a nprow x npcol BLACS process grid and NB x NB blocks.
+ * PDSYEV, much slower than PDSYEVD, solves the leading N_syev x N_syev
+ * submatrix, N by default.
+ *
+ * Usage: scalapack_bench <N> <NB> <nprow> <npcol> [<N_syev>]
+ *
+ * For each routine rank 0 prints
+ *
+ *   pdpotrf: N=8192 NB=64 grid=4x4 info=0 time=1.234 s gflops=890.12
+ *
+ * PDGEMM has no info argument, its line has no info field.
+ *
+ * The flop counts are 2 N^3 for PDGEMM and N^3 / 3 for PDPOTRF. For the
+ * eigensolvers (eigenvalues and eigenvectors) the nominal 4/3 N^3 of the
+ * tridiagonal reduction plus 2 N^3 of the back transformation is used, so
+ * their Gflop/s are comparable between grids and block sizes rather than
+ * absolute.
+ *
+ * Compile with -DMKL_ILP64 for the 64-bit integer MKL ScaLAPACK.
+ */
+#include <mpi.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#ifdef MKL_ILP64
+typedef long long int_t;
+#else
+typedef int int_t;
+#endif
+
+extern void blacs_pinfo_(int_t *, int_t *);
+extern void blacs_get_(int_t *, int_t *, int_t *);
+extern void blacs_gridinit_(int_t *, char *, int_t *, int_t *);
+extern void blacs_gridinfo_(int_t *, int_t *, int_t *, int_t *, int_t *);
+extern void blacs_gridexit_(int_t *);
+extern int_t numroc_(int_t *, int_t *, int_t *, int_t *, int_t *);
+extern void descinit_(int_t *, int_t *, int_t *, int_t *, int_t *, int_t *,
+                      int_t *, int_t *, int_t *, int_t *);
+extern void pdgemm_(char *, char *, int_t *, int_t *, int_t *, double *,
+                    double *, int_t *, int_t *, int_t *, double *, int_t *,
+                    int_t *, int_t *, double *, double *, int_t *, int_t *,
+                    int_t *);
+extern void pdpotrf_(char *, int_t *, double *, int_t *, int_t *, int_t *,
+                     int_t *);
+extern void pdsyev_(char *, char *, int_t *, double *, int_t *, int_t *,
+                    int_t *, double *, double *, int_t *, int_t *, int_t *,
+                    double *, int_t *, int_t *);
+extern void pdsyevd_(char *, char *, int_t *, double *, int_t *, int_t *,
+                     int_t *, double *, double *, int_t *, int_t *, int_t *,
+                     double *, int_t *, int_t *, int_t *, int_t *);
+
+static int_t izero = 0, ione = 1;
+
+/* Deterministic symmetric matrix, diagonally dominant for PDPOTRF */
+static double
+element(int_t i, int_t j, int_t n)
+{
+    int_t lo = i < j ? i : j, hi = i < j ? j : i;
+    double v = (double) ((lo * 7919 + hi * 104729) % 1000) / 1000.0;
+
+    return (i == j) ? v + (double) n : v;
+}
+
+/* Fill the local part of a block-cyclically distributed matrix */
+static void
+fill(double *a, int_t lld, int_t n, int_t nb, int_t myrow, int_t mycol,
+     int_t nprow, int_t npcol, int_t mloc, int_t nloc)
+{
+    int_t il, jl;
+
+    for (jl = 0; jl < nloc; jl++) {
+        int_t j = ((jl / nb) * npcol + mycol) * nb + jl % nb;
+        for (il = 0; il < mloc; il++) {
+            int_t i = ((il / nb) * nprow + myrow) * nb + il % nb;
+            a[il + jl * lld] = element(i, j, n);
+        }
+    }
+}
+
+static void
+report(int_t iam, const char *name, int_t n, int_t nb, int_t nprow,
+       int_t npcol, const int_t *info, double t, double flops)
+{
+    if (iam == 0) {
+        printf("%s: N=%lld NB=%lld grid=%lldx%lld ", name, (long long) n,
+               (long long) nb, (long long) nprow, (long long) npcol);
+        /* NULL for routines without an info argument */
+        if (info != NULL)
+            printf("info=%lld ", (long long) *info);
+        printf("time=%.3f s gflops=%.2f\n", t, flops / t * 1.0e-9);
+        fflush(stdout);
+    }
+}
+
+int
+main(int argc, char *argv[])
+{
+    int_t n, n_syev, nb, nprow, npcol, iam, nprocs, ictxt, myrow, mycol;
+    int_t mloc, nloc, lld, info, lwork, liwork, *iwork, iwkopt;
+    int_t desca[9], descb[9], descc[9], descz[9];
+    double *a, *b, *c, *z, *w, *work, wkopt, t, alpha = 1.0, beta = 0.0;
+    double dn, dn_syev;
+    size_t nelem;
+    char order[] = "Row", no[] = "N", jobz[] = "V", uplo[] = "L";
+
+    MPI_Init(&argc, &argv);
+
+    if (argc != 5 && argc != 6) {
+        fprintf(stderr, "usage: %s <N> <NB> <nprow> <npcol> [<N_syev>]\n",
+                argv[0]);
+        MPI_Abort(MPI_COMM_WORLD, 1);
+    }
+    n = atoll(argv[1]);
+    nb = atoll(argv[2]);
+    nprow = atoll(argv[3]);
+    npcol = atoll(argv[4]);
+    n_syev = argc == 6 ? atoll(argv[5]) : n;
+    if (n_syev < 1 || n_syev > n)
+        n_syev = n;
+    dn = (double) n;
+    dn_syev = (double) n_syev;
+
+    blacs_pinfo_(&iam, &nprocs);
+    if (nprow * npcol != nprocs) {
+        if (iam == 0)
+            fprintf(stderr, "grid %lldx%lld does not match %lld processes\n",
+                    (long long) nprow, (long long) npcol, (long long) nprocs);
+        MPI_Abort(MPI_COMM_WORLD, 1);
+    }
+    blacs_get_(&izero, &izero, &ictxt);
+    blacs_gridinit_(&ictxt, order, &nprow, &npcol);
+    blacs_gridinfo_(&ictxt, &nprow, &npcol, &myrow, &mycol);
+
+    mloc = numroc_(&n, &nb, &myrow, &izero, &nprow);
+    nloc = numroc_(&n, &nb, &mycol, &izero, &npcol);
+    lld = mloc > 1 ? mloc : 1;
+    descinit_(desca, &n, &n, &nb, &nb, &izero, &izero, &ictxt, &lld, &info);
+    descinit_(descb, &n, &n, &nb, &nb, &izero, &izero, &ictxt, &lld, &info);
+    descinit_(descc, &n, &n, &nb, &nb, &izero, &izero, &ictxt, &lld, &info);
+    descinit_(descz, &n, &n, &nb, &nb, &izero, &izero, &ictxt, &lld, &info);
+
+    nelem = (size_t) lld * (size_t) (nloc > 1 ? nloc : 1);
+    a = malloc(nelem * sizeof(double));
+    b = malloc(nelem * sizeof(double));
+    c = malloc(nelem * sizeof(double));
+    z = malloc(nelem * sizeof(double));
+    w = malloc((size_t) n * sizeof(double));
+    if (!a || !b || !c || !z || !w) {
+        fprintf(stderr, "rank %lld: out of memory\n", (long long) iam);
+        MPI_Abort(MPI_COMM_WORLD, 1);
+    }
+
+    if (iam == 0) {
+        printf("ScaLAPACK benchmark: N=%lld NB=%lld grid=%lldx%lld "
+               "local=%lldx%lld\n", (long long) n, (long long) nb,
+               (long long) nprow, (long long) npcol, (long long) mloc,
+               (long long) nloc);
+    }
+
+    /* PDGEMM */
+    fill(a, lld, n, nb, myrow, mycol, nprow, npcol, mloc, nloc);
+    fill(b, lld, n, nb, myrow, mycol, nprow, npcol, mloc, nloc);
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime();
+    pdgemm_(no, no, &n, &n, &n, &alpha, a, &ione, &ione, desca, b, &ione,
+            &ione, descb, &beta, c, &ione, &ione, descc);
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime() - t;
+    report(iam, "pdgemm", n, nb, nprow, npcol, NULL, t, 2.0 * dn * dn * dn);
+
+    /* PDPOTRF */
+    fill(a, lld, n, nb, myrow, mycol, nprow, npcol, mloc, nloc);
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime();
+    pdpotrf_(uplo, &n, a, &ione, &ione, desca, &info);
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime() - t;
+    report(iam, "pdpotrf", n, nb, nprow, npcol, &info, t,
+           dn * dn * dn / 3.0);
+
+    /* PDSYEV, on the leading submatrix of the same distribution */
+    fill(a, lld, n, nb, myrow, mycol, nprow, npcol, mloc, nloc);
+    lwork = -1;
+    pdsyev_(jobz, uplo, &n_syev, a, &ione, &ione, desca, w, z, &ione, &ione,
+            descz, &wkopt, &lwork, &info);
+    lwork = (int_t) wkopt;
+    work = malloc((size_t) lwork * sizeof(double));
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime();
+    pdsyev_(jobz, uplo, &n_syev, a, &ione, &ione, desca, w, z, &ione, &ione,
+            descz, work, &lwork, &info);
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime() - t;
+    free(work);
+    report(iam, "pdsyev", n_syev, nb, nprow, npcol, &info, t,
+           (4.0 / 3.0 + 2.0) * dn_syev * dn_syev * dn_syev);
+
+    /* PDSYEVD */
+    fill(a, lld, n, nb, myrow, mycol, nprow, npcol, mloc, nloc);
+    lwork = -1;
+    liwork = -1;
+    pdsyevd_(jobz, uplo, &n, a, &ione, &ione, desca, w, z, &ione, &ione,
+             descz, &wkopt, &lwork, &iwkopt, &liwork, &info);
+    lwork = (int_t) wkopt;
+    liwork = iwkopt;
+    work = malloc((size_t) lwork * sizeof(double));
+    iwork = malloc((size_t) liwork * sizeof(int_t));
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime();
+    pdsyevd_(jobz, uplo, &n, a, &ione, &ione, desca, w, z, &ione, &ione,
+             descz, work, &lwork, iwork, &liwork, &info);
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime() - t;
+    free(work);
+    free(iwork);
+    report(iam, "pdsyevd", n, nb, nprow, npcol, &info, t,
+           (4.0 / 3.0 + 2.0) * dn * dn * dn);
+
+    free(a);
+    free(b);
+    free(c);
+    free(z);
+    free(w);
+    blacs_gridexit_(&ictxt);
+    MPI_Finalize();
+    return 0;
+}
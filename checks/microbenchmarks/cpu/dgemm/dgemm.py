@@ -3,15 +3,34 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
+import sys
+
 import reframe as rfm
 import reframe.utility.sanity as sn
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.counters import PerfCountersMixin  # noqa: E402
+from utils.energy import EnergyMixin  # noqa: E402
+from utils.parsing import OutputParser  # noqa: E402
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
 
 @rfm.simple_test
-class DGEMMTest(rfm.RegressionTest):
+class DGEMMTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                TopologyJobSizeMixin, EnergyMixin, PerfCountersMixin):
     def __init__(self):
         self.descr = 'DGEMM performance test'
         self.sourcepath = 'dgemm.c'
+        # stdout is parsed once for the sanity and all nodes, see
+        # OutputParser
+        self.output = OutputParser(self.stdout, {
+            'time': r'(?P<hostname>\S+):\s+Time for \d+ DGEMM operations',
+            'gflops': r'(?P<hostname>\S+):\s+Avg\. performance\s+:\s+'
+                      r'(?P<gflops>\S+)\sGflop/s'
+        })
         self.sanity_patterns = self.eval_sanity()
 
         # the perf patterns are automaticaly generated inside sanity
@@ -19,8 +38,9 @@ class DGEMMTest(rfm.RegressionTest):
         self.valid_systems = ['ubelix:gpu', 'ubelix:ivy', 'ubelix:bdw', 'ubelix:epyc2']
         self.valid_prog_environs = ['foss', 'intel']
 
-        #self.num_tasks = 0
-        #self.num_tasks = 4
+        # one task per node filling all cores, see TopologyJobSizeMixin
+        self.task_domain = 'node'
+        self.num_job_nodes = 2
         self.use_multithreading = False
         self.executable_opts = ['6144', '12288', '3072']
         self.build_system = 'SingleSource'
@@ -31,9 +51,14 @@ class DGEMMTest(rfm.RegressionTest):
             'ubelix:bdw': (100.0, -0.15, None, 'Gflop/s'),
             'ubelix:epyc2': (100.0, -0.15, None, 'Gflop/s'),
         }
+        self.efficiency_unit = 'Gflop/W'
         self.maintainers = ['Man']
         self.tags = {'benchmark', 'diagnostic'}
 
+    def work_rate(self):
+        # Gflop/s of all nodes for the energy efficiency, see EnergyMixin
+        return sn.sum(self.output.extractall('gflops', 'gflops', float))
+
     @rfm.run_before('compile')
     def setflags(self):
         if self.current_environ.name.startswith('foss'):
@@ -51,47 +76,31 @@ class DGEMMTest(rfm.RegressionTest):
             ]
 
     @rfm.run_before('run')
-    def set_tasks(self):
-        if self.current_partition.fullname in ['ubelix:gpu']:
-            self.num_tasks = 1
-            self.num_cpus_per_task = 3
-        elif self.current_partition.fullname in ['ubelix:ivy']:
-            self.num_tasks = 1
-            self.num_cpus_per_task = 16
-        elif self.current_partition.fullname in ['ubelix:bdw']:
-            self.num_tasks = 4
-            self.num_cpus_per_task = 20
-        elif self.current_partition.fullname in ['ubelix:epyc2']:
-            self.num_tasks = 2
-            self.num_cpus_per_task = 10
-
-        if self.num_cpus_per_task:
-            self.variables = {
-                'OMP_NUM_THREADS': str(self.num_cpus_per_task),
-                'OMP_BIND': 'cores',
-                'OMP_PROC_BIND': 'spread',
-                'OMP_SCHEDULE': 'static'
-            }
+    def set_omp_variables(self):
+        self.variables.update({
+            'OMP_BIND': 'cores',
+            'OMP_PROC_BIND': 'spread',
+            'OMP_SCHEDULE': 'static'
+        })
 
     @sn.sanity_function
     def eval_sanity(self):
-        all_tested_nodes = sn.evaluate(sn.extractall(
-            r'(?P<hostname>\S+):\s+Time for \d+ DGEMM operations',
-            self.stdout, 'hostname'))
+        all_tested_nodes = sn.evaluate(self.output.extractall(
+            'time', 'hostname'))
         num_tested_nodes = len(all_tested_nodes)
         failure_msg = ('Requested %s node(s), but found %s node(s)' %
                        (self.job.num_tasks, num_tested_nodes))
         sn.evaluate(sn.assert_eq(num_tested_nodes, self.job.num_tasks,
                                  msg=failure_msg))
 
+        # the performance of all nodes from the same parse of the output
+        gflops = self.output.lookup('gflops', 'hostname', 'gflops', float)
         for hostname in all_tested_nodes:
             partition_name = self.current_partition.fullname
             ref_name = '%s:%s' % (partition_name, hostname)
             self.reference[ref_name] = self.sys_reference.get(
                 partition_name, (0.0, None, None, 'Gflop/s')
             )
-            self.perf_patterns[hostname] = sn.extractsingle(
-                r'%s:\s+Avg\. performance\s+:\s+(?P<gflops>\S+)'
-                r'\sGflop/s' % hostname, self.stdout, 'gflops', float)
+            self.perf_patterns[hostname] = gflops[hostname]
 
         return True
@@ -3,12 +3,22 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
+import sys
+
 import reframe as rfm
 import reframe.utility.sanity as sn
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.counters import PerfCountersMixin  # noqa: E402
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.repeat import RepeatedRunMixin  # noqa: E402
+
 
 @rfm.parameterized_test(['nompi'], ['mpi'])
-class FFTWTest(rfm.RegressionTest):
+class FFTWTest(rfm.RegressionTest, GeneratedReferencesMixin,
+               RepeatedRunMixin, PerfCountersMixin):
     def __init__(self, exec_mode):
         self.sourcepath = 'fftw_benchmark.c'
         self.build_system = 'SingleSource'
@@ -17,14 +27,15 @@ class FFTWTest(rfm.RegressionTest):
         self.valid_prog_environs = ['foss']
         self.num_tasks_per_node = 12
         self.num_gpus_per_node = 0
-        self.sanity_patterns = sn.assert_eq(
-            sn.count(sn.findall(r'execution time', self.stdout)), 1)
+        exec_time = sn.extractall(r'execution time:\s+(?P<exec_time>\S+)',
+                                  self.stdout, 'exec_time', float)
+        self.sanity_patterns = self.assert_samples(exec_time)
+        # no time limit of its own to scale, so fewer runs, see
+        # RepeatedRunMixin
+        self.num_repeats = 3
         self.build_system.cflags = ['-O2 -lfftw3']
-        self.perf_patterns = {
-            'fftw_exec_time': sn.extractsingle(
-                r'execution time:\s+(?P<exec_time>\S+)', self.stdout,
-                'exec_time', float),
-        }
+        self.perf_patterns = {}
+        self.repeated_perf_variable('fftw_exec_time', exec_time, 's')
 
         if exec_mode == 'nompi':
             self.num_tasks = 12
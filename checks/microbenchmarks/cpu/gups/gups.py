@@ -0,0 +1,127 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+class GupsBaseTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                   TopologyJobSizeMixin):
+    '''Random access updates of a large table (HPCC RandomAccess).
+
+    Every update reads and writes a random 64-bit word of the table, so
+    the result depends on the TLB reach and the number of outstanding
+    memory requests rather than on the bandwidth measured by StreamTest:
+
+    gups=0.3479
+    errors=123 fraction=0.000000
+
+    The updates are verified by applying them again; at most 1% of them
+    may be lost to unsynchronized threads, as in HPCC.
+    '''
+
+    # log2 of the table size in 64-bit words
+    table_log2 = variable(int)
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss', 'intel']
+    build_system = 'SingleSource'
+    exclusive_access = True
+    use_multithreading = False
+    time_limit = '20m'
+    maintainers = ['Mandes']
+    tags = {'benchmark'}
+
+    @run_after('init')
+    def set_perf_patterns(self):
+        self.perf_patterns = {
+            'gups': sn.extractsingle(r'^gups=(\S+)', self.stdout, 1, float)
+        }
+        self.reference = {
+            '*': {
+                'gups': (0, None, None, 'GUP/s')
+            }
+        }
+
+    @run_before('run')
+    def set_table_size(self):
+        self.executable_opts = [str(self.table_log2)]
+
+    @sanity_function
+    def assert_updates(self):
+        return sn.all([
+            sn.assert_found(r'^gups=', self.stdout),
+            sn.assert_le(sn.extractsingle(r'^errors=\d+ fraction=(\S+)',
+                                          self.stdout, 1, float), 0.01)
+        ])
+
+
+@rfm.simple_test
+class GupsOpenMPTest(GupsBaseTest):
+    '''Updates by the OpenMP threads of one node in a table of 8 GiB.'''
+
+    table_log2 = 30
+    sourcepath = 'gups_omp.c'
+    # one task with the whole node, see TopologyJobSizeMixin
+    task_domain = 'node'
+
+    @run_after('init')
+    def set_description(self):
+        self.descr = 'GUPS single node (OpenMP)'
+
+    @run_before('compile')
+    def set_cflags(self):
+        self.build_system.cflags = {
+            'foss': ['-O3', '-fopenmp'],
+            'intel': ['-O3', '-qopenmp'],
+        }.get(self.current_environ.name, ['-O3'])
+
+    @run_before('run')
+    def set_binding(self):
+        self.variables.update({
+            'OMP_PLACES': 'cores',
+            'OMP_PROC_BIND': 'spread'
+        })
+
+
+@rfm.simple_test
+class GupsMPITest(GupsBaseTest):
+    '''Updates of a table distributed over the ranks of several nodes.
+
+    Every rank owns 32 MiB of the table and exchanges the updates with
+    the owners in chunks of 1024 with MPI_Alltoallv, which exposes the
+    message rate of the network at scale.
+    '''
+
+    nodes = parameter([1, 2, 4])
+    table_log2 = 22
+    sourcepath = 'gups_mpi.c'
+    # one rank per core, see TopologyJobSizeMixin
+    task_domain = 'core'
+    extra_resources = {
+        'switches': {
+            'num_switches': 1
+        }
+    }
+
+    @run_after('init')
+    def set_description(self):
+        self.descr = f'GUPS on {self.nodes} nodes (MPI)'
+        self.num_job_nodes = self.nodes
+        self.perf_patterns['gups_per_node'] = sn.extractsingle(
+            r'^gups_per_node=(\S+)', self.stdout, 1, float)
+        self.reference['*:gups_per_node'] = (0, None, None, 'GUP/s')
+
+    @run_before('compile')
+    def set_cflags(self):
+        self.build_system.cflags = ['-O3']
@@ -0,0 +1,61 @@
+/*
+ * Random number stream of the HPCC RandomAccess benchmark.
+ *
+ * The updates of the table are driven by the stream
+ *
+ *   ran = (ran << 1) ^ (ran < 0 ? POLY : 0)
+ *
+ * starting at 1. gups_starts(n) returns its n-th value, so that every
+ * thread or rank can generate its own part of the stream.
+ */
+#ifndef GUPS_H
+#define GUPS_H 1
+
+#include <stdint.h>
+
+#define GUPS_POLY 0x0000000000000007ULL
+#define GUPS_PERIOD 1317624576693539401LL
+
+static inline uint64_t gups_next(uint64_t ran)
+{
+    return (ran << 1) ^ ((int64_t) ran < 0 ? GUPS_POLY : 0);
+}
+
+static uint64_t gups_starts(int64_t n)
+{
+    uint64_t m2[64], temp, ran;
+    int i, j;
+
+    while (n < 0)
+        n += GUPS_PERIOD;
+    while (n > GUPS_PERIOD)
+        n -= GUPS_PERIOD;
+    if (n == 0)
+        return 0x1;
+
+    temp = 0x1;
+    for (i = 0; i < 64; i++) {
+        m2[i] = temp;
+        temp = gups_next(gups_next(temp));
+    }
+
+    for (i = 62; i >= 0; i--)
+        if ((n >> i) & 1)
+            break;
+
+    ran = 0x2;
+    while (i > 0) {
+        temp = 0;
+        for (j = 0; j < 64; j++)
+            if ((ran >> j) & 1)
+                temp ^= m2[j];
+        ran = temp;
+        i -= 1;
+        if ((n >> i) & 1)
+            ran = gups_next(ran);
+    }
+
+    return ran;
+}
+
+#endif
@@ -0,0 +1,157 @@
+/*
+ * Random access updates of a table distributed over MPI ranks, in the
+ * style of the HPCC MPIRandomAccess benchmark.
+ *
+ * Every rank holds 2^n 64-bit words of the table of nprocs * 2^n words and
+ * generates 4 * 2^n values of the random stream of gups.h. The values are
+ * generated in chunks of CHUNK, sent to the ranks owning their table entry
+ * with MPI_Alltoallv and applied there with table[ran % size] ^= ran, so
+ * the benchmark is limited by the message rate of the network as much as
+ * by the memory. No update is lost.
+ *
+ * Usage: gups_mpi <log2 of the table size per rank>
+ *
+ * Output:
+ *
+ *   table_size=2147483648 updates=8589934592 ranks=512 nodes=4
+ *   time=12.345 s
+ *   gups=0.6958
+ *   gups_per_node=0.1740
+ *   errors=0 fraction=0.000000
+ */
+
+#include <mpi.h>
+#include <stdio.h>
+#include <stdlib.h>
+
+#include "gups.h"
+
+/* updates generated per rank before they are exchanged, as in HPCC */
+#define CHUNK 1024
+
+static void update(uint64_t *table, int log2_local, int rank, int nprocs)
+{
+    int64_t local_size = (int64_t) 1 << log2_local;
+    uint64_t size = (uint64_t) local_size * nprocs;
+    int64_t num_updates = 4 * local_size, done, i;
+    uint64_t ran = gups_starts(num_updates * rank);
+    uint64_t values[CHUNK], *sendbuf, *recvbuf;
+    int *sendcounts, *recvcounts, *sdispls, *rdispls, *fill;
+    int p, n, num_recv;
+
+    sendbuf = malloc(CHUNK * sizeof(uint64_t));
+    recvbuf = malloc((size_t) CHUNK * nprocs * sizeof(uint64_t));
+    sendcounts = malloc(nprocs * sizeof(int));
+    recvcounts = malloc(nprocs * sizeof(int));
+    sdispls = malloc(nprocs * sizeof(int));
+    rdispls = malloc(nprocs * sizeof(int));
+    fill = malloc(nprocs * sizeof(int));
+
+    for (done = 0; done < num_updates; done += CHUNK) {
+        n = num_updates - done < CHUNK ? (int) (num_updates - done) : CHUNK;
+
+        /* the values sorted by the rank owning their table entry */
+        for (p = 0; p < nprocs; p++)
+            sendcounts[p] = 0;
+        for (i = 0; i < n; i++) {
+            ran = gups_next(ran);
+            values[i] = ran;
+            sendcounts[(ran % size) >> log2_local]++;
+        }
+        sdispls[0] = 0;
+        for (p = 1; p < nprocs; p++)
+            sdispls[p] = sdispls[p - 1] + sendcounts[p - 1];
+        for (p = 0; p < nprocs; p++)
+            fill[p] = sdispls[p];
+        for (i = 0; i < n; i++)
+            sendbuf[fill[(values[i] % size) >> log2_local]++] = values[i];
+
+        MPI_Alltoall(sendcounts, 1, MPI_INT, recvcounts, 1, MPI_INT,
+                     MPI_COMM_WORLD);
+        for (p = 0, num_recv = 0; p < nprocs; p++) {
+            rdispls[p] = num_recv;
+            num_recv += recvcounts[p];
+        }
+        MPI_Alltoallv(sendbuf, sendcounts, sdispls, MPI_UINT64_T, recvbuf,
+                      recvcounts, rdispls, MPI_UINT64_T, MPI_COMM_WORLD);
+
+        for (i = 0; i < num_recv; i++)
+            table[(recvbuf[i] % size) & (local_size - 1)] ^= recvbuf[i];
+    }
+
+    free(sendbuf);
+    free(recvbuf);
+    free(sendcounts);
+    free(recvcounts);
+    free(sdispls);
+    free(rdispls);
+    free(fill);
+}
+
+int main(int argc, char *argv[])
+{
+    int log2_local = argc > 1 ? atoi(argv[1]) : 22;
+    int64_t local_size = (int64_t) 1 << log2_local, i;
+    long long errors = 0, local_errors = 0;
+    int rank, nprocs, node_rank, is_first, nodes;
+    uint64_t *table;
+    MPI_Comm node_comm;
+    double t;
+
+    MPI_Init(&argc, &argv);
+    MPI_Comm_rank(MPI_COMM_WORLD, &rank);
+    MPI_Comm_size(MPI_COMM_WORLD, &nprocs);
+
+    /* the number of nodes for the GUPS per node */
+    MPI_Comm_split_type(MPI_COMM_WORLD, MPI_COMM_TYPE_SHARED, rank,
+                        MPI_INFO_NULL, &node_comm);
+    MPI_Comm_rank(node_comm, &node_rank);
+    is_first = node_rank == 0;
+    MPI_Allreduce(&is_first, &nodes, 1, MPI_INT, MPI_SUM, MPI_COMM_WORLD);
+    MPI_Comm_free(&node_comm);
+
+    table = malloc(local_size * sizeof(uint64_t));
+    if (table == NULL) {
+        fprintf(stderr, "rank %d: cannot allocate a table of 2^%d words\n",
+                rank, log2_local);
+        MPI_Abort(MPI_COMM_WORLD, 1);
+    }
+
+    for (i = 0; i < local_size; i++)
+        table[i] = local_size * rank + i;
+
+    if (rank == 0)
+        printf("table_size=%lld updates=%lld ranks=%d nodes=%d\n",
+               (long long) local_size * nprocs,
+               (long long) 4 * local_size * nprocs, nprocs, nodes);
+
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime();
+    update(table, log2_local, rank, nprocs);
+    MPI_Barrier(MPI_COMM_WORLD);
+    t = MPI_Wtime() - t;
+
+    if (rank == 0) {
+        double gups = 4.0 * local_size * nprocs / t * 1.0e-9;
+
+        printf("time=%.3f s\n", t);
+        printf("gups=%.4f\n", gups);
+        printf("gups_per_node=%.4f\n", gups / nodes);
+    }
+
+    /* the same updates again restore the table */
+    update(table, log2_local, rank, nprocs);
+    for (i = 0; i < local_size; i++)
+        if (table[i] != (uint64_t) (local_size * rank + i))
+            local_errors++;
+
+    MPI_Reduce(&local_errors, &errors, 1, MPI_LONG_LONG, MPI_SUM, 0,
+               MPI_COMM_WORLD);
+    if (rank == 0)
+        printf("errors=%lld fraction=%.6f\n", errors,
+               (double) errors / (local_size * nprocs));
+
+    free(table);
+    MPI_Finalize();
+    return 0;
+}
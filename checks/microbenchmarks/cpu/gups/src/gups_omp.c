@@ -0,0 +1,88 @@
+/*
+ * Random access updates of a table in the memory of one node, in the
+ * style of the HPCC RandomAccess benchmark (single node, OpenMP).
+ *
+ * A table of 2^n 64-bit words is updated with table[ran & (size - 1)] ^= ran
+ * for 4 * size values of the random stream of gups.h, split among the threads.
+ * The updates are not synchronized; as in HPCC a small fraction of them
+ * may be lost, which the verification counts as errors.
+ *
+ * Usage: gups_omp <log2 of the table size>
+ *
+ * Output:
+ *
+ *   table_size=1073741824 updates=4294967296 threads=128
+ *   time=12.345 s
+ *   gups=0.3479
+ *   errors=123 fraction=0.000000
+ */
+
+#include <omp.h>
+#include <stdio.h>
+#include <stdlib.h>
+
+#include "gups.h"
+
+static void update(uint64_t *table, int64_t size, int64_t num_updates)
+{
+    #pragma omp parallel
+    {
+        int nthreads = omp_get_num_threads();
+        int t = omp_get_thread_num();
+        int64_t per_thread = num_updates / nthreads;
+        int64_t rest = num_updates % nthreads;
+        int64_t first = per_thread * t + (t < rest ? t : rest);
+        uint64_t ran = gups_starts(first);
+        int64_t i;
+
+        if (t < rest)
+            per_thread++;
+
+        for (i = 0; i < per_thread; i++) {
+            ran = gups_next(ran);
+            table[ran & (size - 1)] ^= ran;
+        }
+    }
+}
+
+int main(int argc, char *argv[])
+{
+    int log2_size = argc > 1 ? atoi(argv[1]) : 30;
+    int64_t size = (int64_t) 1 << log2_size;
+    int64_t num_updates = 4 * size, errors = 0, i;
+    uint64_t *table;
+    double t;
+
+    table = malloc(size * sizeof(uint64_t));
+    if (table == NULL) {
+        fprintf(stderr, "cannot allocate a table of 2^%d words\n", log2_size);
+        return 1;
+    }
+
+    /* first touch by the threads that update the table */
+    #pragma omp parallel for schedule(static)
+    for (i = 0; i < size; i++)
+        table[i] = i;
+
+    printf("table_size=%lld updates=%lld threads=%d\n", (long long) size,
+           (long long) num_updates, omp_get_max_threads());
+
+    t = omp_get_wtime();
+    update(table, size, num_updates);
+    t = omp_get_wtime() - t;
+    printf("time=%.3f s\n", t);
+    printf("gups=%.4f\n", num_updates / t * 1.0e-9);
+
+    /* the same updates again restore the table, up to the lost ones */
+    update(table, size, num_updates);
+    #pragma omp parallel for schedule(static) reduction(+:errors)
+    for (i = 0; i < size; i++)
+        if (table[i] != (uint64_t) i)
+            errors++;
+
+    printf("errors=%lld fraction=%.6f\n", (long long) errors,
+           (double) errors / size);
+
+    free(table);
+    return 0;
+}
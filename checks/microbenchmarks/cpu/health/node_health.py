@@ -0,0 +1,133 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.stats import median  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+@rfm.simple_test
+class NodeHealthSweep(rfm.RegressionTest, TopologyJobSizeMixin):
+    '''Short STREAM or DGEMM run on every node of a partition.
+
+    One task per node runs the kernel of StreamTest or DGEMMTest on all
+    cores of its node. By default the job takes all nodes of the partition
+    (flexible node allocation, see ``--flex-alloc-nodes``), so the whole
+    partition is checked in a single allocation, e.g. after a maintenance.
+
+    Every node is a performance variable with the partition median as
+    reference: nodes more than ``max_deviation`` below the median fail.
+    The nodes ranked from the slowest are written to node_ranking.txt:
+
+    rank  node      triad     deviation
+       1  bnode021  38123.4   -12.3%
+    '''
+
+    kernel = parameter(['stream', 'dgemm'])
+    # all nodes of the partition, see TopologyJobSizeMixin
+    num_job_nodes = 0
+    max_deviation = variable(float, value=0.1)
+    stream_array_size = variable(int, value=100000000)
+    dgemm_sizes = variable(list, value=['4096', '4096', '4096'])
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss']
+    build_system = 'SingleSource'
+    executable = './node_health.sh'
+    task_domain = 'node'
+    exclusive_access = True
+    use_multithreading = False
+    keep_files = ['node_ranking.txt']
+    time_limit = '20m'
+    maintainers = ['Mandes']
+    tags = {'ops', 'diagnostic'}
+
+    @run_after('init')
+    def set_description(self):
+        self.descr = f'{self.kernel.upper()} node health sweep'
+        self.sourcepath = f'{self.kernel}.c'
+
+    @run_before('compile')
+    def set_build_flags(self):
+        self.build_system.executable = self.kernel
+        self.build_system.cflags = ['-O3', '-fopenmp']
+        if self.kernel == 'stream':
+            self.build_system.cppflags = [
+                f'-DSTREAM_ARRAY_SIZE={self.stream_array_size}'
+            ]
+        else:
+            self.build_system.cflags += ['-I$EBROOTOPENBLAS/include']
+            self.build_system.ldflags = ['-L$EBROOTOPENBLAS/lib', '-lopenblas',
+                                         '-lpthread', '-lgfortran']
+
+    @run_before('run')
+    def set_executable_opts(self):
+        self.executable_opts = [f'./{self.kernel}']
+        if self.kernel == 'dgemm':
+            self.executable_opts += self.dgemm_sizes
+
+        self.variables.update({
+            'OMP_PLACES': 'cores',
+            'OMP_PROC_BIND': 'spread'
+        })
+
+    def _node_values(self):
+        if self.kernel == 'stream':
+            pattern = r'^node=(?P<node>\S+) Triad:\s+(?P<value>\S+)'
+        else:
+            pattern = (r'^node=(?P<node>\S+) \S+:\s+Avg\. performance\s+:'
+                       r'\s+(?P<value>\S+)')
+
+        return sn.evaluate(sn.zip(
+            sn.extractall(pattern, self.stdout, 'node'),
+            sn.extractall(pattern, self.stdout, 'value', float)))
+
+    def write_ranking(self, values, median_value, unit):
+        '''Write the nodes ranked from the slowest to node_ranking.txt.'''
+        metric = 'triad' if self.kernel == 'stream' else 'dgemm'
+        ranking = sorted(values.items(), key=lambda item: item[1])
+        with open(os.path.join(self.stagedir, 'node_ranking.txt'), 'w') as fp:
+            fp.write(f'# {self.current_partition.fullname} median '
+                     f'{median_value:.1f} {unit}, {len(values)} nodes\n')
+            fp.write(f'{"rank":>4}  {"node":<16}{metric:>12}  deviation\n')
+            for rank, (node, value) in enumerate(ranking, start=1):
+                deviation = (value - median_value) / median_value
+                fp.write(f'{rank:>4}  {node:<16}{value:>12.1f}  '
+                         f'{deviation:+.1%}\n')
+
+    @sanity_function
+    def assert_all_nodes(self):
+        if self.kernel == 'stream':
+            sn.evaluate(sn.assert_eq(
+                sn.count(sn.findall(r'Solution Validates', self.stdout)),
+                self.job.num_tasks))
+
+        values = dict(self._node_values())
+        failure_msg = (f'Requested {self.job.num_tasks} node(s), but found '
+                       f'{len(values)} node(s)')
+        sn.evaluate(sn.assert_eq(len(values), self.job.num_tasks,
+                                 msg=failure_msg))
+
+        # the performance variables are the nodes, their reference is the
+        # median of the partition
+        unit = 'MB/s' if self.kernel == 'stream' else 'Gflop/s'
+        median_value = sn.evaluate(median(values.values()))
+        self.write_ranking(values, median_value, unit)
+        partition_name = self.current_partition.fullname
+        self.perf_patterns = {}
+        for node, value in values.items():
+            self.reference[f'{partition_name}:{node}'] = (
+                median_value, -self.max_deviation, None, unit
+            )
+            self.perf_patterns[node] = sn.defer(value)
+
+        return True
@@ -0,0 +1 @@
+../../dgemm/src/dgemm.c
\ No newline at end of file
@@ -0,0 +1,10 @@
+#!/bin/bash
+#
+# Run a kernel and prefix every line of its output with the node name, so
+# that the results of all nodes can be told apart in one output file.
+#
+# Usage: node_health.sh <executable> [args...]
+
+node=$(hostname -s)
+"$@" 2>&1 | sed "s/^/node=${node} /"
+exit ${PIPESTATUS[0]}
@@ -0,0 +1 @@
+../../stream/src/stream.c
\ No newline at end of file
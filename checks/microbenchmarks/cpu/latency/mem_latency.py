@@ -0,0 +1,120 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+@rfm.simple_test
+class MemoryLatencyTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                        TopologyJobSizeMixin):
+    '''Load latency of the caches and of local and remote memory.
+
+    A random cyclic pointer chain is followed for working sets from 4 KiB
+    to 1 GiB, complementary to the bandwidth of StreamTest:
+
+    size=32768 latency_ns=1.234
+
+    The thread runs on the first core of NUMA domain 0, its memory is
+    bound with numactl to the same domain (local) or to the last one
+    (remote). The latency of every level is reported at half the cache
+    size, taken from the auto-detected processor topology or from
+    ``cache_sizes`` by processor architecture.
+    '''
+
+    memory = parameter(['local', 'remote'])
+    min_size = variable(int, value=4096)
+    max_size = variable(int, value=1 << 30)
+    dram_size = variable(int, value=1 << 30)
+    cache_sizes = variable(dict, value={
+        # per core L1d and L2, L3 per socket (bdw) or per CCX (zen2)
+        'broadwell': {'l1': 32768, 'l2': 262144, 'l3': 26214400},
+        'zen2': {'l1': 32768, 'l2': 524288, 'l3': 16777216},
+    })
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss']
+    build_system = 'SingleSource'
+    sourcepath = 'mem_latency.c'
+    executable = 'numactl'
+    # one task with the whole node, numactl places thread and memory
+    task_domain = 'node'
+    exclusive_access = True
+    use_multithreading = False
+    time_limit = '20m'
+    maintainers = ['Mandes']
+    tags = {'benchmark', 'diagnostic'}
+
+    @run_after('init')
+    def set_description(self):
+        self.descr = f'Memory latency ({self.memory} NUMA domain)'
+
+    @run_after('setup')
+    def set_level_sizes(self):
+        processor = self.current_partition.processor
+        caches = {}
+        for cache in (processor.topology or {}).get('caches', []):
+            level = cache['type'].lower()
+            if level in ['l1', 'l2', 'l3']:
+                caches[level] = cache['size']
+
+        caches = caches or self.cache_sizes.get(processor.arch, {})
+        self.skip_if(not caches,
+                     f'no cache sizes for {self.current_partition.fullname}')
+        self.level_sizes = {level: size // 2
+                            for level, size in sorted(caches.items())}
+        self.level_sizes['dram'] = self.dram_size
+
+        num_numa_nodes = processor.num_numa_nodes or 1
+        self.skip_if(self.memory == 'remote' and num_numa_nodes < 2,
+                     'no remote NUMA domain')
+        self.mem_node = num_numa_nodes - 1 if self.memory == 'remote' else 0
+
+        self.perf_patterns = {}
+        for level, size in self.level_sizes.items():
+            self.perf_patterns[level] = sn.extractsingle(
+                rf'^size={size} latency_ns=(?P<latency>\S+)', self.stdout,
+                'latency', float)
+
+        self.reference = {
+            '*': {level: (0, None, None, 'ns') for level in self.level_sizes}
+        }
+
+    @run_before('compile')
+    def set_build_flags(self):
+        self.build_system.executable = 'mem_latency'
+        self.build_system.cflags = ['-O2']
+
+    @run_before('run')
+    def set_executable_opts(self):
+        sizes = set(self.level_sizes.values())
+        size = self.min_size
+        while size <= self.max_size:
+            sizes.add(size)
+            size *= 2
+
+        self.sizes = sorted(sizes)
+        # the first core of the node, it belongs to NUMA domain 0
+        self.executable_opts = ['--physcpubind=+0',
+                                f'--membind={self.mem_node}',
+                                './mem_latency']
+        self.executable_opts += [str(size) for size in self.sizes]
+
+    @sanity_function
+    def assert_latency(self):
+        return sn.all([
+            sn.assert_eq(sn.count(sn.findall(r'^size=\d+ latency_ns=',
+                                             self.stdout)),
+                         len(self.sizes)),
+            sn.assert_found(r'^Memory latency done', self.stdout)
+        ])
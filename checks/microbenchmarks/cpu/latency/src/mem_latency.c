@@ -0,0 +1,154 @@
+/*
+ * Memory load latency by pointer chasing.
+ *
+ * For every working set size a cyclic random permutation of its cache lines
+ * is built (Sattolo's algorithm) and followed, so that every load depends
+ * on the previous one and the hardware prefetchers cannot guess the next
+ * line. The time per load is the latency of the level of the memory
+ * hierarchy the working set fits in.
+ *
+ * Usage: mem_latency <size in bytes>...
+ *
+ * The thread and the memory are placed by the caller, e.g. with numactl.
+ * The output has one line per working set size:
+ *
+ *   size=32768 latency_ns=1.234
+ */
+
+#define _GNU_SOURCE
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <time.h>
+
+#define LINE_SIZE 64
+#define MIN_LOADS (1L << 24)
+#define REPEATS 3
+
+struct line {
+    struct line *next;
+    char pad[LINE_SIZE - sizeof(struct line *)];
+};
+
+static uint64_t rng_state = 88172645463325252ULL;
+
+static uint64_t xorshift64(void)
+{
+    rng_state ^= rng_state << 13;
+    rng_state ^= rng_state >> 7;
+    rng_state ^= rng_state << 17;
+    return rng_state;
+}
+
+static double now(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec * 1.0e-9;
+}
+
+static struct line *build_chain(size_t num_lines)
+{
+    struct line *lines;
+    size_t *order;
+    size_t i;
+
+    lines = mmap(NULL, num_lines * sizeof(*lines), PROT_READ | PROT_WRITE,
+                 MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+    if (lines == MAP_FAILED)
+        return NULL;
+
+#ifdef MADV_HUGEPAGE
+    /* fewer TLB misses, the DRAM latency is less inflated by page walks */
+    madvise(lines, num_lines * sizeof(*lines), MADV_HUGEPAGE);
+#endif
+
+    order = malloc(num_lines * sizeof(*order));
+    for (i = 0; i < num_lines; i++)
+        order[i] = i;
+
+    /* Sattolo's algorithm: a random permutation with a single cycle */
+    for (i = num_lines - 1; i > 0; i--) {
+        size_t j = xorshift64() % i;
+        size_t tmp = order[i];
+        order[i] = order[j];
+        order[j] = tmp;
+    }
+
+    for (i = 0; i < num_lines; i++)
+        lines[order[i]].next = &lines[order[(i + 1) % num_lines]];
+
+    free(order);
+    return lines;
+}
+
+static double chase(struct line *start, long num_loads)
+{
+    struct line *p = start;
+    double t0, t1;
+    long i;
+
+    t0 = now();
+    for (i = 0; i < num_loads; i += 8) {
+        p = p->next; p = p->next; p = p->next; p = p->next;
+        p = p->next; p = p->next; p = p->next; p = p->next;
+    }
+    t1 = now();
+
+    /* keep the chain alive */
+    if (p == NULL)
+        printf("unreachable\n");
+
+    return (t1 - t0) / num_loads * 1.0e9;
+}
+
+int main(int argc, char *argv[])
+{
+    int arg, r;
+
+    if (argc < 2) {
+        fprintf(stderr, "Usage: %s <size in bytes>...\n", argv[0]);
+        return 1;
+    }
+
+    printf("Memory latency: line_size=%d\n", LINE_SIZE);
+    for (arg = 1; arg < argc; arg++) {
+        size_t size = strtoull(argv[arg], NULL, 10);
+        size_t num_lines = size / LINE_SIZE;
+        struct line *lines;
+        long num_loads;
+        double best = 0.0;
+
+        if (num_lines < 2) {
+            fprintf(stderr, "size %zu is too small\n", size);
+            return 1;
+        }
+
+        lines = build_chain(num_lines);
+        if (lines == NULL) {
+            fprintf(stderr, "cannot allocate %zu bytes\n", size);
+            return 1;
+        }
+
+        num_loads = 4 * (long)num_lines;
+        if (num_loads < MIN_LOADS)
+            num_loads = MIN_LOADS;
+
+        /* warm up the caches and the TLB */
+        chase(lines, num_lines);
+        for (r = 0; r < REPEATS; r++) {
+            double latency = chase(lines, num_loads);
+            if (r == 0 || latency < best)
+                best = latency;
+        }
+
+        printf("size=%zu latency_ns=%.3f\n", size, best);
+        fflush(stdout);
+        munmap(lines, num_lines * sizeof(*lines));
+    }
+
+    printf("Memory latency done\n");
+    return 0;
+}
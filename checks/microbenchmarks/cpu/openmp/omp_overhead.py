@@ -0,0 +1,103 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+# the constructs measured by omp_overhead.c
+CONSTRUCTS = ['parallel', 'for', 'barrier', 'single', 'reduction', 'static',
+              'dynamic', 'guided', 'task']
+
+
+@rfm.simple_test
+class OpenMPOverheadTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                         TopologyJobSizeMixin):
+    '''Overheads of the OpenMP runtime of the compilers.
+
+    EPCC-style measurement of the overhead of parallel regions, worksharing
+    loops, barriers, single, reductions, the static, dynamic and guided
+    schedules and tasks in us, for thread counts up to a whole node:
+
+    threads=8 construct=barrier overhead_us=0.345
+
+    The foss environment uses the GCC runtime (libgomp), the intel
+    environment the Intel runtime (libiomp5). The performance variables
+    are ``<construct>_<threads>``.
+    '''
+
+    # thread counts, by default the powers of two and all cores of a node
+    thread_counts = variable(list, value=[])
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss', 'intel']
+    build_system = 'SingleSource'
+    sourcepath = 'omp_overhead.c'
+    # one task with the whole node, see TopologyJobSizeMixin
+    task_domain = 'node'
+    exclusive_access = True
+    use_multithreading = False
+    time_limit = '20m'
+    maintainers = ['Mandes']
+    tags = {'benchmark', 'prgenv'}
+
+    @run_after('init')
+    def set_description(self):
+        self.descr = 'OpenMP runtime overheads'
+
+    @run_before('compile')
+    def set_cflags(self):
+        self.build_system.executable = 'omp_overhead'
+        self.build_system.cflags = {
+            'foss': ['-O2', '-fopenmp'],
+            'intel': ['-O2', '-qopenmp'],
+        }.get(self.current_environ.name, ['-O2'])
+
+    @run_before('run')
+    def set_thread_counts(self):
+        if not self.thread_counts:
+            num_threads = self.num_cpus_per_task
+            thread_counts = []
+            threads = 1
+            while threads < num_threads:
+                thread_counts.append(threads)
+                threads *= 2
+
+            self.thread_counts = thread_counts + [num_threads]
+
+        self.executable_opts = [str(threads)
+                                for threads in self.thread_counts]
+        self.variables.update({
+            'OMP_PLACES': 'cores',
+            'OMP_PROC_BIND': 'close'
+        })
+
+        self.perf_patterns = {}
+        for threads in self.thread_counts:
+            for construct in CONSTRUCTS:
+                name = f'{construct}_{threads}'
+                self.perf_patterns[name] = sn.extractsingle(
+                    rf'^threads={threads} construct={construct} '
+                    rf'overhead_us=(?P<overhead>\S+)', self.stdout,
+                    'overhead', float)
+                self.reference[f'*:{name}'] = (0, None, None, 'us')
+
+    @sanity_function
+    def assert_overheads(self):
+        return sn.all([
+            sn.assert_eq(sn.count(sn.findall(r'^threads=\d+ construct=',
+                                             self.stdout)),
+                         len(self.thread_counts) * len(CONSTRUCTS)),
+            sn.assert_not_found(r'wrong sum', self.stdout),
+            sn.assert_found(r'^OpenMP overhead done', self.stdout)
+        ])
@@ -0,0 +1,289 @@
+/*
+ * Overheads of the OpenMP runtime, following the EPCC OpenMP
+ * microbenchmarks (syncbench, schedbench, taskbench).
+ *
+ * Every construct surrounds a short delay loop. The overhead is the time
+ * of the construct minus the time of the same delays run sequentially,
+ * per execution of the construct:
+ *
+ *   parallel   parallel region
+ *   for        worksharing loop with one iteration per thread
+ *   barrier    barrier
+ *   single     single construct
+ *   reduction  parallel region with a reduction
+ *   static     loop with schedule(static)
+ *   dynamic    loop with schedule(dynamic, 1)
+ *   guided     loop with schedule(guided, 1)
+ *   task       task created by every thread
+ *
+ * Usage: omp_overhead <threads>...
+ *
+ * The output has one line per thread count and construct, the median of
+ * OUTER_REPS measurements:
+ *
+ *   threads=8 construct=barrier overhead_us=0.345
+ */
+
+#include <omp.h>
+#include <stdio.h>
+#include <stdlib.h>
+
+#define OUTER_REPS 20
+/* duration of the delay and the minimum duration of a measurement in us */
+#define DELAY_TIME 0.1
+#define TARGET_TIME 1000.0
+/* loop iterations per thread of the schedule tests */
+#define ITERS_PER_THREAD 128
+
+static int delay_length;
+
+static void delay(int length)
+{
+    float a = 0.0f;
+    int i;
+
+    for (i = 0; i < length; i++)
+        a += i;
+
+    /* keep the loop */
+    if (a < 0.0f)
+        printf("%f\n", a);
+}
+
+static void reference(int reps, int iters)
+{
+    int j, i;
+
+    for (j = 0; j < reps; j++)
+        for (i = 0; i < iters; i++)
+            delay(delay_length);
+}
+
+static void test_parallel(int reps, int nthreads)
+{
+    int j;
+
+    for (j = 0; j < reps; j++) {
+        #pragma omp parallel num_threads(nthreads)
+        delay(delay_length);
+    }
+}
+
+static void test_for(int reps, int nthreads)
+{
+    #pragma omp parallel num_threads(nthreads)
+    {
+        int j, i;
+
+        for (j = 0; j < reps; j++) {
+            #pragma omp for
+            for (i = 0; i < nthreads; i++)
+                delay(delay_length);
+        }
+    }
+}
+
+static void test_barrier(int reps, int nthreads)
+{
+    #pragma omp parallel num_threads(nthreads)
+    {
+        int j;
+
+        for (j = 0; j < reps; j++) {
+            delay(delay_length);
+            #pragma omp barrier
+        }
+    }
+}
+
+static void test_single(int reps, int nthreads)
+{
+    #pragma omp parallel num_threads(nthreads)
+    {
+        int j;
+
+        for (j = 0; j < reps; j++) {
+            #pragma omp single
+            delay(delay_length);
+        }
+    }
+}
+
+static void test_reduction(int reps, int nthreads)
+{
+    int j, sum = 0;
+
+    for (j = 0; j < reps; j++) {
+        #pragma omp parallel num_threads(nthreads) reduction(+:sum)
+        {
+            delay(delay_length);
+            sum += 1;
+        }
+    }
+
+    if (sum != reps * nthreads)
+        printf("reduction: wrong sum %d\n", sum);
+}
+
+static void test_static(int reps, int nthreads)
+{
+    #pragma omp parallel num_threads(nthreads)
+    {
+        int j, i;
+
+        for (j = 0; j < reps; j++) {
+            #pragma omp for schedule(static)
+            for (i = 0; i < ITERS_PER_THREAD * nthreads; i++)
+                delay(delay_length);
+        }
+    }
+}
+
+static void test_dynamic(int reps, int nthreads)
+{
+    #pragma omp parallel num_threads(nthreads)
+    {
+        int j, i;
+
+        for (j = 0; j < reps; j++) {
+            #pragma omp for schedule(dynamic, 1)
+            for (i = 0; i < ITERS_PER_THREAD * nthreads; i++)
+                delay(delay_length);
+        }
+    }
+}
+
+static void test_guided(int reps, int nthreads)
+{
+    #pragma omp parallel num_threads(nthreads)
+    {
+        int j, i;
+
+        for (j = 0; j < reps; j++) {
+            #pragma omp for schedule(guided, 1)
+            for (i = 0; i < ITERS_PER_THREAD * nthreads; i++)
+                delay(delay_length);
+        }
+    }
+}
+
+static void test_task(int reps, int nthreads)
+{
+    #pragma omp parallel num_threads(nthreads)
+    {
+        int j;
+
+        for (j = 0; j < reps; j++) {
+            #pragma omp task
+            delay(delay_length);
+        }
+    }
+}
+
+struct construct {
+    const char *name;
+    void (*test)(int reps, int nthreads);
+    /* delays per thread and execution of the construct */
+    int iters_per_thread;
+};
+
+static const struct construct constructs[] = {
+    {"parallel", test_parallel, 1},
+    {"for", test_for, 1},
+    {"barrier", test_barrier, 1},
+    {"single", test_single, 1},
+    {"reduction", test_reduction, 1},
+    {"static", test_static, ITERS_PER_THREAD},
+    {"dynamic", test_dynamic, ITERS_PER_THREAD},
+    {"guided", test_guided, ITERS_PER_THREAD},
+    {"task", test_task, 1},
+};
+
+static int compare_double(const void *a, const void *b)
+{
+    double x = *(const double *) a, y = *(const double *) b;
+
+    return (x > y) - (x < y);
+}
+
+static double median(double *values, int n)
+{
+    qsort(values, n, sizeof(double), compare_double);
+    return n % 2 ? values[n / 2] : 0.5 * (values[n / 2 - 1] + values[n / 2]);
+}
+
+static void calibrate_delay(void)
+{
+    double t;
+
+    /* the length of a delay of DELAY_TIME us, timed over a longer loop */
+    delay_length = 1;
+    do {
+        delay_length *= 2;
+        t = omp_get_wtime();
+        delay(delay_length);
+        t = (omp_get_wtime() - t) * 1.0e6;
+    } while (t < DELAY_TIME * 1000.0);
+
+    delay_length = (int) (delay_length * DELAY_TIME / t);
+    if (delay_length < 1)
+        delay_length = 1;
+}
+
+static double measure(const struct construct *c, int nthreads)
+{
+    double samples[OUTER_REPS], t, t_ref;
+    int reps = 1, k;
+
+    /* enough executions of the construct to take TARGET_TIME */
+    do {
+        reps *= 2;
+        t = omp_get_wtime();
+        c->test(reps, nthreads);
+        t = (omp_get_wtime() - t) * 1.0e6;
+    } while (t < TARGET_TIME);
+
+    for (k = 0; k < OUTER_REPS; k++) {
+        t = omp_get_wtime();
+        reference(reps, c->iters_per_thread);
+        samples[k] = (omp_get_wtime() - t) * 1.0e6;
+    }
+    t_ref = median(samples, OUTER_REPS);
+
+    for (k = 0; k < OUTER_REPS; k++) {
+        t = omp_get_wtime();
+        c->test(reps, nthreads);
+        t = (omp_get_wtime() - t) * 1.0e6;
+        samples[k] = (t - t_ref) / reps;
+    }
+
+    return median(samples, OUTER_REPS);
+}
+
+int main(int argc, char *argv[])
+{
+    int num_constructs = sizeof(constructs) / sizeof(constructs[0]);
+    int a, c;
+
+    if (argc < 2) {
+        fprintf(stderr, "Usage: %s <threads>...\n", argv[0]);
+        return 1;
+    }
+
+    calibrate_delay();
+    printf("OpenMP version %d, max threads %d, delay length %d\n",
+           _OPENMP, omp_get_max_threads(), delay_length);
+
+    for (a = 1; a < argc; a++) {
+        int nthreads = atoi(argv[a]);
+
+        for (c = 0; c < num_constructs; c++) {
+            printf("threads=%d construct=%s overhead_us=%.4f\n", nthreads,
+                   constructs[c].name, measure(&constructs[c], nthreads));
+            fflush(stdout);
+        }
+    }
+
+    printf("OpenMP overhead done\n");
+    return 0;
+}
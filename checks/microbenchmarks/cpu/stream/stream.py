@@ -3,12 +3,25 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
+import sys
+
 import reframe as rfm
 import reframe.utility.sanity as sn
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.counters import PerfCountersMixin  # noqa: E402
+from utils.energy import EnergyMixin  # noqa: E402
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.repeat import RepeatedRunMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
 
 @rfm.simple_test
-class StreamTest(rfm.RegressionTest):
+class StreamTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                 TopologyJobSizeMixin, RepeatedRunMixin, EnergyMixin,
+                 PerfCountersMixin):
     '''This test checks the stream test:
        Function    Best Rate MB/s  Avg time     Min time     Max time
        Triad:          13991.7     0.017174     0.017153     0.017192
@@ -29,22 +42,24 @@ class StreamTest(rfm.RegressionTest):
 
         self.sourcepath = 'stream.c'
         self.build_system = 'SingleSource'
-        self.num_tasks = 1
-        self.num_tasks_per_node = 1
-        self.stream_cpus_per_task = {
-            'ubelix:bdw': 20,
-            'ubelix:epyc2': 20,
-        }
+        # a single task using all cores of the node, see
+        # TopologyJobSizeMixin
+        self.task_domain = 'node'
         self.variables = {
             'OMP_PLACES': 'threads',
             'OMP_PROC_BIND': 'spread'
         }
-        self.sanity_patterns = sn.assert_found(
-            r'Solution Validates: avg error less than', self.stdout)
-        self.perf_patterns = {
-            'triad': sn.extractsingle(r'Triad:\s+(?P<triad>\S+)\s+\S+',
-                                      self.stdout, 'triad', float)
-        }
+        triad = sn.extractall(r'Triad:\s+(?P<triad>\S+)\s+\S+',
+                              self.stdout, 'triad', float)
+        self.sanity_patterns = sn.all([
+            sn.assert_found(r'Solution Validates: avg error less than',
+                            self.stdout),
+            self.assert_samples(triad)
+        ])
+        # median of the runs, see RepeatedRunMixin
+        self.perf_patterns = {}
+        self.repeated_perf_variable('triad', triad, 'MB/s')
+        self.efficiency_unit = 'GB/J'
         self.stream_bw_reference = {
             'foss': {
                 'ubelix:bdw': {'triad': (40000, -0.05, None, 'MB/s')},
@@ -58,11 +73,12 @@ class StreamTest(rfm.RegressionTest):
         self.tags = {'production'}
         self.maintainers = ['Man']
 
+    def work_rate(self):
+        # GB/s of the node for the energy efficiency, see EnergyMixin
+        return self.perf_patterns['triad'] * 1.0e-3
+
     @rfm.run_after('setup')
     def prepare_test(self):
-        self.num_cpus_per_task = self.stream_cpus_per_task.get(
-            self.current_partition.fullname, 1)
-        self.variables['OMP_NUM_THREADS'] = str(self.num_cpus_per_task)
         envname = self.current_environ.name
 
         self.build_system.cflags = self.prgenv_flags.get(envname, ['-O3'])
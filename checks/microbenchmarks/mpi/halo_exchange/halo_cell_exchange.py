@@ -3,14 +3,20 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 import os
+import sys
 import reframe as rfm
 import reframe.utility.sanity as sn
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.parsing import OutputParser  # noqa: E402
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+
 
 @rfm.required_version('>=2.16.0-dev.0')
 @rfm.parameterized_test(*([a]
                             for a in ['ivy', 'bdw', 'epyc2']))
-class HaloCellExchangeTest(rfm.RegressionTest):
+class HaloCellExchangeTest(rfm.RegressionTest, GeneratedReferencesMixin):
     def __init__(self, arch):
         self.curr_arch = arch
         self.sourcepath = 'halo_cell_exchange.c'
@@ -20,109 +26,49 @@ class HaloCellExchangeTest(rfm.RegressionTest):
         self.executable_opts = ['input.txt']
         self.valid_systems = [ ]
 
+        # process grid of the decompositions by their number of ranks
+        decompositions = {
+            2: '2 1 1',
+            4: '2 2 1',
+            6: '3 2 1',
+        }
         if self.curr_arch in ['epyc2']:
-           self.valid_systems = [ 'ubelix:epyc2' ]
-           self.num_tasks = 4
-           self.num_tasks_per_node = 1
-           self.num_gpus_per_node = 0
-           self.perf_patterns = {
-            'time_2_10': sn.extractsingle(
-                r'halo_cell_exchange 4 2 1 1 10 10 10'
-                r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                'time_mpi', float),
-            'time_2_10000': sn.extractsingle(
-                r'halo_cell_exchange 4 2 1 1 10000 10000 10000'
-                r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                'time_mpi', float),
-            'time_2_1000000': sn.extractsingle(
-                r'halo_cell_exchange 4 2 1 1 1000000 1000000 1000000'
-                r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                'time_mpi', float),
-            'time_4_10': sn.extractsingle(
-                r'halo_cell_exchange 4 2 2 1 10 10 10'
-                r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                'time_mpi', float),
-            'time_4_10000': sn.extractsingle(
-                r'halo_cell_exchange 4 2 2 1 10000 10000 10000'
-                r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                'time_mpi', float),
-            'time_4_1000000': sn.extractsingle(
-                r'halo_cell_exchange 4 2 2 1 1000000 1000000 1000000'
-                r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                'time_mpi', float),
-           }
-
-           self.sanity_patterns = sn.assert_eq(
-                sn.count(sn.findall(r'halo_cell_exchange', self.stdout)), 6)
+            self.valid_systems = ['ubelix:epyc2']
+            self.num_tasks = 4
         elif self.curr_arch in ['ivy ', 'bdw']:
-            self.valid_systems = [ 'ubelix:ivy', 'ubelix:bdw' ]
+            self.valid_systems = ['ubelix:ivy', 'ubelix:bdw']
             self.num_tasks = 6
-            self.num_tasks_per_node = 1
-            self.num_gpus_per_node = 0
-            self.perf_patterns = {
-                'time_2_10': sn.extractsingle(
-                    r'halo_cell_exchange 6 2 1 1 10 10 10'
-                    r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                    'time_mpi', float),
-                'time_2_10000': sn.extractsingle(
-                    r'halo_cell_exchange 6 2 1 1 10000 10000 10000'
-                    r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                    'time_mpi', float),
-                'time_2_1000000': sn.extractsingle(
-                    r'halo_cell_exchange 6 2 1 1 1000000 1000000 1000000'
-                    r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                    'time_mpi', float),
-                'time_4_10': sn.extractsingle(
-                    r'halo_cell_exchange 6 2 2 1 10 10 10'
-                    r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                    'time_mpi', float),
-                'time_4_10000': sn.extractsingle(
-                    r'halo_cell_exchange 6 2 2 1 10000 10000 10000'
-                    r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                    'time_mpi', float),
-                'time_4_1000000': sn.extractsingle(
-                    r'halo_cell_exchange 6 2 2 1 1000000 1000000 1000000'
-                    r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                    'time_mpi', float),
-                'time_6_10': sn.extractsingle(
-                    r'halo_cell_exchange 6 3 2 1 10 10 10'
-                    r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                    'time_mpi', float),
-                'time_6_10000': sn.extractsingle(
-                    r'halo_cell_exchange 6 3 2 1 10000 10000 10000'
-                    r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                    'time_mpi', float),
-                'time_6_1000000': sn.extractsingle(
-                    r'halo_cell_exchange 6 3 2 1 1000000 1000000 1000000'
-                    r' \S+ (?P<time_mpi>\S+)', self.stdout,
-                    'time_mpi', float)
-            }
-            self.sanity_patterns = sn.assert_eq(
-                sn.count(sn.findall(r'halo_cell_exchange', self.stdout)), 9)
 
+        self.num_tasks_per_node = 1
+        self.num_gpus_per_node = 0
+
+        # the output is parsed once for all performance variables, see
+        # OutputParser
+        output = OutputParser(self.stdout, {
+            'halo': r'halo_cell_exchange (?P<ntasks>\d+) '
+                    r'(?P<decomposition>\d+ \d+ \d+) '
+                    r'(?P<size>\d+) (?P=size) (?P=size) \S+ '
+                    r'(?P<time_mpi>\S+)'
+        })
+        self.perf_patterns = {}
+        for nranks, decomposition in decompositions.items():
+            if nranks > self.num_tasks:
+                continue
+
+            for size in ['10', '10000', '1000000']:
+                self.perf_patterns[f'time_{nranks}_{size}'] = (
+                    output.extractsingle('halo', 'time_mpi', float,
+                                         ntasks=str(self.num_tasks),
+                                         decomposition=decomposition,
+                                         size=size)
+                )
+
+        self.sanity_patterns = sn.assert_eq(output.count('halo'),
+                                            len(self.perf_patterns))
+
+        # ivy and bdw have no measured references, they are taken from
+        # the generated references (see GeneratedReferencesMixin)
         self.reference = {
-            'ubelix:ivy': {
-                'time_2_10': (1, None, 0.50, 's'),
-                'time_2_10000': (1, None, 0.50, 's'),
-                'time_2_1000000': (1, None, 0.50, 's'),
-                'time_4_10': (1, None, 0.50, 's'),
-                'time_4_10000': (1, None, 0.50, 's'),
-                'time_4_1000000': (1, None, 0.50, 's'),
-                'time_6_10': (1, None, 0.50, 's'),
-                'time_6_10000': (1, None, 0.50, 's'),
-                'time_6_1000000': (1, None, 0.50, 's')
-            },
-           'ubelix:bdw': {
-                'time_2_10': (1, None, 0.50, 's'),
-                'time_2_10000': (1, None, 0.50, 's'),
-                'time_2_1000000': (1, None, 0.50, 's'),
-                'time_4_10': (1, None, 0.50, 's'),
-                'time_4_10000': (1, None, 0.50, 's'),
-                'time_4_1000000': (1, None, 0.50, 's'),
-                'time_6_10': (1, None, 0.50, 's'),
-                'time_6_10000': (1, None, 0.50, 's'),
-                'time_6_1000000': (1, None, 0.50, 's')
-            },
             'ubelix:epyc2': {
                 'time_2_10': (2e-04, None, 0.50, 's'),
                 'time_2_10000': (1e-03, None, 0.50, 's'),
@@ -134,6 +80,17 @@ class HaloCellExchangeTest(rfm.RegressionTest):
                 #'time_6_10000': (1e-03, None, 0.50, 's'),
                 #'time_6_1000000': (1e-02, None, 0.50, 's')
             },
+            '*': {
+                'time_2_10': (0, None, None, 's'),
+                'time_2_10000': (0, None, None, 's'),
+                'time_2_1000000': (0, None, None, 's'),
+                'time_4_10': (0, None, None, 's'),
+                'time_4_10000': (0, None, None, 's'),
+                'time_4_1000000': (0, None, None, 's'),
+                'time_6_10': (0, None, None, 's'),
+                'time_6_10000': (0, None, None, 's'),
+                'time_6_1000000': (0, None, None, 's')
+            },
         }
 
         self.maintainers = ['Mandes']
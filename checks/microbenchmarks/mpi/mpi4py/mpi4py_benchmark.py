@@ -0,0 +1,104 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import re
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+@rfm.simple_test
+class Mpi4pyBenchmark(rfm.RunOnlyRegressionTest, GeneratedReferencesMixin,
+                      TopologyJobSizeMixin):
+    '''Point-to-point and collective performance of mpi4py.
+
+    Every message size is measured with the buffer based methods on NumPy
+    arrays (Send, Allreduce, ...) and with the pickle based methods on
+    Python objects (send, allreduce, ...). The point-to-point tests run
+    between two nodes, the collectives with one rank per NUMA domain of two
+    nodes:
+
+    test=latency api=buffer size=8 value=2.345 us
+
+    The sanity checks that mpi4py runs on the MPI library of the toolchain
+    of the module, see also H5PyTest.
+    '''
+
+    benchmark = parameter(['latency', 'bandwidth', 'allreduce', 'alltoall'])
+    message_sizes = variable(list, value=[1, 8, 64, 512, 4096, 32768,
+                                          262144, 1048576])
+    # first line of MPI_Get_library_version() per programming environment
+    mpi_library = variable(dict, value={
+        'foss': 'Open MPI',
+        'intel': 'Intel(R) MPI Library',
+    })
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss']
+    modules = ['SciPy-bundle']
+    executable = 'python'
+    num_job_nodes = 2
+    use_multithreading = False
+    exclusive_access = True
+    time_limit = '20m'
+    maintainers = ['Mandes']
+    tags = {'benchmark', 'python'}
+
+    @run_after('init')
+    def set_job_layout(self):
+        self.descr = f'mpi4py {self.benchmark} buffer vs pickle'
+        if self.benchmark in ['latency', 'bandwidth']:
+            self.task_domain = 'node'
+        else:
+            self.task_domain = 'numa'
+
+        self.extra_resources = {
+            'switches': {
+                'num_switches': 1
+            }
+        }
+
+    @run_before('run')
+    def set_executable_opts(self):
+        self.executable_opts = ['mpi4py_bench.py', self.benchmark]
+        self.executable_opts += [str(size) for size in self.message_sizes]
+        self.variables['OMP_NUM_THREADS'] = '1'
+
+    @sanity_function
+    def assert_benchmark(self):
+        envname = self.current_environ.name
+        library = self.mpi_library.get(envname, '')
+        return sn.all([
+            sn.assert_found(rf'^mpi4py .* library: {re.escape(library)}',
+                            self.stdout,
+                            msg=f'mpi4py is not built against {library}'),
+            sn.assert_eq(sn.extractsingle(r'^ranks=(\d+)', self.stdout, 1,
+                                          int), self.num_tasks),
+            sn.assert_eq(sn.count(sn.findall(r'^test=\S+ api=', self.stdout)),
+                         2 * len(self.message_sizes)),
+            sn.assert_found(r'^mpi4py benchmark done', self.stdout)
+        ])
+
+    @run_after('setup')
+    def set_perf_patterns(self):
+        unit = 'MB/s' if self.benchmark == 'bandwidth' else 'us'
+        self.perf_patterns = {}
+        for api in ['buffer', 'pickle']:
+            for size in self.message_sizes:
+                self.perf_patterns[f'{api}_{size}'] = sn.extractsingle(
+                    rf'^test=\S+ api={api} size={size} value=(?P<value>\S+)',
+                    self.stdout, 'value', float)
+
+        self.reference = {
+            '*': {perf_var: (0, None, None, unit)
+                  for perf_var in self.perf_patterns}
+        }
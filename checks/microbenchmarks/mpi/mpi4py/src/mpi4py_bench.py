@@ -0,0 +1,159 @@
+# mpi4py communication benchmark
+#
+# Compares the buffer based (uppercase, e.g. Send) methods on NumPy arrays
+# with the pickle based (lowercase, e.g. send) methods on Python objects.
+#
+# Usage: python mpi4py_bench.py <latency|bandwidth|allreduce|alltoall>
+#                               <size in bytes>...
+#
+# Rank 0 prints one line per API and message size:
+#
+#   test=latency api=buffer size=8 value=1.234 us
+
+import sys
+
+import mpi4py
+import numpy as np
+from mpi4py import MPI
+
+
+comm = MPI.COMM_WORLD
+rank = comm.Get_rank()
+nranks = comm.Get_size()
+
+WINDOW = 64
+
+
+def iterations(size):
+    return (1000, 100) if size <= 8192 else (100, 10)
+
+
+def latency(size, api):
+    iters, skip = iterations(size)
+    buf = np.zeros(size, dtype='b')
+    obj = bytearray(size)
+    for i in range(iters + skip):
+        if i == skip:
+            comm.Barrier()
+            t0 = MPI.Wtime()
+
+        if rank == 0:
+            if api == 'buffer':
+                comm.Send(buf, dest=1)
+                comm.Recv(buf, source=1)
+            else:
+                comm.send(obj, dest=1)
+                obj = comm.recv(source=1)
+        elif rank == 1:
+            if api == 'buffer':
+                comm.Recv(buf, source=0)
+                comm.Send(buf, dest=0)
+            else:
+                obj = comm.recv(source=0)
+                comm.send(obj, dest=0)
+
+    # half round trip in us
+    return (MPI.Wtime() - t0) / (2.0 * iters) * 1.0e6
+
+
+def bandwidth(size, api):
+    iters, skip = iterations(size)
+    iters //= 10
+    bufs = [np.zeros(size, dtype='b') for _ in range(WINDOW)]
+    objs = [bytearray(size) for _ in range(WINDOW)]
+    ack = np.zeros(1, dtype='b')
+    for i in range(iters + skip):
+        if i == skip:
+            comm.Barrier()
+            t0 = MPI.Wtime()
+
+        if rank == 0:
+            if api == 'buffer':
+                MPI.Request.Waitall([comm.Isend(b, dest=1) for b in bufs])
+            else:
+                MPI.Request.waitall([comm.isend(o, dest=1) for o in objs])
+
+            comm.Recv(ack, source=1)
+        elif rank == 1:
+            if api == 'buffer':
+                MPI.Request.Waitall([comm.Irecv(b, source=0) for b in bufs])
+            else:
+                for _ in range(WINDOW):
+                    comm.recv(source=0)
+
+            comm.Send(ack, dest=0)
+
+    # MB/s
+    return size * WINDOW * iters / (MPI.Wtime() - t0) / 1.0e6
+
+
+def allreduce(size, api):
+    iters, skip = iterations(size)
+    count = max(size // 8, 1)
+    sendbuf = np.ones(count, dtype='d')
+    recvbuf = np.zeros(count, dtype='d')
+    for i in range(iters + skip):
+        if i == skip:
+            comm.Barrier()
+            t0 = MPI.Wtime()
+
+        if api == 'buffer':
+            comm.Allreduce(sendbuf, recvbuf, op=MPI.SUM)
+        else:
+            # the array is pickled, the sum is computed by NumPy
+            recvbuf = comm.allreduce(sendbuf, op=MPI.SUM)
+
+    assert recvbuf[0] == nranks
+
+    # average time in us
+    return (MPI.Wtime() - t0) / iters * 1.0e6
+
+
+def alltoall(size, api):
+    iters, skip = iterations(size)
+    sendbuf = np.zeros(size * nranks, dtype='b')
+    recvbuf = np.zeros(size * nranks, dtype='b')
+    objs = [bytearray(size) for _ in range(nranks)]
+    for i in range(iters + skip):
+        if i == skip:
+            comm.Barrier()
+            t0 = MPI.Wtime()
+
+        if api == 'buffer':
+            comm.Alltoall(sendbuf, recvbuf)
+        else:
+            comm.alltoall(objs)
+
+    return (MPI.Wtime() - t0) / iters * 1.0e6
+
+
+BENCHMARKS = {
+    'latency': (latency, 'us'),
+    'bandwidth': (bandwidth, 'MB/s'),
+    'allreduce': (allreduce, 'us'),
+    'alltoall': (alltoall, 'us'),
+}
+
+
+def main():
+    test = sys.argv[1]
+    sizes = [int(s) for s in sys.argv[2:]]
+    func, unit = BENCHMARKS[test]
+    if rank == 0:
+        print(f'mpi4py {mpi4py.__version__} library: '
+              f'{MPI.Get_library_version().splitlines()[0]}', flush=True)
+        print(f'ranks={nranks}', flush=True)
+
+    for size in sizes:
+        for api in ['buffer', 'pickle']:
+            value = func(size, api)
+            if rank == 0:
+                print(f'test={test} api={api} size={size} '
+                      f'value={value:.3f} {unit}', flush=True)
+
+    if rank == 0:
+        print('mpi4py benchmark done', flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import re
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+# The selectable algorithms of the MPI library of the environments, 0 is
+# the default selection of the library
+ALGORITHMS = {
+    # Open MPI coll/tuned, coll_tuned_<collective>_algorithm
+    'foss': {
+        'allreduce': {
+            1: 'basic_linear', 2: 'nonoverlapping', 3: 'recursive_doubling',
+            4: 'ring', 5: 'segmented_ring', 6: 'rabenseifner'
+        },
+        'alltoall': {
+            1: 'linear', 2: 'pairwise', 3: 'modified_bruck',
+            4: 'linear_sync'
+        },
+    },
+    # Intel MPI, I_MPI_ADJUST_<COLLECTIVE>
+    'intel': {
+        'allreduce': {
+            1: 'recursive_doubling', 2: 'rabenseifner', 3: 'reduce_bcast',
+            4: 'topo_reduce_bcast', 5: 'binomial_gather_scatter',
+            6: 'topo_binomial_gather_scatter', 7: 'shumilin_ring', 8: 'ring',
+            9: 'knomial', 10: 'topo_shm_flat', 11: 'topo_shm_knomial',
+            12: 'topo_shm_knary'
+        },
+        'alltoall': {
+            1: 'bruck', 2: 'isend_irecv_waitall', 3: 'pairwise', 4: 'plum'
+        },
+    },
+}
+
+# message size regimes by their largest size in bytes
+REGIMES = [('small', 1024), ('medium', 65536), ('large', 1 << 30)]
+
+
+def algorithm_variable(environ, collective):
+    if environ == 'intel':
+        return f'I_MPI_ADJUST_{collective.upper()}'
+
+    return f'OMPI_MCA_coll_tuned_{collective}_algorithm'
+
+
+def parse_sweep(filename):
+    '''The latencies of the sweep as {algorithm: {size: latency}}.'''
+    latencies = {}
+    algorithm = None
+    with open(filename) as fp:
+        for line in fp:
+            match = re.match(r'^algorithm=(\d+)', line)
+            if match:
+                algorithm = int(match.group(1))
+                latencies[algorithm] = {}
+                continue
+
+            match = re.match(r'^(\d+)\s+(\d+(\.\d+)?)\s*$', line)
+            if match and algorithm is not None:
+                latencies[algorithm][int(match.group(1))] = float(
+                    match.group(2))
+
+    return {alg: sizes for alg, sizes in latencies.items() if sizes}
+
+
+@rfm.simple_test
+class CollectiveAlgorithmSweep(rfm.RegressionTest, TopologyJobSizeMixin):
+    '''Latency of all selectable algorithms of Allreduce and Alltoall.
+
+    The OSU benchmark of AllreduceTest or AlltoallTest runs once with the
+    default algorithm selection of the MPI library and once per algorithm
+    of ALGORITHMS, selected with coll_tuned_<collective>_algorithm (Open
+    MPI, foss) or I_MPI_ADJUST_<COLLECTIVE> (Intel MPI). For every regime
+    of message sizes the algorithm with the lowest mean latency relative to
+    the default is reported next to the default:
+
+    - ``<regime>_default``, ``<regime>_best``: mean latency in us
+    - ``<regime>_speedup``: default over best latency
+    - ``<regime>_best_algorithm``: the number of the best algorithm
+
+    The best algorithm of every message size is written to
+    algorithm_selection.txt, as data for the tuned defaults of the MPI
+    modules.
+    '''
+
+    collective = parameter(['allreduce', 'alltoall'])
+    num_nodes = parameter([2, 4])
+    # largest message size, alltoall buffers grow with the number of tasks
+    max_message_size = variable(dict, value={
+        'allreduce': 1048576,
+        'alltoall': 16384
+    })
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss', 'intel']
+    build_system = 'Make'
+    # one task per core of every node, see TopologyJobSizeMixin
+    task_domain = 'core'
+    exclusive_access = True
+    use_multithreading = False
+    keep_files = ['algorithm_selection.txt']
+    time_limit = '1h'
+    extra_resources = {
+        'switches': {
+            'num_switches': 1
+        }
+    }
+    maintainers = ['Man']
+    tags = {'benchmark', 'tuning'}
+
+    @run_after('init')
+    def set_description(self):
+        self.descr = (f'{self.collective.capitalize()} algorithm sweep on '
+                      f'{self.num_nodes} nodes')
+        self.num_job_nodes = self.num_nodes
+
+    @run_after('setup')
+    def set_algorithms(self):
+        env = self.current_environ.name
+        self.algorithms = ALGORITHMS.get(env, {}).get(self.collective, {})
+        self.skip_if(not self.algorithms,
+                     f'no selectable algorithms for {env}')
+
+    @run_before('compile')
+    def set_makefile(self):
+        self.build_system.makefile = f'Makefile_{self.collective}'
+
+    @run_before('run')
+    def set_algorithm_loop(self):
+        env = self.current_environ.name
+        self.executable = f'./osu_{self.collective}'
+        self.executable_opts = [
+            '-m', str(self.max_message_size[self.collective]),
+            '-x', '20', '-i', '200'
+        ]
+        if env == 'foss':
+            self.variables['OMPI_MCA_coll_tuned_use_dynamic_rules'] = '1'
+
+        var = algorithm_variable(env, self.collective)
+        algorithm_ids = ' '.join(str(alg) for alg in [0, *self.algorithms])
+        self.prerun_cmds += [
+            f'for algorithm in {algorithm_ids}; do',
+            f'if [ $algorithm -eq 0 ]; then unset {var}; '
+            f'else export {var}=$algorithm; fi',
+            'echo "algorithm=$algorithm"'
+        ]
+        self.postrun_cmds = ['done'] + self.postrun_cmds
+
+    def algorithm_name(self, algorithm):
+        return self.algorithms.get(algorithm, 'default')
+
+    def write_selection(self, latencies, selection):
+        '''Write the best algorithm of every message size and regime.'''
+        env = self.current_environ.name
+        var = algorithm_variable(env, self.collective)
+        with open(os.path.join(self.stagedir, 'algorithm_selection.txt'),
+                  'w') as fp:
+            fp.write(f'# {self.collective} on {self.num_nodes} nodes, '
+                     f'{self.job.num_tasks} tasks, '
+                     f'{self.current_partition.fullname} {env}, {var}\n')
+            fp.write(f'{"size":>10}{"default":>12}{"best":>12}'
+                     f'{"speedup":>9}  algorithm\n')
+            for size, default in sorted(latencies[0].items()):
+                best = min((lat[size], alg) for alg, lat in latencies.items()
+                           if size in lat)
+                fp.write(f'{size:>10}{default:>12.2f}{best[0]:>12.2f}'
+                         f'{default / best[0]:>9.2f}  {best[1]} '
+                         f'{self.algorithm_name(best[1])}\n')
+
+            # algorithms which failed or are not supported by the library
+            failed = sorted(set(self.algorithms) - set(latencies))
+            if failed:
+                fp.write(f'# no results: {failed}\n')
+
+            for regime, (algorithm, speedup) in selection.items():
+                fp.write(f'# {regime}: {var}={algorithm} '
+                         f'({self.algorithm_name(algorithm)}), '
+                         f'speedup {speedup:.2f}\n')
+
+    @sanity_function
+    def assert_sweep(self):
+        latencies = parse_sweep(os.path.join(self.stagedir,
+                                             sn.evaluate(self.stdout)))
+        sn.evaluate(sn.assert_in(0, latencies,
+                                 msg='no results of the default algorithm'))
+
+        # per regime the algorithm with the lowest mean latency relative
+        # to the default over the sizes of the regime
+        self.perf_patterns = {}
+        selection = {}
+        lower = 0
+        for regime, upper in REGIMES:
+            sizes = [size for size in latencies[0] if lower < size <= upper]
+            lower = upper
+            if not sizes:
+                continue
+
+            def mean_latency(alg):
+                return sum(latencies[alg][size] for size in sizes) / len(sizes)
+
+            def relative(alg):
+                return sum(latencies[alg][size] / latencies[0][size]
+                           for size in sizes) / len(sizes)
+
+            candidates = [alg for alg, lat in latencies.items()
+                          if all(size in lat for size in sizes)]
+            best = min(candidates, key=relative)
+            default = mean_latency(0)
+            speedup = default / mean_latency(best)
+            selection[regime] = (best, speedup)
+            perf_vars = {
+                f'{regime}_default': (default, 'us'),
+                f'{regime}_best': (mean_latency(best), 'us'),
+                f'{regime}_speedup': (speedup, ''),
+                f'{regime}_best_algorithm': (best, ''),
+            }
+            for name, (value, unit) in perf_vars.items():
+                self.perf_patterns[name] = sn.defer(value)
+                self.reference[f'*:{name}'] = (0, None, None, unit)
+
+        self.write_selection(latencies, selection)
+        return True
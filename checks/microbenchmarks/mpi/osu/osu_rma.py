@@ -0,0 +1,80 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.repeat import RepeatedRunMixin  # noqa: E402
+
+
+@rfm.simple_test
+class RMATest(rfm.RegressionTest, GeneratedReferencesMixin,
+              RepeatedRunMixin):
+    '''One-sided MPI latency and bandwidth between two nodes.
+
+    Rank 0 accesses the window of rank 1 with MPI_Put, MPI_Get or
+    MPI_Accumulate, synchronized with a passive target lock or with the
+    active target post/start/complete/wait (pscw) or fence epochs. The
+    benchmarks are built from osu_rma_latency.c and osu_rma_bw.c, see
+    Makefile_rma. The latency is reported for 8 byte messages, the
+    bandwidth for 4 MiB messages.
+    '''
+
+    benchmark = parameter(['put_latency', 'get_latency', 'acc_latency',
+                           'put_bw', 'get_bw'])
+    sync = parameter(['lock', 'pscw', 'fence'])
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss', 'intel']
+    build_system = 'Make'
+    exclusive_access = True
+    strict_check = False
+    num_tasks = 2
+    num_tasks_per_node = 1
+    extra_resources = {
+        'switches': {
+            'num_switches': 1
+        }
+    }
+    maintainers = ['Man']
+    tags = {'benchmark'}
+
+    @run_after('init')
+    def set_perf_variable(self):
+        self.descr = f'OSU one-sided {self.benchmark} ({self.sync})'
+        if self.benchmark.endswith('_bw'):
+            self.perf_var, self.msg_size, unit = 'bw', 4194304, 'MB/s'
+        else:
+            self.perf_var, self.msg_size, unit = 'latency', 8, 'us'
+
+        self.samples = sn.extractall(
+            rf'^{self.msg_size}\s+(?P<value>\S+)', self.stdout, 'value',
+            float)
+        # median of the runs, see RepeatedRunMixin
+        self.perf_patterns = {}
+        self.repeated_perf_variable(self.perf_var, self.samples, unit)
+        self.reference = {
+            '*': {self.perf_var: (0, None, None, unit)}
+        }
+
+    @run_before('compile')
+    def set_build_options(self):
+        self.build_system.makefile = 'Makefile_rma'
+        self.build_system.options = [f'osu_{self.benchmark}']
+
+    @run_before('run')
+    def set_executable(self):
+        self.executable = f'./osu_{self.benchmark}'
+        self.executable_opts = ['-s', self.sync]
+
+    @sanity_function
+    def assert_rma(self):
+        return self.assert_samples(self.samples)
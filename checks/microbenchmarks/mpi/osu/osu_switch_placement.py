@@ -0,0 +1,141 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.osext as osext
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.switches import (SLURM_TOPOLOGY_FILE, expand_hostlist,  # noqa: E402
+                            leaf_of_nodes, read_leaf_switches)
+
+
+@rfm.simple_test
+class P2PSwitchPlacementTest(rfm.RegressionTest, GeneratedReferencesMixin):
+    '''OSU latency and bandwidth between nodes of the same and of
+    different leaf switches.
+
+    The two nodes are picked from the available nodes of the partition
+    with the leaf switches of the Slurm topology file and requested with
+    --nodelist. Every test measures one pair: two nodes of the n-th leaf
+    with free nodes (same_leaf) or one node of the n-th and one of the
+    next leaf (different_leaf), tests beyond the leaves found are skipped.
+    The difference between the placements is the cost of the spine, a
+    leaf slower than the others in both of its different_leaf pairs
+    points to a faulty uplink. The sanity checks the placement the job
+    really got.
+    '''
+
+    benchmark = parameter(['latency', 'bw'])
+    placement = parameter(['same_leaf', 'different_leaf'])
+    leaf_pair = parameter(range(8))
+    topology_file = variable(str, value=SLURM_TOPOLOGY_FILE)
+    # the leaf switches to use, by default all of them with free nodes
+    leaf_switches = variable(list, value=[])
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss', 'intel']
+    build_system = 'Make'
+    num_tasks = 2
+    num_tasks_per_node = 1
+    exclusive_access = True
+    strict_check = False
+    prerun_cmds = ['echo "Job nodes: $SLURM_JOB_NODELIST"']
+    maintainers = ['Mandes']
+    tags = {'benchmark', 'diagnostic'}
+
+    @run_after('init')
+    def set_benchmark(self):
+        self.descr = (f'P2P {self.benchmark} microbenchmark '
+                      f'({self.placement.replace("_", " ")} '
+                      f'{self.leaf_pair})')
+        self.executable = f'./p2p_osu_{self.benchmark}'
+        self.executable_opts = ['-x', '100', '-i', '1000']
+        if self.benchmark == 'latency':
+            self.perf_patterns = {
+                'latency': sn.extractsingle(r'^8\s+(?P<latency>\S+)',
+                                            self.stdout, 'latency', float)
+            }
+            self.reference = {
+                '*': {'latency': (0, None, None, 'us')}
+            }
+        else:
+            self.perf_patterns = {
+                'bw': sn.extractsingle(r'^4194304\s+(?P<bw>\S+)',
+                                       self.stdout, 'bw', float)
+            }
+            self.reference = {
+                '*': {'bw': (0, None, None, 'MB/s')}
+            }
+
+    @run_before('compile')
+    def set_makefile(self):
+        self.build_system.makefile = 'Makefile_p2p'
+
+    def available_nodes(self):
+        '''The idle nodes of the partition, or all of them if none is.'''
+        partition = self.current_partition.name
+        nodes = []
+        for states in ['idle', 'idle,mixed,allocated']:
+            completed = osext.run_command(
+                f'sinfo -h -N -p {partition} -t {states} -o %N')
+            nodes = completed.stdout.split()
+            if nodes:
+                break
+
+        return nodes
+
+    @run_after('setup')
+    def select_nodes(self):
+        self.skip_if(not os.path.exists(self.topology_file),
+                     f'no switch topology file {self.topology_file}')
+        leaves = read_leaf_switches(self.topology_file)
+        self.leaf_of = leaf_of_nodes(leaves)
+        nodes = set(self.available_nodes())
+        candidates = {switch: [n for n in leaves[switch] if n in nodes]
+                      for switch in self.leaf_switches or sorted(leaves)
+                      if switch in leaves}
+        if self.placement == 'same_leaf':
+            pairs = [hosts[:2] for hosts in candidates.values()
+                     if len(hosts) >= 2]
+        else:
+            # every leaf with its successor, so that a faulty uplink shows
+            # in the two pairs of its leaf
+            firsts = [hosts[0] for hosts in candidates.values() if hosts]
+            pairs = [list(pair) for pair in zip(firsts, firsts[1:])]
+
+        self.skip_if(self.leaf_pair >= len(pairs),
+                     f'only {len(pairs)} node pair(s) for placement '
+                     f'{self.placement!r}')
+        self.nodelist = pairs[self.leaf_pair]
+        leaves = ' '.join(sorted({self.leaf_of[n] for n in self.nodelist}))
+        self.descr += f' on {leaves}'
+
+    @run_before('run')
+    def set_nodelist(self):
+        self.job.options += [f'--nodelist={",".join(self.nodelist)}']
+
+    @sanity_function
+    def assert_placement(self):
+        nodes = expand_hostlist(sn.evaluate(sn.extractsingle(
+            r'^Job nodes: (\S+)', self.stdout, 1)))
+        unknown = [node for node in nodes if node not in self.leaf_of]
+        num_leaves = len({self.leaf_of.get(node) for node in nodes})
+        expected = 1 if self.placement == 'same_leaf' else 2
+        message_size = 8 if self.benchmark == 'latency' else 4194304
+        return sn.all([
+            sn.assert_false(unknown,
+                            msg=f'nodes {unknown} are not in '
+                                f'{self.topology_file}'),
+            sn.assert_eq(num_leaves, expected,
+                         msg=f'nodes {nodes} are on {num_leaves} leaf '
+                             f'switch(es), expected {expected}'),
+            sn.assert_found(rf'^{message_size}\s', self.stdout)
+        ])
@@ -3,12 +3,21 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
+import sys
+
 import reframe as rfm
 import reframe.utility.sanity as sn
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.repeat import RepeatedRunMixin  # noqa: E402
+
 
 @rfm.parameterized_test(['production'])
-class AlltoallTest(rfm.RegressionTest):
+class AlltoallTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                   RepeatedRunMixin):
     def __init__(self, variant):
         self.strict_check = False
         self.valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
@@ -23,10 +32,13 @@ class AlltoallTest(rfm.RegressionTest):
         self.valid_prog_environs = ['foss', 'intel']
         self.maintainers = ['Man']
         self.sanity_patterns = sn.assert_found(r'^8', self.stdout)
-        self.perf_patterns = {
-            'latency': sn.extractsingle(r'^8\s+(?P<latency>\S+)',
-                                        self.stdout, 'latency', float)
-        }
+        # no time limit of its own to scale, so fewer runs, see
+        # RepeatedRunMixin
+        self.num_repeats = 3
+        self.perf_patterns = {}
+        self.repeated_perf_variable(
+            'latency', sn.extractall(r'^8\s+(?P<latency>\S+)', self.stdout,
+                                     'latency', float), 'us')
         self.tags = {variant, 'benchmark'}
         self.reference = {
                 'ubelix:bdw': {'latency': (20.73, None, 2.0, 'us') },
@@ -60,7 +72,8 @@ class AlltoallTest(rfm.RegressionTest):
 
 
 @rfm.parameterized_test(['small'])#, ['large'])
-class AllreduceTest(rfm.RegressionTest):
+class AllreduceTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                    RepeatedRunMixin):
     def __init__(self, variant):
         self.strict_check = False
         self.valid_systems = ['ubelix:bdw']
@@ -76,10 +89,13 @@ class AllreduceTest(rfm.RegressionTest):
         self.executable_opts = ['-m', '8', '-x', '1000', '-i', '20000']
         self.valid_prog_environs = ['foss']
         self.sanity_patterns = sn.assert_found(r'^8', self.stdout)
-        self.perf_patterns = {
-            'latency': sn.extractsingle(r'^8\s+(?P<latency>\S+)',
-                                        self.stdout, 'latency', float)
-        }
+        # no time limit of its own to scale, so fewer runs, see
+        # RepeatedRunMixin
+        self.num_repeats = 3
+        self.perf_patterns = {}
+        self.repeated_perf_variable(
+            'latency', sn.extractall(r'^8\s+(?P<latency>\S+)', self.stdout,
+                                     'latency', float), 'us')
         self.num_gpus_per_node  = 0
         self.num_tasks_per_node = 1
         if variant == 'small':
@@ -110,7 +126,8 @@ class AllreduceTest(rfm.RegressionTest):
         if self.current_partition.fullname in ['ubelix:gpu']:
             self.num_gpus_per_node  = 1
 
-class P2PBaseTest(rfm.RegressionTest):
+class P2PBaseTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                  RepeatedRunMixin):
     def __init__(self):
         self.exclusive_access = True
         self.strict_check = False
@@ -122,6 +139,9 @@ class P2PBaseTest(rfm.RegressionTest):
         self.valid_prog_environs = ['foss', 'intel']
         self.tags = {'production', 'benchmark'}
         self.sanity_patterns = sn.assert_found(r'^4194304', self.stdout)
+        # no time limit of its own to scale, so fewer runs, see
+        # RepeatedRunMixin
+        self.num_repeats = 3
 
         self.extra_resources = {
             'switches': {
@@ -142,10 +162,10 @@ class P2PCPUBandwidthTest(P2PBaseTest):
                 'ubelix:bdw': {'bw': (9607.0, -0.10, None, 'MB/s')},
                 'ubelix:epyc2': {'bw': (9607.0, -0.10, None, 'MB/s')},
         }
-        self.perf_patterns = {
-            'bw': sn.extractsingle(r'^4194304\s+(?P<bw>\S+)',
-                                   self.stdout, 'bw', float)
-        }
+        self.perf_patterns = {}
+        self.repeated_perf_variable(
+            'bw', sn.extractall(r'^4194304\s+(?P<bw>\S+)', self.stdout,
+                                'bw', float), 'MB/s')
 
 
 @rfm.simple_test
@@ -160,10 +180,10 @@ class P2PCPULatencyTest(P2PBaseTest):
             'ubelix:bdw': {'latency': (1.30, None, 0.70, 'us')},
             'ubelix:epyc2': {'latency': (1.30, None, 0.70, 'us')},
         }
-        self.perf_patterns = {
-            'latency': sn.extractsingle(r'^8\s+(?P<latency>\S+)',
-                                        self.stdout, 'latency', float)
-        }
+        self.perf_patterns = {}
+        self.repeated_perf_variable(
+            'latency', sn.extractall(r'^8\s+(?P<latency>\S+)', self.stdout,
+                                     'latency', float), 'us')
 
 
 #@rfm.simple_test
@@ -0,0 +1,128 @@
+/*
+ * One-sided operation of the RMA latency and bandwidth benchmarks.
+ *
+ * osu_rma_latency.c and osu_rma_bw.c are built once per operation, selected
+ * with -DRMA_PUT, -DRMA_GET or -DRMA_ACC (see Makefile_rma):
+ *
+ *   put   MPI_Put of size bytes
+ *   get   MPI_Get of size bytes
+ *   acc   MPI_Accumulate (MPI_SUM) of size / sizeof(int) integers
+ */
+#ifndef OSU_RMA_H
+#define OSU_RMA_H 1
+
+#if defined(RMA_GET)
+#   define RMA_NAME "get"
+#   define RMA_OP_NAME "MPI_Get"
+#elif defined(RMA_ACC)
+#   define RMA_NAME "acc"
+#   define RMA_OP_NAME "MPI_Accumulate"
+#else
+#   define RMA_NAME "put"
+#   define RMA_OP_NAME "MPI_Put"
+#endif
+
+#include "osu_util.h"
+
+/* the smallest message of the operation */
+#if defined(RMA_ACC)
+#   define RMA_MIN_SIZE ((int) sizeof(int))
+#else
+#   define RMA_MIN_SIZE 1
+#endif
+
+static inline void rma_op (char *buf, int size, int target, MPI_Aint disp,
+                           MPI_Win win)
+{
+#if defined(RMA_GET)
+    MPI_CHECK(MPI_Get(buf, size, MPI_CHAR, target, disp, size, MPI_CHAR, win));
+#elif defined(RMA_ACC)
+    int count = size / sizeof(int);
+
+    MPI_CHECK(MPI_Accumulate(buf, count, MPI_INT, target, disp, count,
+                             MPI_INT, MPI_SUM, win));
+#else
+    MPI_CHECK(MPI_Put(buf, size, MPI_CHAR, target, disp, size, MPI_CHAR, win));
+#endif
+}
+
+/*
+ * Process the options and initialize MPI, returns the rank or exits if the
+ * benchmark is not to be run.
+ */
+static inline int init_one_sided (int *argc, char ***argv, const char *name)
+{
+    int rank, nprocs;
+    int po_ret;
+
+    set_header(HEADER);
+    set_benchmark_name(name);
+
+    po_ret = process_options(*argc, *argv);
+
+    MPI_CHECK(MPI_Init(argc, argv));
+    MPI_CHECK(MPI_Comm_size(MPI_COMM_WORLD, &nprocs));
+    MPI_CHECK(MPI_Comm_rank(MPI_COMM_WORLD, &rank));
+
+    if (0 == rank) {
+        switch (po_ret) {
+            case PO_BAD_USAGE:
+                print_bad_usage_message(rank);
+                break;
+            case PO_HELP_MESSAGE:
+                usage_one_sided(name);
+                break;
+            case PO_VERSION_MESSAGE:
+                print_version_message(rank);
+                break;
+            default:
+                break;
+        }
+    }
+
+    switch (po_ret) {
+        case PO_BAD_USAGE:
+            MPI_CHECK(MPI_Finalize());
+            exit(EXIT_FAILURE);
+        case PO_HELP_MESSAGE:
+        case PO_VERSION_MESSAGE:
+            MPI_CHECK(MPI_Finalize());
+            exit(EXIT_SUCCESS);
+        default:
+            break;
+    }
+
+    if (nprocs != 2) {
+        if (rank == 0) {
+            fprintf(stderr, "This test requires exactly two processes\n");
+        }
+
+        MPI_CHECK(MPI_Finalize());
+        exit(EXIT_FAILURE);
+    }
+
+    switch (options.sync) {
+        case LOCK:
+#if MPI_VERSION >= 3
+        case FLUSH:
+#endif
+        case PSCW:
+        case FENCE:
+            break;
+        default:
+            if (rank == 0) {
+                fprintf(stderr, "Synchronization %s is not supported\n",
+                        sync_info[options.sync]);
+            }
+            MPI_CHECK(MPI_Finalize());
+            exit(EXIT_FAILURE);
+    }
+
+    if (options.min_message_size < RMA_MIN_SIZE) {
+        options.min_message_size = RMA_MIN_SIZE;
+    }
+
+    return rank;
+}
+
+#endif
@@ -0,0 +1,157 @@
+#define BENCHMARK "OSU MPI%s One Sided " RMA_OP_NAME " Bandwidth Test"
+/*
+ * Copyright (C) 2003-2017 the Network-Based Computing Laboratory
+ * (NBCL), The Ohio State University.
+ *
+ * Contact: Dr. D. K. Panda (panda@cse.ohio-state.edu)
+ *
+ * For detailed copyright and licensing information, please refer to the
+ * copyright file COPYRIGHT in the top level OMB directory.
+ */
+
+/*
+ * Bandwidth of one-sided operations of rank 0 on the window of rank 1.
+ * Every synchronization epoch contains window_size_large (-W) operations
+ * on consecutive parts of the window.
+ */
+#include "osu_rma.h"
+
+void run_bw (int rank, enum WINDOW type)
+{
+    int size, i, j, peer = rank == 0 ? 1 : 0;
+    int window_size = options.window_size_large;
+    size_t buf_size = options.max_message_size * window_size + MAX_ALIGNMENT;
+    char *sbuf_orig = malloc(buf_size);
+    char *rbuf_orig = malloc(buf_size);
+    char *sbuf = NULL, *rbuf = NULL;
+    double t_start = 0.0, t_end = 0.0, bw;
+    MPI_Aint disp = 0;
+    MPI_Group comm_group, group;
+    MPI_Win win;
+
+    MPI_CHECK(MPI_Comm_group(MPI_COMM_WORLD, &comm_group));
+    MPI_CHECK(MPI_Group_incl(comm_group, 1, &peer, &group));
+
+    for (size = options.min_message_size; size <= options.max_message_size; size *= 2) {
+        allocate_memory_one_sided(rank, sbuf_orig, rbuf_orig, &sbuf, &rbuf,
+                                  &rbuf, size * window_size, type, &win);
+#if MPI_VERSION >= 3
+        if (type == WIN_DYNAMIC) {
+            disp = disp_remote;
+        }
+#endif
+
+        if (size > LARGE_MESSAGE_SIZE) {
+            options.iterations = options.iterations_large;
+            options.skip = options.skip_large;
+        }
+
+        MPI_CHECK(MPI_Barrier(MPI_COMM_WORLD));
+
+        switch (options.sync) {
+#if MPI_VERSION >= 3
+            case FLUSH:
+                if (rank == 0) {
+                    MPI_CHECK(MPI_Win_lock(MPI_LOCK_SHARED, 1, 0, win));
+                    for (i = 0; i < options.skip + options.iterations; i++) {
+                        if (i == options.skip) {
+                            t_start = MPI_Wtime();
+                        }
+                        for (j = 0; j < window_size; j++) {
+                            rma_op(sbuf + j * size, size, 1, disp + j * size, win);
+                        }
+                        MPI_CHECK(MPI_Win_flush(1, win));
+                    }
+                    t_end = MPI_Wtime();
+                    MPI_CHECK(MPI_Win_unlock(1, win));
+                }
+                break;
+#endif
+            case PSCW:
+                for (i = 0; i < options.skip + options.iterations; i++) {
+                    if (i == options.skip) {
+                        t_start = MPI_Wtime();
+                    }
+                    if (rank == 0) {
+                        MPI_CHECK(MPI_Win_start(group, 0, win));
+                        for (j = 0; j < window_size; j++) {
+                            rma_op(sbuf + j * size, size, 1, disp + j * size, win);
+                        }
+                        MPI_CHECK(MPI_Win_complete(win));
+                    } else {
+                        MPI_CHECK(MPI_Win_post(group, 0, win));
+                        MPI_CHECK(MPI_Win_wait(win));
+                    }
+                }
+                t_end = MPI_Wtime();
+                break;
+            case FENCE:
+                MPI_CHECK(MPI_Win_fence(0, win));
+                for (i = 0; i < options.skip + options.iterations; i++) {
+                    if (i == options.skip) {
+                        t_start = MPI_Wtime();
+                    }
+                    if (rank == 0) {
+                        for (j = 0; j < window_size; j++) {
+                            rma_op(sbuf + j * size, size, 1, disp + j * size, win);
+                        }
+                    }
+                    MPI_CHECK(MPI_Win_fence(0, win));
+                }
+                t_end = MPI_Wtime();
+                break;
+            default:
+                if (rank == 0) {
+                    for (i = 0; i < options.skip + options.iterations; i++) {
+                        if (i == options.skip) {
+                            t_start = MPI_Wtime();
+                        }
+                        MPI_CHECK(MPI_Win_lock(MPI_LOCK_EXCLUSIVE, 1, 0, win));
+                        for (j = 0; j < window_size; j++) {
+                            rma_op(sbuf + j * size, size, 1, disp + j * size, win);
+                        }
+                        MPI_CHECK(MPI_Win_unlock(1, win));
+                    }
+                    t_end = MPI_Wtime();
+                }
+                break;
+        }
+
+        MPI_CHECK(MPI_Barrier(MPI_COMM_WORLD));
+
+        if (rank == 0) {
+            bw = size / 1.0e6 * options.iterations * window_size /
+                 (t_end - t_start);
+            fprintf(stdout, "%-*d%*.*f\n", 10, size, FIELD_WIDTH,
+                    FLOAT_PRECISION, bw);
+            fflush(stdout);
+        }
+
+        free_memory_one_sided(sbuf, rbuf, win, rank);
+    }
+
+    MPI_CHECK(MPI_Group_free(&group));
+    MPI_CHECK(MPI_Group_free(&comm_group));
+    free(sbuf_orig);
+    free(rbuf_orig);
+}
+
+int main (int argc, char *argv[])
+{
+    int rank;
+
+    options.win = WIN_CREATE;
+    options.sync = LOCK;
+    options.bench = ONE_SIDED;
+    options.subtype = BW;
+    options.synctype = ALL_SYNC;
+
+    rank = init_one_sided(&argc, &argv, "osu_" RMA_NAME "_bw");
+
+    print_header_one_sided(rank, options.win, options.sync);
+    run_bw(rank, options.win);
+
+    MPI_CHECK(MPI_Finalize());
+
+    return EXIT_SUCCESS;
+}
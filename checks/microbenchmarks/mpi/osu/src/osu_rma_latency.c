@@ -0,0 +1,160 @@
+#define BENCHMARK "OSU MPI%s One Sided " RMA_OP_NAME " Latency Test"
+/*
+ * Copyright (C) 2003-2017 the Network-Based Computing Laboratory
+ * (NBCL), The Ohio State University.
+ *
+ * Contact: Dr. D. K. Panda (panda@cse.ohio-state.edu)
+ *
+ * For detailed copyright and licensing information, please refer to the
+ * copyright file COPYRIGHT in the top level OMB directory.
+ */
+
+/*
+ * Latency of a one-sided operation of rank 0 on the window of rank 1 with
+ * passive (lock, flush) or active (pscw, fence) target synchronization.
+ * With active synchronization both ranks take turns, the latency is half
+ * the time of a round.
+ */
+#include "osu_rma.h"
+
+void run_latency (int rank, enum WINDOW type)
+{
+    int size, i, peer = rank == 0 ? 1 : 0;
+    char *sbuf_orig = malloc(options.max_message_size + MAX_ALIGNMENT);
+    char *rbuf_orig = malloc(options.max_message_size + MAX_ALIGNMENT);
+    char *sbuf = NULL, *rbuf = NULL;
+    double t_start = 0.0, t_end = 0.0, latency;
+    /* operations of rank 0 per iteration */
+    int ops = 1;
+    MPI_Aint disp = 0;
+    MPI_Group comm_group, group;
+    MPI_Win win;
+
+    MPI_CHECK(MPI_Comm_group(MPI_COMM_WORLD, &comm_group));
+    MPI_CHECK(MPI_Group_incl(comm_group, 1, &peer, &group));
+
+    for (size = options.min_message_size; size <= options.max_message_size; size *= 2) {
+        allocate_memory_one_sided(rank, sbuf_orig, rbuf_orig, &sbuf, &rbuf,
+                                  &rbuf, size, type, &win);
+#if MPI_VERSION >= 3
+        if (type == WIN_DYNAMIC) {
+            disp = disp_remote;
+        }
+#endif
+
+        if (size > LARGE_MESSAGE_SIZE) {
+            options.iterations = options.iterations_large;
+            options.skip = options.skip_large;
+        }
+
+        MPI_CHECK(MPI_Barrier(MPI_COMM_WORLD));
+
+        switch (options.sync) {
+#if MPI_VERSION >= 3
+            case FLUSH:
+                if (rank == 0) {
+                    MPI_CHECK(MPI_Win_lock(MPI_LOCK_SHARED, 1, 0, win));
+                    for (i = 0; i < options.skip + options.iterations; i++) {
+                        if (i == options.skip) {
+                            t_start = MPI_Wtime();
+                        }
+                        rma_op(sbuf, size, 1, disp, win);
+                        MPI_CHECK(MPI_Win_flush(1, win));
+                    }
+                    t_end = MPI_Wtime();
+                    MPI_CHECK(MPI_Win_unlock(1, win));
+                }
+                break;
+#endif
+            case PSCW:
+                ops = 2;
+                for (i = 0; i < options.skip + options.iterations; i++) {
+                    if (i == options.skip) {
+                        t_start = MPI_Wtime();
+                    }
+                    if (rank == 0) {
+                        MPI_CHECK(MPI_Win_start(group, 0, win));
+                        rma_op(sbuf, size, 1, disp, win);
+                        MPI_CHECK(MPI_Win_complete(win));
+                        MPI_CHECK(MPI_Win_post(group, 0, win));
+                        MPI_CHECK(MPI_Win_wait(win));
+                    } else {
+                        MPI_CHECK(MPI_Win_post(group, 0, win));
+                        MPI_CHECK(MPI_Win_wait(win));
+                        MPI_CHECK(MPI_Win_start(group, 0, win));
+                        rma_op(sbuf, size, 0, disp, win);
+                        MPI_CHECK(MPI_Win_complete(win));
+                    }
+                }
+                t_end = MPI_Wtime();
+                break;
+            case FENCE:
+                ops = 2;
+                MPI_CHECK(MPI_Win_fence(0, win));
+                for (i = 0; i < options.skip + options.iterations; i++) {
+                    if (i == options.skip) {
+                        t_start = MPI_Wtime();
+                    }
+                    if (rank == 0) {
+                        rma_op(sbuf, size, 1, disp, win);
+                    }
+                    MPI_CHECK(MPI_Win_fence(0, win));
+                    if (rank == 1) {
+                        rma_op(sbuf, size, 0, disp, win);
+                    }
+                    MPI_CHECK(MPI_Win_fence(0, win));
+                }
+                t_end = MPI_Wtime();
+                break;
+            default:
+                if (rank == 0) {
+                    for (i = 0; i < options.skip + options.iterations; i++) {
+                        if (i == options.skip) {
+                            t_start = MPI_Wtime();
+                        }
+                        MPI_CHECK(MPI_Win_lock(MPI_LOCK_EXCLUSIVE, 1, 0, win));
+                        rma_op(sbuf, size, 1, disp, win);
+                        MPI_CHECK(MPI_Win_unlock(1, win));
+                    }
+                    t_end = MPI_Wtime();
+                }
+                break;
+        }
+
+        MPI_CHECK(MPI_Barrier(MPI_COMM_WORLD));
+
+        if (rank == 0) {
+            latency = (t_end - t_start) * 1.0e6 / (ops * options.iterations);
+            fprintf(stdout, "%-*d%*.*f\n", 10, size, FIELD_WIDTH,
+                    FLOAT_PRECISION, latency);
+            fflush(stdout);
+        }
+
+        free_memory_one_sided(sbuf, rbuf, win, rank);
+    }
+
+    MPI_CHECK(MPI_Group_free(&group));
+    MPI_CHECK(MPI_Group_free(&comm_group));
+    free(sbuf_orig);
+    free(rbuf_orig);
+}
+
+int main (int argc, char *argv[])
+{
+    int rank;
+
+    options.win = WIN_CREATE;
+    options.sync = LOCK;
+    options.bench = ONE_SIDED;
+    options.subtype = LAT;
+    options.synctype = ALL_SYNC;
+
+    rank = init_one_sided(&argc, &argv, "osu_" RMA_NAME "_latency");
+
+    print_header_one_sided(rank, options.win, options.sync);
+    run_latency(rank, options.win);
+
+    MPI_CHECK(MPI_Finalize());
+
+    return EXIT_SUCCESS;
+}
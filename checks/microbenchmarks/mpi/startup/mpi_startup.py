@@ -0,0 +1,95 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+from reframe.core.backends import getlauncher
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+@rfm.simple_test
+class MPIStartupTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                     TopologyJobSizeMixin):
+    '''Time to launch an MPI job and to initialise MPI.
+
+    The job script records the time right before the launcher is invoked,
+    every rank measures the time until main(), the time of MPI_Init or
+    MPI_Init_thread and of the first collective. The maximum over all ranks
+    is reported, that is what a short job or workflow step pays:
+
+    launch_to_main: max=235.067 avg=233.507 ms
+    '''
+
+    launcher = parameter(['srun', 'mpirun'])
+    init = parameter(['init', 'init_thread'])
+    nodes = parameter([1, 2, 4])
+    # one rank per node, per NUMA domain or per core
+    placement = parameter(['node', 'numa', 'core'])
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss', 'intel']
+    build_system = 'SingleSource'
+    sourcepath = 'mpi_startup.c'
+    prerun_cmds = ['export RFM_LAUNCH_NS="$(date +%s%N)"']
+    time_limit = '10m'
+    maintainers = ['Mandes']
+    tags = {'benchmark', 'prgenv'}
+
+    @run_after('init')
+    def set_job_layout(self):
+        self.descr = (f'MPI start-up ({self.launcher}, MPI_{self.init}, '
+                      f'{self.nodes} nodes, one rank per {self.placement})')
+        self.task_domain = self.placement
+        self.num_job_nodes = self.nodes
+        if self.nodes > 1:
+            self.extra_resources = {
+                'switches': {
+                    'num_switches': 1
+                }
+            }
+
+    @run_after('init')
+    def set_perf_patterns(self):
+        # the maximum over all ranks
+        self.perf_patterns = {}
+        self.reference = {}
+        for name in ['launch_to_main', 'mpi_init', 'first_allreduce',
+                     'startup_total']:
+            self.perf_patterns[name] = sn.extractsingle(
+                rf'^{name}: max=(?P<max>\S+)', self.stdout, 'max', float)
+            self.reference[f'*:{name}'] = (0, None, None, 'ms')
+
+    @run_before('compile')
+    def set_cppflags(self):
+        self.build_system.cflags = ['-O2']
+        if self.init == 'init_thread':
+            self.build_system.cppflags = ['-D_MPI_INIT_THREAD']
+
+    @run_before('run')
+    def set_launcher(self):
+        if self.launcher != 'srun':
+            self.job.launcher = getlauncher(self.launcher)()
+
+        # the ranks are single-threaded
+        self.variables['OMP_NUM_THREADS'] = '1'
+
+    @sanity_function
+    def assert_startup(self):
+        return sn.all([
+            sn.assert_eq(sn.extractsingle(r'^MPI start-up: ranks=(\d+)',
+                                          self.stdout, 1, int),
+                         self.num_tasks),
+            sn.assert_found(r'launch_time=yes', self.stdout),
+            sn.assert_eq(sn.extractsingle(r'^Allreduce result: (\d+)',
+                                          self.stdout, 1, int),
+                         self.num_tasks)
+        ])
@@ -0,0 +1,83 @@
+/*
+ * MPI start-up time
+ *
+ * Measures per rank
+ *   - the time from the launcher invocation to main(), the job script
+ *     exports the launch time in ns as RFM_LAUNCH_NS
+ *   - the time spent in MPI_Init (or MPI_Init_thread with
+ *     -D_MPI_INIT_THREAD)
+ *   - the time of the first and of a second MPI_Allreduce, the first one
+ *     includes the lazy connection set-up of many MPI libraries
+ *
+ * and rank 0 prints the maximum and average over all ranks in ms:
+ *
+ *   launch_to_main: max=123.456 avg=100.000 ms
+ */
+#define _POSIX_C_SOURCE 200809L
+
+#include <mpi.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+static double
+now_ms(void)
+{
+    struct timespec ts;
+
+    clock_gettime(CLOCK_REALTIME, &ts);
+    return ts.tv_sec * 1.0e3 + ts.tv_nsec * 1.0e-6;
+}
+
+static void
+report(const char *name, double value, int rank, int size)
+{
+    double max, sum;
+
+    MPI_Reduce(&value, &max, 1, MPI_DOUBLE, MPI_MAX, 0, MPI_COMM_WORLD);
+    MPI_Reduce(&value, &sum, 1, MPI_DOUBLE, MPI_SUM, 0, MPI_COMM_WORLD);
+    if (rank == 0)
+        printf("%s: max=%.3f avg=%.3f ms\n", name, max, sum / size);
+}
+
+int
+main(int argc, char *argv[])
+{
+    double t_main = now_ms(), t_launch = t_main, t0, t1, t2, t3;
+    int rank, size, provided = MPI_THREAD_SINGLE, in = 1, out;
+    const char *launch = getenv("RFM_LAUNCH_NS");
+
+    if (launch != NULL)
+        t_launch = strtod(launch, NULL) * 1.0e-6;
+
+    t0 = now_ms();
+#ifdef _MPI_INIT_THREAD
+    MPI_Init_thread(&argc, &argv, MPI_THREAD_MULTIPLE, &provided);
+#else
+    MPI_Init(&argc, &argv);
+#endif
+    t1 = now_ms();
+    MPI_Allreduce(&in, &out, 1, MPI_INT, MPI_SUM, MPI_COMM_WORLD);
+    t2 = now_ms();
+    MPI_Allreduce(&in, &out, 1, MPI_INT, MPI_SUM, MPI_COMM_WORLD);
+    t3 = now_ms();
+
+    MPI_Comm_rank(MPI_COMM_WORLD, &rank);
+    MPI_Comm_size(MPI_COMM_WORLD, &size);
+    if (rank == 0) {
+        printf("MPI start-up: ranks=%d thread_level=%d launch_time=%s\n",
+               size, provided, launch != NULL ? "yes" : "no");
+    }
+
+    report("launch_to_main", t_main - t_launch, rank, size);
+    report("mpi_init", t1 - t0, rank, size);
+    report("first_allreduce", t2 - t1, rank, size);
+    report("second_allreduce", t3 - t2, rank, size);
+    report("startup_total", t2 - t_launch, rank, size);
+
+    if (rank == 0)
+        printf("Allreduce result: %d\n", out);
+
+    MPI_Finalize();
+    return 0;
+}
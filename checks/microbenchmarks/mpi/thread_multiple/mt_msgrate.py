@@ -0,0 +1,122 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+@rfm.simple_test
+class MultiThreadedMessageRateTest(rfm.RegressionTest,
+                                   GeneratedReferencesMixin,
+                                   TopologyJobSizeMixin):
+    '''Message rate and latency of concurrent threads under
+    MPI_THREAD_MULTIPLE.
+
+    Two ranks, on two nodes (inter) or on the two sockets of one node
+    (intra), exchange small messages from 1, 2, 4, ... OpenMP threads at
+    once, on a shared communicator or on one communicator per thread. A
+    message rate which does not grow with the threads shows that the MPI
+    library serialises internally. The test is skipped if the MPI library
+    does not grant MPI_THREAD_MULTIPLE, see also MpiInitTest for the thread
+    level granted by the MPI libraries.
+
+    threads=4 msg_rate=1234567.8 msg/s latency=1.234 us
+    '''
+
+    comm_mode = parameter(['shared', 'per_thread'])
+    placement = parameter(['inter', 'intra'])
+    message_size = variable(int, value=8)
+    max_threads = variable(int, value=64)
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss', 'intel']
+    build_system = 'SingleSource'
+    sourcepath = 'mt_msgrate.c'
+    exclusive_access = True
+    use_multithreading = False
+    time_limit = '20m'
+    maintainers = ['Mandes']
+    tags = {'benchmark'}
+
+    @run_after('init')
+    def set_job_layout(self):
+        self.descr = (f'MPI_THREAD_MULTIPLE message rate ({self.comm_mode} '
+                      f'communicator, {self.placement}-node)')
+        if self.placement == 'inter':
+            self.task_domain = 'node'
+            self.num_job_nodes = 2
+            self.extra_resources = {
+                'switches': {
+                    'num_switches': 1
+                }
+            }
+        else:
+            self.task_domain = 'socket'
+            self.num_job_nodes = 1
+            self.domains_per_node = 2
+
+    @run_before('compile')
+    def set_cflags(self):
+        envname = self.current_environ.name
+        self.build_system.cflags = {
+            'foss': ['-O2', '-fopenmp'],
+            'intel': ['-O2', '-qopenmp'],
+        }.get(envname, ['-O2'])
+
+    @run_before('run')
+    def set_thread_counts(self):
+        self.thread_counts = []
+        nthreads = 1
+        while nthreads <= min(self.num_cpus_per_task, self.max_threads):
+            self.thread_counts.append(nthreads)
+            nthreads *= 2
+
+        self.executable_opts = [self.comm_mode, str(self.message_size)]
+        self.executable_opts += [str(n) for n in self.thread_counts]
+        self.variables.update({
+            'OMP_PLACES': 'cores',
+            'OMP_PROC_BIND': 'close',
+        })
+        self.perf_patterns = {}
+        self.reference = {}
+        partition_name = self.current_partition.fullname
+        for n in self.thread_counts:
+            for key, unit in [('msg_rate', 'msg/s'), ('latency', 'us')]:
+                perf_var = f'{key}_t{n}'
+                self.reference[f'{partition_name}:{perf_var}'] = (
+                    0.0, None, None, unit
+                )
+                self.perf_patterns[perf_var] = sn.extractsingle(
+                    rf'^threads={n} .*{key}=(?P<value>\S+)',
+                    self.stdout, 'value', float)
+
+    @run_before('sanity')
+    def skip_without_thread_multiple(self):
+        # the benchmark exits early with the thread level granted instead
+        levels = sn.evaluate(sn.extractall(
+            r'^MPI_THREAD_MULTIPLE not provided \(provided=(\d+)\)',
+            self.stdout, 1, int))
+        if levels:
+            self.skip(f'MPI_THREAD_MULTIPLE not provided by the MPI library '
+                      f'of {self.current_environ.name}, thread level '
+                      f'{levels[0]}')
+
+    @sanity_function
+    def assert_thread_multiple(self):
+        return sn.all([
+            sn.assert_found(r'^MPI_THREAD_MULTIPLE provided', self.stdout,
+                            msg='MPI_THREAD_MULTIPLE not provided'),
+            sn.assert_eq(sn.count(sn.findall(r'^threads=\d+ msg_rate=',
+                                             self.stdout)),
+                         len(self.thread_counts))
+        ])
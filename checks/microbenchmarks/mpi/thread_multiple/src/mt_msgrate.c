@@ -0,0 +1,160 @@
+/*
+ * Multi-threaded MPI message rate and latency
+ *
+ * Two ranks, each with N OpenMP threads. Thread i of rank 0 exchanges
+ * small messages with thread i of rank 1, all threads concurrently, either
+ * on MPI_COMM_WORLD with the thread id as tag (shared) or on a duplicated
+ * communicator per thread (per_thread).
+ *
+ * Usage: mt_msgrate <shared|per_thread> <message size> <threads>...
+ *
+ * For every thread count rank 0 prints
+ *
+ *   threads=4 msg_rate=1234567.8 msg/s latency=1.234 us
+ *
+ * where the message rate is the sum of the rates of the threads and the
+ * latency is the average ping-pong half round trip time of the threads.
+ * Both are timed after SKIP warm-up iterations.
+ */
+#include <mpi.h>
+#include <omp.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define WINDOW      64
+#define ITERATIONS  1000
+#define SKIP        100
+
+static double
+message_rate(MPI_Comm comm, int rank, int tag, char *buf, int size)
+{
+    MPI_Request req[WINDOW];
+    char ack = 0;
+    double t0 = 0.0;
+    int i, w;
+
+    for (i = 0; i < ITERATIONS + SKIP; i++) {
+        if (i == SKIP)
+            t0 = MPI_Wtime();
+        if (rank == 0) {
+            for (w = 0; w < WINDOW; w++)
+                MPI_Isend(buf + w * size, size, MPI_CHAR, 1, tag, comm,
+                          &req[w]);
+            MPI_Waitall(WINDOW, req, MPI_STATUSES_IGNORE);
+            MPI_Recv(&ack, 1, MPI_CHAR, 1, tag, comm, MPI_STATUS_IGNORE);
+        } else {
+            for (w = 0; w < WINDOW; w++)
+                MPI_Irecv(buf + w * size, size, MPI_CHAR, 0, tag, comm,
+                          &req[w]);
+            MPI_Waitall(WINDOW, req, MPI_STATUSES_IGNORE);
+            MPI_Send(&ack, 1, MPI_CHAR, 0, tag, comm);
+        }
+    }
+    return ITERATIONS * WINDOW / (MPI_Wtime() - t0);
+}
+
+static double
+latency(MPI_Comm comm, int rank, int tag, char *buf, int size)
+{
+    double t0 = 0.0;
+    int i;
+
+    for (i = 0; i < ITERATIONS + SKIP; i++) {
+        if (i == SKIP)
+            t0 = MPI_Wtime();
+        if (rank == 0) {
+            MPI_Send(buf, size, MPI_CHAR, 1, tag, comm);
+            MPI_Recv(buf, size, MPI_CHAR, 1, tag, comm, MPI_STATUS_IGNORE);
+        } else {
+            MPI_Recv(buf, size, MPI_CHAR, 0, tag, comm, MPI_STATUS_IGNORE);
+            MPI_Send(buf, size, MPI_CHAR, 0, tag, comm);
+        }
+    }
+    return (MPI_Wtime() - t0) / (2.0 * ITERATIONS);
+}
+
+int
+main(int argc, char *argv[])
+{
+    int provided, rank, nranks, size, per_thread, a, t, max_threads = 1;
+    MPI_Comm *comms;
+
+    MPI_Init_thread(&argc, &argv, MPI_THREAD_MULTIPLE, &provided);
+    MPI_Comm_rank(MPI_COMM_WORLD, &rank);
+    MPI_Comm_size(MPI_COMM_WORLD, &nranks);
+
+    if (argc < 4) {
+        if (rank == 0)
+            fprintf(stderr, "usage: %s <shared|per_thread> <message size> "
+                    "<threads>...\n", argv[0]);
+        MPI_Abort(MPI_COMM_WORLD, 1);
+    }
+    if (nranks != 2) {
+        if (rank == 0)
+            fprintf(stderr, "exactly 2 ranks are required\n");
+        MPI_Abort(MPI_COMM_WORLD, 1);
+    }
+    if (provided != MPI_THREAD_MULTIPLE) {
+        if (rank == 0)
+            printf("MPI_THREAD_MULTIPLE not provided (provided=%d)\n",
+                   provided);
+        MPI_Finalize();
+        return 0;
+    }
+    if (rank == 0)
+        printf("MPI_THREAD_MULTIPLE provided\n");
+
+    per_thread = (strcmp(argv[1], "per_thread") == 0);
+    size = atoi(argv[2]);
+    for (a = 3; a < argc; a++)
+        if (atoi(argv[a]) > max_threads)
+            max_threads = atoi(argv[a]);
+
+    /* communicators are duplicated in the same order on both ranks */
+    comms = malloc(max_threads * sizeof(MPI_Comm));
+    for (t = 0; t < max_threads; t++) {
+        if (per_thread)
+            MPI_Comm_dup(MPI_COMM_WORLD, &comms[t]);
+        else
+            comms[t] = MPI_COMM_WORLD;
+    }
+
+    for (a = 3; a < argc; a++) {
+        int nthreads = atoi(argv[a]);
+        double rate_sum = 0.0, lat_sum = 0.0;
+
+        MPI_Barrier(MPI_COMM_WORLD);
+        #pragma omp parallel num_threads(nthreads) reduction(+:rate_sum)
+        {
+            int tid = omp_get_thread_num();
+            char *buf = calloc(WINDOW, size > 0 ? size : 1);
+
+            rate_sum += message_rate(comms[tid], rank, tid, buf, size);
+            free(buf);
+        }
+
+        MPI_Barrier(MPI_COMM_WORLD);
+        #pragma omp parallel num_threads(nthreads) reduction(+:lat_sum)
+        {
+            int tid = omp_get_thread_num();
+            char *buf = calloc(1, size > 0 ? size : 1);
+
+            lat_sum += latency(comms[tid], rank, tid, buf, size);
+            free(buf);
+        }
+
+        if (rank == 0) {
+            printf("threads=%d msg_rate=%.1f msg/s latency=%.3f us\n",
+                   nthreads, rate_sum, lat_sum / nthreads * 1.0e6);
+            fflush(stdout);
+        }
+    }
+
+    if (per_thread)
+        for (t = 0; t < max_threads; t++)
+            MPI_Comm_free(&comms[t]);
+    free(comms);
+    MPI_Finalize();
+    return 0;
+}
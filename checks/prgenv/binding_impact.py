@@ -0,0 +1,107 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
+
+
+@rfm.simple_test
+class ThreadBindingImpactTest(rfm.RegressionTest, GeneratedReferencesMixin,
+                              TopologyJobSizeMixin):
+    '''Throughput of OpenMP threads with correct and broken binding.
+
+    The threads of one task fill a socket and run a compute bound and a
+    memory bound kernel. With binding 'cores' every thread is bound to its
+    own core, 'none' leaves the placement to the OS scheduler and
+    'single_core' stacks all threads on one core, as happens e.g. with
+    srun --cpu-bind=cores and a single CPU per task. See also the affinity
+    check of HelloWorldTestOpenMP.
+    '''
+
+    binding = parameter(['cores', 'none', 'single_core'])
+    array_size = variable(int, value=10000000)
+    repetitions = variable(int, value=10)
+
+    valid_systems = ['ubelix:bdw', 'ubelix:epyc2']
+    valid_prog_environs = ['foss', 'intel']
+    build_system = 'SingleSource'
+    sourcesdir = 'src/binding'
+    sourcepath = 'binding_kernel.c'
+    task_domain = 'socket'
+    domains_per_node = 1
+    exclusive_access = True
+    use_multithreading = False
+    maintainers = ['Mandes']
+    tags = {'benchmark', 'prgenv'}
+
+    @run_after('init')
+    def set_description(self):
+        self.descr = f'OpenMP throughput with binding {self.binding!r}'
+
+    @run_after('init')
+    def set_perf_patterns(self):
+        self.perf_patterns = {
+            'compute': sn.extractsingle(r'^compute: (\S+)', self.stdout, 1,
+                                        float),
+            'triad': sn.extractsingle(r'^triad: (\S+)', self.stdout, 1,
+                                      float)
+        }
+        self.reference = {
+            '*': {
+                'compute': (0, None, None, 'Gflop/s'),
+                'triad': (0, None, None, 'MB/s')
+            }
+        }
+
+    @run_before('compile')
+    def set_cflags(self):
+        self.build_system.cflags = {
+            'foss': ['-O3', '-fopenmp'],
+            'intel': ['-O3', '-qopenmp'],
+        }.get(self.current_environ.name, ['-O3'])
+
+    @run_before('run')
+    def set_binding(self):
+        self.executable_opts = [str(self.array_size), str(self.repetitions)]
+        if self.binding == 'cores':
+            self.variables.update({
+                'OMP_PLACES': 'cores',
+                'OMP_PROC_BIND': 'close'
+            })
+        elif self.binding == 'none':
+            self.variables['OMP_PROC_BIND'] = 'false'
+        else:
+            self.variables.update({
+                'OMP_PLACES': 'cores(1)',
+                'OMP_PROC_BIND': 'true'
+            })
+
+    @sanity_function
+    def assert_binding(self):
+        distinct_cpus = sn.extractsingle(r'^distinct_cpus=(\d+)',
+                                         self.stdout, 1, int)
+        if self.binding == 'cores':
+            binding_check = sn.assert_eq(distinct_cpus,
+                                         self.num_cpus_per_task)
+        elif self.binding == 'single_core':
+            binding_check = sn.assert_eq(distinct_cpus, 1)
+        else:
+            binding_check = sn.assert_ge(distinct_cpus, 1)
+
+        return sn.all([
+            sn.assert_eq(sn.count(sn.findall(r'^thread=\d+ cpu=',
+                                             self.stdout)),
+                         self.num_cpus_per_task),
+            binding_check,
+            sn.assert_found(r'^checksum=', self.stdout)
+        ])
@@ -0,0 +1,267 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+
+
+C_UNIT = '''#include <math.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include "common.h"
+
+struct record_{i}_{f} {{
+    int id;
+    double values[16];
+    char name[32];
+}};
+
+static int compare_{i}_{f}(const void *a, const void *b)
+{{
+    const struct record_{i}_{f} *ra = a, *rb = b;
+    return (ra->values[0] > rb->values[0]) - (ra->values[0] < rb->values[0]);
+}}
+
+double func_{i}_{f}(int n)
+{{
+    struct record_{i}_{f} *recs = malloc(n * sizeof(*recs));
+    double sum = 0.0;
+    int k, l;
+
+    for (k = 0; k < n; k++) {{
+        recs[k].id = k;
+        snprintf(recs[k].name, sizeof(recs[k].name), "rec%d", k);
+        for (l = 0; l < 16; l++)
+            recs[k].values[l] = sin(k * {f} + l) * cos(l * {i});
+    }}
+    qsort(recs, n, sizeof(*recs), compare_{i}_{f});
+    for (k = 0; k < n; k++)
+        for (l = 0; l < 16; l++)
+            sum += recs[k].values[l] * strlen(recs[k].name);
+    free(recs);
+    return sum;
+}}
+'''
+
+CPP_UNIT = '''#include <algorithm>
+#include <cmath>
+#include <map>
+#include <numeric>
+#include <string>
+#include <vector>
+#include "common.hpp"
+
+namespace unit_{i} {{
+
+template <typename T>
+struct Record_{f} {{
+    int id;
+    std::vector<T> values;
+    std::string name;
+}};
+
+template <typename T>
+T reduce_{f}(int n)
+{{
+    std::vector<Record_{f}<T>> recs(n);
+    std::map<std::string, T> index;
+    for (int k = 0; k < n; ++k) {{
+        recs[k].id = k;
+        recs[k].name = "rec" + std::to_string(k);
+        recs[k].values.resize(16);
+        for (int l = 0; l < 16; ++l)
+            recs[k].values[l] = std::sin(T(k * {f} + l)) * std::cos(T(l * {i}));
+    }}
+    std::sort(recs.begin(), recs.end(),
+              [](const Record_{f}<T> &a, const Record_{f}<T> &b) {{
+                  return a.values[0] < b.values[0];
+              }});
+    for (const auto &r : recs)
+        index[r.name] = std::accumulate(r.values.begin(), r.values.end(), T(0));
+    T sum = 0;
+    for (const auto &kv : index)
+        sum += kv.second * kv.first.size();
+    return sum;
+}}
+
+}} // namespace unit_{i}
+
+double func_{i}_{f}(int n)
+{{
+    return unit_{i}::reduce_{f}<double>(n) + unit_{i}::reduce_{f}<float>(n);
+}}
+'''
+
+F90_UNIT = '''
+  function func_{i}_{f}(n) result(total)
+    integer, intent(in) :: n
+    real(dp) :: total
+    type(record_t), allocatable :: recs(:)
+    integer :: k, l
+
+    allocate(recs(n))
+    do k = 1, n
+      recs(k)%id = k
+      write(recs(k)%name, '(a,i0)') 'rec', k
+      do l = 1, 16
+        recs(k)%values(l) = sin(real(k * {f} + l, dp)) * cos(real(l * {i}, dp))
+      end do
+    end do
+    total = 0.0_dp
+    do k = 1, n
+      total = total + sum(recs(k)%values) * len_trim(recs(k)%name)
+    end do
+    deallocate(recs)
+  end function func_{i}_{f}
+'''
+
+
+def generate_sources(path, lang, num_files, num_functions):
+    '''Write a code base of num_files units with num_functions each.'''
+    funcs = [(i, f) for i in range(num_files) for f in range(num_functions)]
+    if lang == 'c':
+        with open(os.path.join(path, 'common.h'), 'w') as fp:
+            fp.write('#ifndef COMMON_H\n#define COMMON_H\n')
+            fp.writelines(f'double func_{i}_{f}(int n);\n' for i, f in funcs)
+            fp.write('#endif\n')
+        for i in range(num_files):
+            with open(os.path.join(path, f'unit_{i:04d}.c'), 'w') as fp:
+                fp.writelines(C_UNIT.format(i=i, f=f)
+                              for f in range(num_functions))
+        with open(os.path.join(path, 'main.c'), 'w') as fp:
+            fp.write('#include <stdio.h>\n#include "common.h"\n\n'
+                     'int main(void)\n{\n    double sum = 0.0;\n')
+            fp.writelines(f'    sum += func_{i}_{f}(4);\n' for i, f in funcs)
+            fp.write('    printf("checksum %g\\n", sum);\n    return 0;\n}\n')
+    elif lang == 'cpp':
+        with open(os.path.join(path, 'common.hpp'), 'w') as fp:
+            fp.write('#pragma once\n')
+            fp.writelines(f'double func_{i}_{f}(int n);\n' for i, f in funcs)
+        for i in range(num_files):
+            with open(os.path.join(path, f'unit_{i:04d}.cpp'), 'w') as fp:
+                fp.writelines(CPP_UNIT.format(i=i, f=f)
+                              for f in range(num_functions))
+        with open(os.path.join(path, 'main.cpp'), 'w') as fp:
+            fp.write('#include <iostream>\n#include "common.hpp"\n\n'
+                     'int main()\n{\n    double sum = 0.0;\n')
+            fp.writelines(f'    sum += func_{i}_{f}(4);\n' for i, f in funcs)
+            fp.write('    std::cout << "checksum " << sum << std::endl;\n'
+                     '    return 0;\n}\n')
+    else:
+        with open(os.path.join(path, 'common.f90'), 'w') as fp:
+            fp.write('module common\n'
+                     '  implicit none\n'
+                     '  integer, parameter :: dp = kind(1.0d0)\n'
+                     '  type record_t\n'
+                     '    integer :: id\n'
+                     '    real(dp) :: values(16)\n'
+                     '    character(len=32) :: name\n'
+                     '  end type record_t\n'
+                     'end module common\n')
+        for i in range(num_files):
+            with open(os.path.join(path, f'unit_{i:04d}.f90'), 'w') as fp:
+                fp.write(f'module unit_{i:04d}\n  use common\n'
+                         '  implicit none\ncontains\n')
+                fp.writelines(F90_UNIT.format(i=i, f=f)
+                              for f in range(num_functions))
+                fp.write(f'end module unit_{i:04d}\n')
+        with open(os.path.join(path, 'main.f90'), 'w') as fp:
+            fp.write('program main\n  use common\n')
+            fp.writelines(f'  use unit_{i:04d}\n' for i in range(num_files))
+            fp.write('  implicit none\n  real(dp) :: total = 0.0_dp\n')
+            fp.writelines(f'  total = total + func_{i}_{f}(4)\n'
+                          for i, f in funcs)
+            fp.write("  print '(a,es12.5)', 'checksum ', total\n"
+                     'end program main\n')
+
+
+@rfm.simple_test
+class CompileThroughputTest(rfm.RunOnlyRegressionTest,
+                            GeneratedReferencesMixin):
+    '''Build time of a generated code base.
+
+    Unlike the compilation time of HelloWorldBaseTest, which is dominated
+    by the compiler start-up from the shared file system, a code base of
+    realistic size (num_files units, num_functions functions each) is
+    built with make at several optimisation levels and make -j values.
+    '''
+
+    lang = parameter(['c', 'cpp', 'f90'])
+    opt_level = parameter(['-O0', '-O2', '-O3'])
+    make_jobs = parameter([1, 8, 32])
+    num_files = variable(int, value=100)
+    num_functions = variable(int, value=5)
+    # build in a copy in this directory, e.g. '/tmp', instead of the stage
+    # directory
+    build_dir = variable(str, value='')
+
+    valid_systems = ['ubelix:submit01', 'ubelix:submit03', 'ubelix:bdw',
+                     'ubelix:epyc2']
+    valid_prog_environs = ['foss', 'intel']
+    sourcesdir = 'src/compile_bench'
+    executable = './compile_bench.sh'
+    num_tasks = 1
+    num_tasks_per_node = 1
+    time_limit = '1h'
+    maintainers = ['Mandes']
+    tags = {'benchmark', 'prgenv'}
+
+    @run_after('init')
+    def set_description(self):
+        lang_names = {
+            'c': 'C',
+            'cpp': 'C++',
+            'f90': 'Fortran 90'
+        }
+        self.descr = (f'{lang_names[self.lang]} compile throughput '
+                      f'{self.opt_level} make -j {self.make_jobs}')
+
+    @run_after('init')
+    def set_perf_patterns(self):
+        build_time = sn.extractsingle(r'^Built \d+ files .* \(ns\): (\d+)',
+                                      self.stdout, 1, float) * 1.0e-9
+        self.perf_patterns = {
+            'build_time': build_time,
+            'files_per_second': self.num_files / build_time
+        }
+        self.reference = {
+            '*': {
+                'build_time': (0, None, None, 's'),
+                'files_per_second': (0, None, None, 'files/s')
+            }
+        }
+
+    @run_after('setup')
+    def set_cpus(self):
+        num_cores = self.current_partition.processor.num_cores
+        self.num_cpus_per_task = min(self.make_jobs,
+                                     num_cores or self.make_jobs)
+
+    @run_before('run')
+    def generate_code_base(self):
+        generate_sources(self.stagedir, self.lang, self.num_files,
+                         self.num_functions)
+        self.variables.update({
+            'CC': self.current_environ.cc,
+            'CXX': self.current_environ.cxx,
+            'FC': self.current_environ.ftn,
+        })
+        self.executable_opts = [self.lang, f'"{self.opt_level}"',
+                                str(self.make_jobs), self.build_dir]
+
+    @sanity_function
+    def assert_build(self):
+        return sn.all([
+            sn.assert_found(r'^checksum', self.stdout),
+            sn.assert_found(rf'^Built {self.num_files} files', self.stdout)
+        ])
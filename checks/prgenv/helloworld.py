@@ -1,11 +1,31 @@
 from datetime import datetime
 import os
+import sys
 import reframe as rfm
 import reframe.utility.sanity as sn
+from reframe.core.exceptions import SanityError
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../..')))
+from utils.parsing import OutputParser  # noqa: E402
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.topology import TopologyJobSizeMixin  # noqa: E402
 
-class HelloWorldBaseTest(rfm.RegressionTest):
+
+def parse_cpuset(cpuset):
+    '''The CPUs of a list like '0-3,8' as a set.'''
+    cpus = set()
+    for item in cpuset.split(','):
+        first, _, last = item.partition('-')
+        cpus.update(range(int(first), int(last or first) + 1))
+
+    return cpus
+
+
+class HelloWorldBaseTest(rfm.RegressionTest, GeneratedReferencesMixin):
     lang = parameter(['c', 'cpp', 'f90'])
+    # the C and C++ sources print the CPU and the cpuset of every thread
+    check_affinity = variable(bool, value=False)
     prgenv_flags = {}
     sourcepath = 'hello_world'
     build_system = 'SingleSource'
@@ -35,44 +55,62 @@ class HelloWorldBaseTest(rfm.RegressionTest):
         }
         self.descr = self.lang_names[self.lang] + ' Hello World'
 
+    @run_after('init')
+    def set_output_parser(self):
+        # the C and C++ OpenMP sources also print the CPU and the cpuset of
+        # the threads
+        self.output = OutputParser(self.stdout, {
+            'hello': r'Hello World from thread \s*(?P<tid>\d+) out '
+                     r'of \s*(?P<num_threads>\d+) from process '
+                     r'\s*(?P<rank>\d+) out of \s*(?P<num_ranks>\d+)'
+                     r'(?: on host (?P<host>\S+) cpu (?P<cpu>\d+) '
+                     r'cpuset (?P<cpuset>\S+))?'
+        })
+
     @sanity_function
     def assert_hello_world(self):
-        result = sn.findall(r'Hello World from thread \s*(\d+) out '
-                            r'of \s*(\d+) from process \s*(\d+) out of '
-                            r'\s*(\d+)', self.stdout)
-
-        num_tasks = sn.getattr(self, 'num_tasks')
-        num_cpus_per_task = sn.getattr(self, 'num_cpus_per_task')
-
-        def tid(match):
-            return int(match.group(1))
-
-        def num_threads(match):
-            return int(match.group(2))
-
-        def rank(match):
-            return int(match.group(3))
-
-        def num_ranks(match):
-            return int(match.group(4))
-
-        return sn.all(sn.chain(
-                [sn.assert_eq(sn.count(result), num_tasks*num_cpus_per_task)],
-                sn.map(lambda x: sn.assert_lt(tid(x), num_threads(x)), result),
-                sn.map(lambda x: sn.assert_lt(rank(x), num_ranks(x)), result),
-                sn.map(
-                    lambda x: sn.assert_lt(tid(x), num_cpus_per_task), result
-                ),
-                sn.map(
-                    lambda x: sn.assert_eq(num_threads(x), num_cpus_per_task),
-                    result
-                ),
-                sn.map(lambda x: sn.assert_lt(rank(x), num_tasks), result),
-                sn.map(
-                    lambda x: sn.assert_eq(num_ranks(x), num_tasks), result
-                ),
+        # all assertions in a single pass over the lines of the threads
+        num_tasks = self.num_tasks
+        num_cpus_per_task = self.num_cpus_per_task
+        lines = self.output.matches('hello')
+        sn.evaluate(sn.assert_eq(len(lines), num_tasks*num_cpus_per_task))
+        for match in lines:
+            tid, num_threads, rank, num_ranks = (
+                int(match.group(g))
+                for g in ['tid', 'num_threads', 'rank', 'num_ranks']
             )
-        )
+            if not (tid < num_threads == num_cpus_per_task and
+                    rank < num_ranks == num_tasks):
+                raise SanityError(f'unexpected thread or process: '
+                                  f'{match.group(0).strip()!r}')
+
+        if self.check_affinity and self.lang != 'f90':
+            self.assert_binding(lines)
+
+        return True
+
+    def assert_binding(self, lines):
+        '''Every thread runs in its own cpuset, disjoint from the cpusets
+        of all other threads on the node.'''
+        cpusets = {}
+        for match in lines:
+            thread, host = match.group('tid', 'host')
+            if host is None:
+                raise SanityError(f'no CPU of thread {thread}')
+
+            cpu = int(match.group('cpu'))
+            cpuset = parse_cpuset(match.group('cpuset'))
+            if cpu not in cpuset:
+                raise SanityError(f'thread {thread} runs on cpu {cpu} '
+                                  f'outside its cpuset')
+
+            for other in cpusets.get(host, []):
+                if cpuset & other:
+                    raise SanityError(f'thread {thread} on {host} shares CPUs '
+                                      f'{sorted(cpuset & other)} with another '
+                                      f'thread')
+
+            cpusets.setdefault(host, []).append(cpuset)
 
     @run_before('compile')
     def setflags(self):
@@ -110,6 +148,7 @@ class HelloWorldTestOpenMP(HelloWorldBaseTest):
     num_tasks = 1
     num_tasks_per_node = 1
     num_cpus_per_task = 4
+    check_affinity = True
 
     @run_after('init')
     def set_prgenv_compilation_flags_map(self):
@@ -131,6 +170,9 @@ class HelloWorldTestOpenMP(HelloWorldBaseTest):
         # On SLURM there is no need to set OMP_NUM_THREADS if one defines
         # num_cpus_per_task, but adding for completeness and portability
         self.variables['OMP_NUM_THREADS'] = str(self.num_cpus_per_task)
+        # one thread per core, checked by assert_binding
+        self.variables['OMP_PLACES'] = 'cores'
+        self.variables['OMP_PROC_BIND'] = 'close'
 
 @rfm.simple_test
 class HelloWorldTestMPI(HelloWorldBaseTest):
@@ -151,8 +193,11 @@ class HelloWorldTestMPI(HelloWorldBaseTest):
         self.sourcepath += '_mpi.' + self.lang
 
 @rfm.simple_test
-class HelloWorldTestMPIOpenMP(HelloWorldBaseTest):
+class HelloWorldTestMPIOpenMP(HelloWorldBaseTest, TopologyJobSizeMixin):
     sourcesdir = 'src/mpi_openmp'
+    # one rank per NUMA domain, its threads fill the domain
+    task_domain = 'numa'
+    check_affinity = True
 
     @run_after('init')
     def set_prgenv_compilation_flags_map(self):
@@ -169,25 +214,11 @@ class HelloWorldTestMPIOpenMP(HelloWorldBaseTest):
     def update_sourcepath(self):
         self.sourcepath += '_mpi_openmp.' + self.lang
 
-    @run_before('run')
-    def set_job_size(self):
-        if self.current_partition.name == 'gpu':
-            self.num_tasks = 2
-            self.num_tasks_per_node = 1
-            self.num_cpus_per_task = 1
-
-        elif self.current_partition.name == 'epyc2':
-            self.num_tasks = 3
-            self.num_tasks_per_node = 3
-            self.num_cpus_per_task = 2
-
-        elif self.current_partition.name == 'bdw':
-            self.num_tasks = 5
-            self.num_tasks_per_node = 5
-            self.num_cpus_per_task = 4
-
     @run_before('run')
     def set_omp_env_variable(self):
         # On SLURM there is no need to set OMP_NUM_THREADS if one defines
         # num_cpus_per_task, but adding for completeness and portability
         self.variables['OMP_NUM_THREADS'] = str(self.num_cpus_per_task)
+        # one thread per core, checked by assert_binding
+        self.variables['OMP_PLACES'] = 'cores'
+        self.variables['OMP_PROC_BIND'] = 'close'
@@ -0,0 +1,107 @@
+/*
+ * Throughput of a compute and a memory bound OpenMP kernel under the
+ * thread binding of the environment (OMP_PLACES, OMP_PROC_BIND, srun).
+ *
+ * Usage: binding_kernel [array elements per thread] [repetitions]
+ *
+ * Output:
+ *
+ *   thread=0 cpu=3
+ *   ...
+ *   distinct_cpus=16
+ *   compute: 123.456 Gflop/s
+ *   triad: 45678.9 MB/s
+ */
+
+#define _GNU_SOURCE
+#include <omp.h>
+#include <sched.h>
+#include <stdio.h>
+#include <stdlib.h>
+
+#define COMPUTE_SIZE 512
+#define COMPUTE_ITERATIONS 200000
+
+static double compute(void)
+{
+    double x[COMPUTE_SIZE];
+    double flops = 0.0;
+    int i, it;
+
+    for (i = 0; i < COMPUTE_SIZE; i++)
+        x[i] = 1.0 / (i + 1);
+
+    for (it = 0; it < COMPUTE_ITERATIONS; it++) {
+        #pragma omp simd
+        for (i = 0; i < COMPUTE_SIZE; i++)
+            x[i] = x[i] * 0.999999 + 1.0e-6;
+    }
+    flops = 2.0 * COMPUTE_SIZE * COMPUTE_ITERATIONS;
+
+    /* keep the result alive */
+    if (x[0] < 0.0)
+        printf("unreachable\n");
+
+    return flops;
+}
+
+int main(int argc, char *argv[])
+{
+    long n = argc > 1 ? atol(argv[1]) : 10000000;
+    int repetitions = argc > 2 ? atoi(argv[2]) : 10;
+    int nthreads = omp_get_max_threads();
+    int *cpus = calloc(nthreads, sizeof(int));
+    double *a, *b, *c;
+    double flops = 0.0, t0, t_compute, t_triad;
+    long total = n * nthreads, i;
+    int r, t, distinct = 0;
+
+    a = malloc(total * sizeof(double));
+    b = malloc(total * sizeof(double));
+    c = malloc(total * sizeof(double));
+
+    /* first touch by the threads which use the data */
+    #pragma omp parallel for schedule(static)
+    for (i = 0; i < total; i++) {
+        a[i] = 0.0;
+        b[i] = 1.0;
+        c[i] = 2.0;
+    }
+
+    t0 = omp_get_wtime();
+    #pragma omp parallel reduction(+:flops)
+    {
+        cpus[omp_get_thread_num()] = sched_getcpu();
+        flops += compute();
+    }
+    t_compute = omp_get_wtime() - t0;
+
+    t0 = omp_get_wtime();
+    for (r = 0; r < repetitions; r++) {
+        #pragma omp parallel for schedule(static)
+        for (i = 0; i < total; i++)
+            a[i] = b[i] + 3.0 * c[i];
+    }
+    t_triad = omp_get_wtime() - t0;
+
+    for (t = 0; t < nthreads; t++) {
+        int seen = 0, u;
+        printf("thread=%d cpu=%d\n", t, cpus[t]);
+        for (u = 0; u < t; u++)
+            seen |= cpus[u] == cpus[t];
+
+        distinct += !seen;
+    }
+
+    printf("distinct_cpus=%d\n", distinct);
+    printf("compute: %.3f Gflop/s\n", flops / t_compute * 1.0e-9);
+    printf("triad: %.1f MB/s\n",
+           3.0 * sizeof(double) * total * repetitions / t_triad * 1.0e-6);
+    printf("checksum=%g\n", a[total - 1]);
+
+    free(a);
+    free(b);
+    free(c);
+    free(cpus);
+    return 0;
+}
@@ -0,0 +1,41 @@
+#!/bin/bash
+#
+# Build the generated code base and report the build time.
+#
+# Usage: compile_bench.sh <lang> <optflags> <make jobs> [build dir]
+#
+# Without a build directory the code base is built where it was generated
+# (the stage directory on the shared file system), otherwise it is copied
+# there first, e.g. to compare with a node-local /tmp.
+
+lang=$1
+optflags=$2
+jobs=$3
+build_dir=$4
+
+if [ -n "$build_dir" ]; then
+    build_dir=$(mktemp -d "${build_dir}/compile_bench.XXXXXX") || exit 1
+    cp Makefile main.* common.* unit_* "$build_dir"
+    cd "$build_dir" || exit 1
+fi
+
+num_files=$(ls unit_*."$lang" | wc -l)
+echo "Host: $(hostname) build dir: $(pwd)"
+case "$lang" in
+    c) compiler=${CC:-cc} ;;
+    cpp) compiler=${CXX:-c++} ;;
+    *) compiler=${FC:-gfortran} ;;
+esac
+echo "Compiler: $("$compiler" --version 2>&1 | head -1)"
+
+make -s clean SRC_LANG="$lang"
+_build_time="$(date +%s%N)"
+make -s -j "$jobs" SRC_LANG="$lang" OPTFLAGS="$optflags" || exit 1
+_build_time="$(($(date +%s%N)-_build_time))"
+
+./compile_bench_"$lang" || exit 1
+echo "Built $num_files files with make -j $jobs in (ns): $_build_time"
+
+if [ -n "$4" ]; then
+    cd / && rm -rf "$build_dir"
+fi
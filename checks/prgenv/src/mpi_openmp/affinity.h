@@ -0,0 +1 @@
+../openmp/affinity.h
\ No newline at end of file
@@ -1,6 +1,8 @@
+#define _GNU_SOURCE
 #include <stdio.h>
 #include <omp.h>
 #include "mpi.h"
+#include "affinity.h"
 
 int main(int argc, char *argv[])
 {
@@ -8,18 +10,23 @@ int main(int argc, char *argv[])
   // int namelen;
   // char processor_name[MPI_MAX_PROCESSOR_NAME];
   int tid = 0;
+  char hostname[256];
 
   MPI_Init(&argc, &argv);
   MPI_Comm_size(MPI_COMM_WORLD, &size);
   MPI_Comm_rank(MPI_COMM_WORLD, &rank);
   // MPI_Get_processor_name(processor_name, &namelen);
+  get_hostname(hostname, sizeof(hostname));
 
   #pragma omp parallel default(shared) private(tid)
   {
     int nthreads = omp_get_num_threads();
+    char cpuset[1024];
     tid = omp_get_thread_num();
-    printf("Hello World from thread %d out of %d from process %d out of %d\n",
-           tid, nthreads, rank, size);
+    get_cpuset(cpuset, sizeof(cpuset));
+    printf("Hello World from thread %d out of %d from process %d out of %d "
+           "on host %s cpu %d cpuset %s\n",
+           tid, nthreads, rank, size, hostname, sched_getcpu(), cpuset);
   }
 
   MPI_Finalize();
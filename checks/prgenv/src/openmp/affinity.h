@@ -0,0 +1,55 @@
+/*
+ * CPU affinity of the calling thread for the hello world checks.
+ *
+ * The sources define _GNU_SOURCE before including any header.
+ */
+
+#ifndef AFFINITY_H
+#define AFFINITY_H
+
+#include <sched.h>
+#include <stdio.h>
+#include <string.h>
+#include <unistd.h>
+
+/* The CPUs the calling thread may run on as a list, e.g. "0-3,8" */
+static void get_cpuset(char *buf, size_t len)
+{
+    cpu_set_t mask;
+    size_t pos = 0;
+    int cpu, first = -1;
+
+    buf[0] = '\0';
+    if (sched_getaffinity(0, sizeof(mask), &mask) != 0) {
+        snprintf(buf, len, "unknown");
+        return;
+    }
+
+    for (cpu = 0; cpu <= CPU_SETSIZE; cpu++) {
+        int set = cpu < CPU_SETSIZE && CPU_ISSET(cpu, &mask);
+        if (set && first < 0) {
+            first = cpu;
+        } else if (!set && first >= 0) {
+            if (first == cpu - 1)
+                pos += snprintf(buf + pos, len - pos, "%s%d",
+                                pos ? "," : "", first);
+            else
+                pos += snprintf(buf + pos, len - pos, "%s%d-%d",
+                                pos ? "," : "", first, cpu - 1);
+
+            first = -1;
+            if (pos >= len)
+                return;
+        }
+    }
+}
+
+static void get_hostname(char *buf, size_t len)
+{
+    if (gethostname(buf, len) != 0)
+        snprintf(buf, len, "unknown");
+
+    buf[len - 1] = '\0';
+}
+
+#endif
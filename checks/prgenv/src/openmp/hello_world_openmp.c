@@ -1,16 +1,25 @@
+#define _GNU_SOURCE
 #include <omp.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include "affinity.h"
  
 int main (int argc, char *argv[]) {
   int tid, nthreads;
+  char hostname[256];
+
+  get_hostname(hostname, sizeof(hostname));
 
   #pragma omp parallel private(tid, nthreads)
   {
+    char cpuset[1024];
+
     tid = omp_get_thread_num();
     nthreads = omp_get_num_threads(); 
-	printf("Hello World from thread %d out of %d from process %d out of %d\n",
-		tid, nthreads, 0, 1);
+    get_cpuset(cpuset, sizeof(cpuset));
+	printf("Hello World from thread %d out of %d from process %d out of %d "
+	       "on host %s cpu %d cpuset %s\n",
+		tid, nthreads, 0, 1, hostname, sched_getcpu(), cpuset);
   }
   return EXIT_SUCCESS;
 }
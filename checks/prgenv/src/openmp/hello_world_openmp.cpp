@@ -1,17 +1,25 @@
 #include <stdio.h>   
 #include <omp.h>
+#include "affinity.h"
  
 int main(int argc, char *argv[])
 {
   int tid, nthreads;
+  char hostname[256];
+
+  get_hostname(hostname, sizeof(hostname));
   #pragma omp parallel private(tid, nthreads)
   {
+    char cpuset[1024];
+
     tid = omp_get_thread_num();
     nthreads = omp_get_num_threads();
+    get_cpuset(cpuset, sizeof(cpuset));
     #pragma omp critical
     {
-      printf("Hello World from thread %d out of %d from process %d out of %d\n",
-       tid, nthreads, 0, 1);
+      printf("Hello World from thread %d out of %d from process %d out of %d "
+             "on host %s cpu %d cpuset %s\n",
+       tid, nthreads, 0, 1, hostname, sched_getcpu(), cpuset);
     }
   }
  
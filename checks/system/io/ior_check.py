@@ -6,12 +6,17 @@
 import getpass
 import os
 import re
+import sys
 
 import reframe as rfm
 import reframe.utility.sanity as sn
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
 
-class IorCheck(rfm.RegressionTest):
+
+class IorCheck(rfm.RegressionTest, GeneratedReferencesMixin):
     base_dir = parameter(['/storage/scratch',
                         '/storage/workspace',
                         '/storage/homefs'])
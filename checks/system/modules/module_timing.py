@@ -0,0 +1,98 @@
+# Copyright 2016-2021 Swiss National Supercomputing Centre (CSCS/ETH Zurich)
+# ReFrame Project Developers. See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import re
+import sys
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '../../..')))
+from utils.references import GeneratedReferencesMixin  # noqa: E402
+from utils.stats import percentile  # noqa: E402
+
+
+@rfm.simple_test
+class ModuleTimingTest(rfm.RunOnlyRegressionTest, GeneratedReferencesMixin):
+    '''Latency of Lmod module load, unload and spider.
+
+    The operations are timed for representative modules from a purged
+    environment, with the spider cache (warm) and with LMOD_IGNORE_CACHE
+    (cold), by a single process and by many processes per node at once.
+    The 50th, 90th and 99th percentile and the maximum are reported per
+    operation and module.
+    '''
+
+    cache = parameter(['warm', 'cold'])
+    concurrency = parameter([1, 32])
+    module_names = variable(list, value=['foss', 'intel', 'SciPy-bundle',
+                                         'HDF5'])
+    repetitions = variable(int, value=5)
+    num_job_nodes = variable(int, value=1)
+
+    valid_systems = ['ubelix:submit01', 'ubelix:submit03', 'ubelix:bdw',
+                     'ubelix:epyc2']
+    valid_prog_environs = ['foss']
+    sourcesdir = 'src'
+    executable = './module_timing.sh'
+    time_limit = '30m'
+    maintainers = ['Mandes']
+    tags = {'ops', 'modules'}
+
+    @run_after('init')
+    def set_description(self):
+        self.descr = (f'Lmod module timing ({self.cache} cache, '
+                      f'{self.concurrency} processes per node)')
+
+    @run_after('setup')
+    def set_job_size(self):
+        # one task per node, it starts the concurrent processes itself
+        self.num_tasks = self.num_job_nodes
+        self.num_tasks_per_node = 1
+        self.num_cpus_per_task = self.concurrency
+        if self.cache == 'cold':
+            self.variables['LMOD_IGNORE_CACHE'] = '1'
+
+    @run_before('run')
+    def set_executable_opts(self):
+        self.executable_opts = [str(self.repetitions), str(self.concurrency)]
+        self.executable_opts += self.module_names
+
+    @sanity_function
+    def assert_timing(self):
+        num_samples = (self.num_job_nodes * self.concurrency *
+                       self.repetitions * len(self.module_names))
+        return sn.all([
+            sn.assert_eq(sn.count(sn.findall(r'^Module timing done',
+                                             self.stdout)),
+                         self.num_job_nodes),
+            sn.assert_eq(sn.count(sn.findall(r'^op=load ', self.stdout)),
+                         num_samples),
+            # a failing operation is timed all the same, so check its status
+            sn.assert_eq(sn.count(sn.findall(r'^op=.* status=0$',
+                                             self.stdout)),
+                         3 * num_samples)
+        ])
+
+    @run_after('setup')
+    def set_perf_patterns(self):
+        self.perf_patterns = {}
+        for name in self.module_names:
+            for op in ['load', 'unload', 'spider']:
+                samples = sn.extractall(
+                    rf'^op={op} module={re.escape(name)} '
+                    rf'time_ms=(?P<time>\S+) ', self.stdout, 'time', float)
+                for q in [50, 90, 99]:
+                    self.perf_patterns[f'{op}_{name}_p{q}'] = percentile(
+                        samples, q)
+
+                self.perf_patterns[f'{op}_{name}_max'] = sn.max(samples)
+
+        self.reference = {
+            '*': {perf_var: (0, None, None, 'ms')
+                  for perf_var in self.perf_patterns}
+        }
@@ -0,0 +1,67 @@
+#!/bin/bash
+#
+# Time Lmod module operations.
+#
+# Usage: module_timing.sh <repetitions> <concurrency> <module>...
+#
+# <concurrency> processes are started at once, each of them times
+# <repetitions> rounds of 'module load', 'module unload' and
+# 'module spider' of every module from a purged environment. Every
+# operation prints one line with its exit status:
+#
+#   op=load module=foss time_ms=123.456 status=0
+#
+# Set LMOD_IGNORE_CACHE=1 to time the operations without the spider cache.
+
+reps=$1
+concurrency=$2
+shift 2
+modules="$@"
+
+if ! type module > /dev/null 2>&1; then
+    source "${LMOD_PKG:-/usr/share/lmod/lmod}/init/bash"
+fi
+
+now_ns() {
+    date +%s%N
+}
+
+time_op() {
+    local op=$1 mod=$2 t0 t1 status
+    t0=$(now_ns)
+    case $op in
+        load) module load "$mod" ;;
+        unload) module unload "$mod" ;;
+        spider) module -t spider "$mod" > /dev/null 2>&1 ;;
+    esac
+    status=$?
+    t1=$(now_ns)
+    awk -v op="$op" -v mod="$mod" -v dt=$((t1 - t0)) -v status=$status \
+        'BEGIN { printf "op=%s module=%s time_ms=%.3f status=%d\n",
+                 op, mod, dt / 1e6, status }'
+}
+
+worker() {
+    local rep mod
+    for rep in $(seq "$reps"); do
+        for mod in $modules; do
+            module purge > /dev/null 2>&1
+            time_op load "$mod"
+            time_op unload "$mod"
+            time_op spider "$mod"
+        done
+    done
+}
+
+echo "Host: $(hostname) Lmod: ${LMOD_VERSION:-unknown}" \
+     "ignore cache: ${LMOD_IGNORE_CACHE:-0}"
+
+for i in $(seq "$concurrency"); do
+    # buffer the output of every worker to avoid interleaved lines
+    worker > "module_timing.$(hostname).$$.$i.out" 2>&1 &
+done
+wait
+
+cat module_timing.$(hostname).$$.*.out
+rm -f module_timing.$(hostname).$$.*.out
+echo "Module timing done: $concurrency processes"
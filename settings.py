@@ -8,6 +8,34 @@ if prefix == '' or prefix is None:
     prefix = os.getenv('HOME')
 reframe_workdir = '{}/ReFrame'.format(prefix)
 
+
+def cpu_mask(first, last):
+    '''Hex mask of the CPUs first..last as used in the processor topology.'''
+    return hex(((1 << (last - first + 1)) - 1) << first)
+
+
+# Pool mode, see tools/pool_job.sh: ReFrame runs inside a Slurm allocation
+# of the partition RFM_POOL_PARTITION and the checks of this partition are
+# launched as job steps of the allocation instead of submitting own jobs.
+pool_partition = os.getenv('RFM_POOL_PARTITION')
+
+
+def slurm_partition(name, max_jobs):
+    '''Scheduler, launcher and number of concurrent jobs of a partition.'''
+    if name == pool_partition:
+        return {
+            'scheduler': 'local',
+            # srunalloc passes the job size of the check to srun
+            'launcher': 'srunalloc',
+            'max_jobs': int(os.getenv('RFM_POOL_MAX_JOBS', max_jobs))
+        }
+
+    return {
+        'scheduler': 'slurm',
+        'launcher': 'srun',
+        'max_jobs': max_jobs
+    }
+
 site_configuration = {
     'systems': [
         {
@@ -82,7 +110,7 @@ site_configuration = {
                  },
                 {
                     'name': 'bdw',
-                    'scheduler': 'slurm',
+                    **slurm_partition('bdw', max_jobs=50),
                     'modules': [],
                     'access': ['--partition=bdw'],
                     'environs': [
@@ -91,11 +119,22 @@ site_configuration = {
                         'pgi'
                     ],
                     'descr': 'broadwell compute nodes',
-                    'launcher': 'srun'
+                    # 2x Xeon E5-2630 v4, used by utils.topology
+                    'processor': {
+                        'arch': 'broadwell',
+                        'num_cpus': 20,
+                        'num_cpus_per_core': 1,
+                        'num_cpus_per_socket': 10,
+                        'num_sockets': 2,
+                        'topology': {
+                            'numa_nodes': [cpu_mask(0, 9), cpu_mask(10, 19)],
+                            'sockets': [cpu_mask(0, 9), cpu_mask(10, 19)]
+                        }
+                    }
                 },
                 {
                     'name': 'epyc2',
-                    'scheduler': 'slurm',
+                    **slurm_partition('epyc2', max_jobs=20),
                     'modules': [],
                     'access': ['--partition=epyc2'],
                     'environs': [
@@ -104,11 +143,23 @@ site_configuration = {
                         'pgi'
                     ],
                     'descr': 'compute nodes',
-                    'launcher': 'srun'
+                    # 2x EPYC 7742, one NUMA domain per socket (NPS1)
+                    'processor': {
+                        'arch': 'zen2',
+                        'num_cpus': 128,
+                        'num_cpus_per_core': 1,
+                        'num_cpus_per_socket': 64,
+                        'num_sockets': 2,
+                        'topology': {
+                            'numa_nodes': [cpu_mask(0, 63),
+                                           cpu_mask(64, 127)],
+                            'sockets': [cpu_mask(0, 63), cpu_mask(64, 127)]
+                        }
+                    }
                 },
                 {
                     'name': 'gpu',
-                    'scheduler': 'slurm',
+                    **slurm_partition('gpu', max_jobs=8),
                     'modules': [],
                     'access': [
                         '--partition=gpu',
@@ -120,7 +171,11 @@ site_configuration = {
                         'pgi'
                     ],
                     'descr': 'gpu compute nodes',
-                    'launcher': 'srun'
+                    # the topology is auto-detected (see 'remote_detect'),
+                    # but a job with one GPU may only use 3 cores
+                    'extras': {
+                        'max_cpus_per_node': 3
+                    }
                 }
             ]
         }
@@ -193,6 +248,17 @@ site_configuration = {
                     'format': '%(asctime)s|reframe %(version)s|%(check_info)s|jobid=%(check_jobid)s|%(check_perf_var)s=%(check_perf_value)s|ref=%(check_perf_ref)s (l=%(check_perf_lower_thres)s, u=%(check_perf_upper_thres)s)|%(check_perf_unit)s',  # noqa: E501
                     'append': True,
                     'basedir': '{}/logs/'.format(reframe_workdir)
+                },
+                {
+                    # structured perflog, one JSON object per line, read by
+                    # tools/perflog_analysis.py
+                    'type': 'filelog',
+                    'prefix': '%(check_system)s/%(check_partition)s',
+                    'level': 'info',
+                    'format': '{"timestamp": "%(check_job_completion_time)s", "reframe": "%(version)s", "system": "%(check_system)s", "partition": "%(check_partition)s", "environ": "%(check_environ)s", "check": "%(check_name)s", "jobid": "%(check_jobid)s", "perf_var": "%(check_perf_var)s", "value": "%(check_perf_value)s", "ref": "%(check_perf_ref)s", "lower": "%(check_perf_lower_thres)s", "upper": "%(check_perf_upper_thres)s", "unit": "%(check_perf_unit)s"}',  # noqa: E501
+                    'datefmt': '%Y-%m-%dT%H:%M:%S%z',
+                    'append': True,
+                    'basedir': '{}/perflogs/'.format(reframe_workdir)
                 }
             ],
 #            'target_systems': [
@@ -205,7 +271,10 @@ site_configuration = {
             'check_search_path': [
                 'checks/'
             ],
-            'check_search_recursive': True
+            'check_search_recursive': True,
+            # detect the processor topology of partitions which do not
+            # declare it in their 'processor' entry
+            'remote_detect': True
         }
     ]
 }
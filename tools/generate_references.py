@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+#
+# Generate the performance references of the checks from the perflogs.
+#
+# For every system/partition/environment/check/performance variable the
+# most recent samples of the perflog history are reduced to a reference
+# tuple: the median is the reference value, the tolerance follows from the
+# observed spread (robust standard deviation times a factor), bounded by a
+# minimum and a maximum tolerance. The tolerance is applied on the "bad"
+# side only, as derived from the thresholds found in the perflog (see
+# perflog_analysis.py).
+#
+# The result is written to references/<system>.json, which is read by the
+# checks through utils.references.GeneratedReferencesMixin.
+#
+# Usage:
+#   generate_references.py [options] PERFLOG_DIR_OR_FILE...
+
+import argparse
+import collections
+import datetime
+import json
+import os
+import sys
+
+import perflog_analysis
+
+
+REFERENCES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'references'
+)
+
+
+def reference_tuple(values, sign, unit, factor, min_tol, max_tol):
+    median, sigma = perflog_analysis.robust_baseline(values)
+    median = float(f'{median:.6g}')
+    if median == 0.0:
+        return [median, None, None, unit]
+
+    tol = min(max(factor * sigma / abs(median), min_tol), max_tol)
+    tol = round(tol, 3)
+    if sign > 0:
+        # higher is better
+        return [median, -tol, None, unit]
+    elif sign < 0:
+        return [median, None, tol, unit]
+    else:
+        return [median, -tol, tol, unit]
+
+
+def generate(records, last, min_samples, factor, min_tol, max_tol):
+    '''Return {system: references} of the perflog records.'''
+    history = {}
+    for record in records:
+        key = perflog_analysis.series_key(record)
+        if key not in history:
+            history[key] = perflog_analysis.Series(key, last)
+
+        history[key].add(record)
+
+    systems = collections.defaultdict(dict)
+    for (system, partition, environ, check, perf_var), series in sorted(
+            history.items(), key=lambda item: tuple(map(str, item[0]))):
+        values = series.values()
+        if len(values) < min_samples:
+            continue
+
+        ref = reference_tuple(values, perflog_analysis.direction(series.last),
+                              series.last.get('unit'), factor, min_tol,
+                              max_tol)
+        refs = systems[system].setdefault(check, {})
+        refs = refs.setdefault(environ, {}).setdefault(partition, {})
+        refs[perf_var] = ref
+
+    return systems
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate reference values from ReFrame perflogs')
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help='perflog files or directories')
+    parser.add_argument('-o', '--output-dir', default=REFERENCES_DIR,
+                        help='directory of the <system>.json files '
+                             '(default: %(default)s)')
+    parser.add_argument('-s', '--system', action='append',
+                        help='only generate the references of this system')
+    parser.add_argument('-n', '--last', type=int, default=20,
+                        help='number of most recent samples used '
+                             '(default: %(default)s)')
+    parser.add_argument('-m', '--min-samples', type=int, default=5,
+                        help='skip variables with fewer samples '
+                             '(default: %(default)s)')
+    parser.add_argument('-k', '--factor', type=float, default=3.0,
+                        help='tolerance in robust standard deviations '
+                             '(default: %(default)s)')
+    parser.add_argument('--min-tolerance', type=float, default=0.05,
+                        help='minimum relative tolerance '
+                             '(default: %(default)s)')
+    parser.add_argument('--max-tolerance', type=float, default=0.5,
+                        help='maximum relative tolerance '
+                             '(default: %(default)s)')
+    args = parser.parse_args()
+
+    systems = generate(perflog_analysis.stream_records(args.paths),
+                       args.last, args.min_samples, args.factor,
+                       args.min_tolerance, args.max_tolerance)
+    os.makedirs(args.output_dir, exist_ok=True)
+    now = datetime.datetime.now().isoformat(timespec='seconds')
+    for system, refs in systems.items():
+        if args.system and system not in args.system:
+            continue
+
+        filename = os.path.join(args.output_dir, f'{system}.json')
+        with open(filename, 'w') as fp:
+            json.dump({'system': system, 'generated': now,
+                       'references': refs}, fp, indent=4, sort_keys=True)
+            fp.write('\n')
+
+        print(f'wrote {filename}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
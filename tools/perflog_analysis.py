@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+#
+# Detect performance regressions in the ReFrame perflog history.
+#
+# The perflogs are streamed file by file and line by line. For every
+# system/partition/environment/check/performance variable a rolling window
+# of the most recent samples is kept and compared against a robust baseline
+# (median and median absolute deviation of the preceding samples). Three
+# kinds of events are reported:
+#
+#   outlier  the latest sample is far outside the baseline
+#   step     the median of the most recent samples shifted against the
+#            baseline
+#   drift    a significant monotonic trend (Mann-Kendall test) over the
+#            whole window, which a static reference tuple does not catch
+#
+# Only changes in the "bad" direction are reported. It is derived from the
+# reference thresholds of the check: a missing lower threshold
+# (e.g. (20.73, None, 2.0, 'us')) means lower is better, a missing upper
+# threshold means higher is better, otherwise both directions are reported.
+#
+# Both the structured JSON lines perflog and the pipe separated text
+# perflog configured in settings.py are understood.
+#
+# Usage:
+#   perflog_analysis.py [options] PERFLOG_DIR_OR_FILE...
+#
+# The exit status is 1 if any event was found, so the script can be used
+# from cron or CI.
+
+import argparse
+import collections
+import json
+import math
+import os
+import re
+import statistics
+import sys
+
+
+# Pipe separated perflog line as written by the 'logs' handler:
+# asctime|reframe version|check_info|jobid=..|var=value|ref=.. (l=.., u=..)|unit
+_TEXT_RECORD = re.compile(
+    r'^(?P<timestamp>[^|]+)\|reframe (?P<reframe>[^|]+)\|'
+    r'(?P<check>\S+) on (?P<system>[^:\s]+):(?P<partition>\S+) '
+    r'using (?P<environ>\S+)\|jobid=(?P<jobid>[^|]*)\|'
+    r'(?P<perf_var>[^=|]+)=(?P<value>[^|]*)\|'
+    r'ref=(?P<ref>\S+) \(l=(?P<lower>[^,]*), u=(?P<upper>[^)]*)\)\|'
+    r'(?P<unit>.*)$'
+)
+
+# Robust scale of the median absolute deviation for normal data
+_MAD_SCALE = 1.4826
+
+
+def to_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+
+    return value if math.isfinite(value) else None
+
+
+def parse_record(line):
+    '''Parse one perflog line, return a dict or None if not a record.'''
+    line = line.strip()
+    if not line:
+        return None
+
+    if line.startswith('{'):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+    else:
+        match = _TEXT_RECORD.match(line)
+        if not match:
+            return None
+
+        record = match.groupdict()
+
+    record['value'] = to_float(record.get('value'))
+    if record['value'] is None:
+        return None
+
+    for key in ('ref', 'lower', 'upper'):
+        record[key] = to_float(record.get(key))
+
+    return record
+
+
+def perflog_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.endswith('.log'):
+                    yield os.path.join(dirpath, name)
+
+
+def stream_records(paths):
+    '''Yield the records of all perflogs, one file at a time.'''
+    for filename in perflog_files(paths):
+        with open(filename) as fp:
+            for line in fp:
+                record = parse_record(line)
+                if record is not None:
+                    yield record
+
+
+def series_key(record):
+    return (record.get('system'), record.get('partition'),
+            record.get('environ'), record.get('check'),
+            record.get('perf_var'))
+
+
+def direction(record):
+    '''+1 if higher is better, -1 if lower is better, 0 if unknown.'''
+    lower, upper = record.get('lower'), record.get('upper')
+    if lower is None and upper is not None:
+        return -1
+    elif upper is None and lower is not None:
+        return 1
+    else:
+        return 0
+
+
+def robust_baseline(values):
+    '''Median and robust standard deviation of the values.'''
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values)
+    sigma = _MAD_SCALE * mad
+    if sigma == 0.0:
+        # constant history, fall back to a small relative spread
+        sigma = abs(median) * 1.0e-3 or 1.0e-12
+
+    return median, sigma
+
+
+def theil_sen_slope(values):
+    slopes = [(values[j] - values[i]) / (j - i)
+              for i in range(len(values))
+              for j in range(i + 1, len(values))]
+    return statistics.median(slopes)
+
+
+def mann_kendall_z(values):
+    '''Normal approximation of the Mann-Kendall trend statistic.'''
+    n = len(values)
+    s = sum((values[j] > values[i]) - (values[j] < values[i])
+            for i in range(n) for j in range(i + 1, n))
+    var = n * (n - 1) * (2 * n + 5) / 18.0
+    if s > 0:
+        return (s - 1) / math.sqrt(var)
+    elif s < 0:
+        return (s + 1) / math.sqrt(var)
+    else:
+        return 0.0
+
+
+class Series:
+    '''Bounded history of one performance variable.'''
+
+    def __init__(self, key, maxlen):
+        self.key = key
+        self.samples = collections.deque(maxlen=maxlen)
+        self.last = None
+
+    def add(self, record):
+        self.samples.append((record.get('timestamp'), record['value']))
+        self.last = record
+
+    def values(self):
+        return [v for _, v in self.samples]
+
+
+class Detector:
+    def __init__(self, window=20, recent=5, min_samples=8, threshold=3.5,
+                 trend_z=2.58, min_change=0.05):
+        self.window = window
+        self.recent = recent
+        self.min_samples = min_samples
+        self.threshold = threshold
+        self.trend_z = trend_z
+        self.min_change = min_change
+
+    def _is_worse(self, change, sign):
+        if sign == 0:
+            return True
+
+        return change * sign < 0
+
+    def _event(self, series, kind, value, baseline, score):
+        change = (value - baseline) / baseline if baseline else math.inf
+        system, partition, environ, check, perf_var = series.key
+        return {
+            'kind': kind,
+            'timestamp': series.samples[-1][0],
+            'system': system,
+            'partition': partition,
+            'environ': environ,
+            'check': check,
+            'perf_var': perf_var,
+            'value': value,
+            'baseline': baseline,
+            'change': change,
+            'score': score,
+            'unit': series.last.get('unit'),
+            'jobid': series.last.get('jobid'),
+        }
+
+    def evaluate(self, series):
+        '''Return the list of events for the current state of a series.'''
+        values = series.values()
+        if len(values) < self.min_samples:
+            return []
+
+        events = []
+        sign = direction(series.last)
+
+        # outlier: the latest sample against everything before it
+        history = values[-self.window-1:-1]
+        median, sigma = robust_baseline(history)
+        latest = values[-1]
+        score = (latest - median) / sigma
+        if (abs(score) > self.threshold and
+            abs(latest - median) > self.min_change * abs(median) and
+            self._is_worse(latest - median, sign)):
+            events.append(self._event(series, 'outlier', latest, median,
+                                      score))
+
+        # step: the recent median against the preceding window
+        if len(values) >= self.recent + self.min_samples:
+            recent = values[-self.recent:]
+            before = values[-self.recent-self.window:-self.recent]
+            median, sigma = robust_baseline(before)
+            shifted = statistics.median(recent)
+            score = (shifted - median) / (sigma / math.sqrt(len(recent)))
+            if (abs(score) > self.threshold and
+                abs(shifted - median) > self.min_change * abs(median) and
+                self._is_worse(shifted - median, sign)):
+                events.append(self._event(series, 'step', shifted, median,
+                                          score))
+
+        # drift: monotonic trend over the whole window
+        score = mann_kendall_z(values)
+        total = theil_sen_slope(values) * (len(values) - 1)
+        median = statistics.median(values)
+        if (abs(score) > self.trend_z and
+            abs(total) > self.min_change * abs(median) and
+            self._is_worse(total, sign)):
+            events.append(self._event(series, 'drift', median + total,
+                                      median, score))
+
+        return events
+
+
+def analyse(records, detector, every_sample=False):
+    '''Feed the records through the detector and return all events.
+
+    By default only the final state of every series is evaluated; with
+    ``every_sample`` the whole history is replayed.
+    '''
+    maxlen = detector.window + detector.recent
+    series = {}
+    events = []
+    for record in records:
+        key = series_key(record)
+        if key not in series:
+            series[key] = Series(key, maxlen)
+
+        series[key].add(record)
+        if every_sample:
+            events += detector.evaluate(series[key])
+
+    if not every_sample:
+        for s in series.values():
+            events += detector.evaluate(s)
+
+    return events
+
+
+def format_event(event):
+    return (f"{event['kind']:8s} {event['system']}:{event['partition']} "
+            f"{event['environ']} {event['check']} {event['perf_var']}: "
+            f"{event['value']:.4g} vs baseline {event['baseline']:.4g} "
+            f"{event['unit'] or ''} ({event['change']:+.1%}, "
+            f"score={event['score']:.1f}, jobid={event['jobid']}, "
+            f"{event['timestamp']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Detect performance regressions in ReFrame perflogs')
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help='perflog files or directories')
+    parser.add_argument('-w', '--window', type=int, default=20,
+                        help='number of samples of the baseline '
+                             '(default: %(default)s)')
+    parser.add_argument('-r', '--recent', type=int, default=5,
+                        help='number of recent samples tested for a step '
+                             'change (default: %(default)s)')
+    parser.add_argument('-m', '--min-samples', type=int, default=8,
+                        help='minimum history before testing '
+                             '(default: %(default)s)')
+    parser.add_argument('-t', '--threshold', type=float, default=3.5,
+                        help='robust z-score for outliers and steps '
+                             '(default: %(default)s)')
+    parser.add_argument('--trend-z', type=float, default=2.58,
+                        help='Mann-Kendall z-score for drifts '
+                             '(default: %(default)s)')
+    parser.add_argument('-c', '--min-change', type=float, default=0.05,
+                        help='minimum relative change to report '
+                             '(default: %(default)s)')
+    parser.add_argument('-a', '--all', action='store_true',
+                        help='report events over the whole history, not '
+                             'only for the latest samples')
+    parser.add_argument('--json', action='store_true',
+                        help='print the events as JSON lines')
+    args = parser.parse_args()
+
+    detector = Detector(window=args.window, recent=args.recent,
+                        min_samples=args.min_samples,
+                        threshold=args.threshold, trend_z=args.trend_z,
+                        min_change=args.min_change)
+    events = analyse(stream_records(args.paths), detector, args.all)
+    for event in events:
+        if args.json:
+            print(json.dumps(event))
+        else:
+            print(format_event(event))
+
+    return 1 if events else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+#!/bin/bash
+#
+# Run small checks of one partition as job steps of a single allocation.
+#
+# Instead of one Slurm job per check, which mostly waits in the queue, the
+# checks of the partition of this job are launched with srun inside its
+# allocation (see slurm_partition() in settings.py). By default the
+# hello world, MPI init and HDF5 checks are run, other ReFrame options
+# replace this selection:
+#
+#   sbatch --partition=bdw --nodes=2 tools/pool_job.sh
+#   sbatch --partition=epyc2 --nodes=1 tools/pool_job.sh -t prgenv
+#
+# RFM_POOL_MAX_JOBS limits the number of concurrent job steps, by default
+# four per node of the allocation.
+#
+#SBATCH --job-name=rfm_pool
+#SBATCH --exclusive
+#SBATCH --time=02:00:00
+#SBATCH --output=rfm_pool-%j.out
+
+if [ -z "$SLURM_JOB_ID" ]; then
+    echo "Submit with sbatch --partition=<partition> $0" >&2
+    exit 1
+fi
+
+export RFM_POOL_PARTITION="$SLURM_JOB_PARTITION"
+export RFM_POOL_MAX_JOBS="${RFM_POOL_MAX_JOBS:-$((4 * SLURM_JOB_NUM_NODES))}"
+# the job steps only take the CPUs they request, so that they run side by
+# side in the allocation
+export SLURM_EXACT=1
+
+if [ $# -eq 0 ]; then
+    set -- -n 'HelloWorld|MpiInitTest|^HDF5Test'
+fi
+
+cd "${SLURM_SUBMIT_DIR:-.}" || exit 1
+reframe -C settings.py -c checks/ -R --system "ubelix:$RFM_POOL_PARTITION" \
+    --exec-policy=async "$@" -r
@@ -0,0 +1,8 @@
+# Shared helpers of the UniBE ReFrame checks.
+#
+# The checks add the top-level directory of the repository to the front of
+# sys.path, ahead of any other package named utils, and import from here, e.g.
+#
+#   sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+#                                                   '../../..')))
+#   from utils.references import GeneratedReferencesMixin
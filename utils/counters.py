@@ -0,0 +1,147 @@
+# Hardware performance counters of benchmark runs with perf stat.
+#
+# utils/perf_counters.sh wraps the executable of a check with perf stat.
+# The counters of all tasks are summed up per run of the executable and
+# reported as performance variables together with metrics derived from
+# them, to explain a result rather than only pass or fail it.
+
+import os
+import re
+import shutil
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+
+PERF_WRAPPER = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'perf_counters.sh')
+
+#: Events of all processors
+GENERIC_EVENTS = ['cycles', 'instructions', 'cache-references',
+                  'cache-misses', 'LLC-load-misses', 'LLC-store-misses']
+
+#: Floating point instructions by vector width per processor architecture
+VECTOR_EVENTS = {
+    'broadwell': {
+        'scalar': ['fp_arith_inst_retired.scalar_double'],
+        'vector': ['fp_arith_inst_retired.128b_packed_double',
+                   'fp_arith_inst_retired.256b_packed_double'],
+    },
+    'zen2': {
+        # all SSE/AVX operations, zen2 does not count by vector width
+        'vector': ['fp_ret_sse_avx_ops.all'],
+    },
+}
+
+
+def perf_var_name(event):
+    return re.sub(r'\W', '_', event).lower()
+
+
+class PerfCountersMixin(rfm.RegressionMixin):
+    '''Collect hardware counters of the executable with perf stat.
+
+    Enable with ``-S collect_counters=yes``. The counters are summed over
+    all tasks, averaged over the runs of :class:`RepeatedRunMixin` and
+    reported as ``counter_<event>``, together with
+
+    - ``ipc``: instructions per cycle
+    - ``cache_miss_ratio``: cache misses per cache reference in %
+    - ``llc_traffic``: memory traffic estimated from the LLC misses in GB
+    - ``vector_share``: share of vector floating point instructions in %,
+      where the processor counts them
+
+    Events the processor or perf do not support are left out.
+    '''
+
+    #: Run the executable under perf stat
+    collect_counters = variable(bool, value=False)
+
+    #: The events, by default the generic and the vector events of the
+    #: processor architecture
+    counter_events = variable(list, value=[])
+
+    @run_before('run')
+    def wrap_with_perf(self):
+        if not self.collect_counters:
+            return
+
+        if not self.counter_events:
+            arch = self.current_partition.processor.arch
+            self.counter_events = list(GENERIC_EVENTS)
+            for events in VECTOR_EVENTS.get(arch, {}).values():
+                self.counter_events += events
+
+        shutil.copy(PERF_WRAPPER, self.stagedir)
+        self.executable_opts = ([','.join(self.counter_events),
+                                 self.executable] + self.executable_opts)
+        self.executable = './perf_counters.sh'
+
+    def _counter_records(self, event):
+        '''The values of an event, one per task and run of the executable.'''
+        return sn.evaluate(sn.extractall(
+            rf'^(?P<value>\d+(\.\d+)?),[^,]*,{re.escape(event)}(:u)?,',
+            self.stderr, 'value', float))
+
+    @run_before('performance')
+    def set_counter_perf_patterns(self):
+        if not self.collect_counters:
+            return
+
+        records = {}
+        for event in self.counter_events:
+            values = self._counter_records(event)
+            if values:
+                records[event] = values
+
+        if not records:
+            return
+
+        # perf stat writes one record per event, task and run
+        num_records = len(records.get('cycles',
+                                      max(records.values(), key=len)))
+        num_runs = max(num_records // max(self.job.num_tasks, 1), 1)
+        counters = {event: sum(values) / num_runs
+                    for event, values in records.items()}
+
+        metrics = {}
+        for event, value in counters.items():
+            metrics[f'counter_{perf_var_name(event)}'] = (value, 'count')
+
+        if counters.get('cycles'):
+            metrics['ipc'] = (counters.get('instructions', 0.0) /
+                              counters['cycles'], 'instr/cycle')
+
+        if counters.get('cache-references'):
+            metrics['cache_miss_ratio'] = (
+                100.0 * counters.get('cache-misses', 0.0) /
+                counters['cache-references'], '%'
+            )
+
+        llc_misses = [counters[e] for e in ['LLC-load-misses',
+                                            'LLC-store-misses']
+                      if e in counters]
+        if llc_misses:
+            # one cache line per miss
+            metrics['llc_traffic'] = (64 * sum(llc_misses) * 1.0e-9, 'GB')
+
+        arch = self.current_partition.processor.arch
+        vector_events = VECTOR_EVENTS.get(arch, {})
+        fp_scalar = sum(counters.get(e, 0.0)
+                        for e in vector_events.get('scalar', []))
+        fp_vector = sum(counters.get(e, 0.0)
+                        for e in vector_events.get('vector', []))
+        if vector_events.get('scalar') and fp_scalar + fp_vector:
+            metrics['vector_share'] = (
+                100.0 * fp_vector / (fp_scalar + fp_vector), '%'
+            )
+
+        if getattr(self, 'perf_patterns', None) is None:
+            self.perf_patterns = {}
+
+        partition_name = self.current_partition.fullname
+        for name, (value, unit) in metrics.items():
+            self.perf_patterns[name] = sn.defer(value)
+            if f'{partition_name}:{name}' not in self.reference:
+                self.reference[f'{partition_name}:{name}'] = (0, None, None,
+                                                              unit)
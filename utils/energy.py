@@ -0,0 +1,97 @@
+# Energy of CPU benchmarks from the RAPL counters of the nodes.
+#
+# utils/rapl_energy.sh wraps the executable of a check and prints the
+# energy of the package and DRAM domains of its node. The counters are
+# only readable if the site allows it (energy_uj is root-only by default on
+# recent kernels), otherwise the checks run without energy measurement.
+
+import os
+import shutil
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+
+
+RAPL_WRAPPER = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'rapl_energy.sh')
+
+
+class EnergyMixin(rfm.RegressionMixin):
+    '''Measure the energy of the nodes while the executable runs.
+
+    The check must run one task per node. The performance variables are
+
+    - ``package_energy``, ``dram_energy``: energy of all nodes per run of
+      the executable in J
+    - ``power``: average power of the packages and DRAM per node in W
+    - ``energy_efficiency``: :meth:`work_rate` per W, if the check defines
+      it
+
+    The energy covers the whole run of the executable, including its
+    initialisation.
+    '''
+
+    #: Wrap the executable with the RAPL energy measurement
+    measure_energy = variable(bool, value=True)
+
+    #: Unit of the energy efficiency, :meth:`work_rate` divided by W
+    efficiency_unit = variable(str, value='')
+
+    def work_rate(self):
+        '''The deferred throughput of all nodes for the energy efficiency,
+        None for no efficiency.'''
+        return None
+
+    @run_before('run')
+    def wrap_executable(self):
+        if not self.measure_energy:
+            return
+
+        shutil.copy(RAPL_WRAPPER, self.stagedir)
+        self.executable_opts = [self.executable] + self.executable_opts
+        self.executable = './rapl_energy.sh'
+
+    def _energy(self, domain):
+        return sn.sum(sn.extractall(
+            rf'^rapl: host=\S+ domain={domain}\S* energy_j=(?P<energy>\S+)',
+            self.stdout, 'energy', float))
+
+    @run_before('performance')
+    def set_energy_perf_patterns(self):
+        if not self.measure_energy:
+            return
+
+        # one package-0 record per node and run of the executable
+        run_times = sn.evaluate(sn.extractall(
+            r'^rapl: host=\S+ domain=package-0 .* time_s=(?P<time>\S+)',
+            self.stdout, 'time', float))
+        if not run_times:
+            # no counters, the benchmark is still checked
+            return
+
+        num_nodes = len(set(sn.evaluate(sn.extractall(
+            r'^rapl: host=(?P<host>\S+) domain=', self.stdout, 'host'))))
+        num_runs = max(len(run_times) // num_nodes, 1)
+        package_energy = self._energy('package')
+        dram_energy = self._energy('dram')
+        power = (package_energy + dram_energy) / sum(run_times)
+        energy_patterns = {
+            'package_energy': (package_energy / num_runs, 'J'),
+            'dram_energy': (dram_energy / num_runs, 'J'),
+            'power': (power, 'W'),
+        }
+        work_rate = self.work_rate()
+        if work_rate is not None:
+            energy_patterns['energy_efficiency'] = (
+                work_rate / (power * num_nodes), self.efficiency_unit
+            )
+
+        if getattr(self, 'perf_patterns', None) is None:
+            self.perf_patterns = {}
+
+        partition_name = self.current_partition.fullname
+        for name, (pattern, unit) in energy_patterns.items():
+            self.perf_patterns[name] = pattern
+            if f'{partition_name}:{name}' not in self.reference:
+                self.reference[f'{partition_name}:{name}'] = (0, None, None,
+                                                              unit)
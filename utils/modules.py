@@ -0,0 +1,102 @@
+# Cached module lookups of the checks.
+#
+# reframe.utility.find_modules loads every programming environment of every
+# partition and queries the modules system for each of them, which takes
+# minutes with Lmod on UBELIX. Called in the class body of a check it runs
+# whenever the check file is loaded, also for `reframe -l` and when only
+# unrelated checks are selected. The checks use find_modules of this module
+# instead in a setup hook: the result is kept per system in a JSON index
+#
+#   {
+#       "<substr> <environ_mapping>": {
+#           "created": 1792382400.0,
+#           "modules": [["<partition>", "<environ>", "<module>"], ...]
+#       }
+#   }
+#
+# and queried again only when it is older than RFM_MODULE_INDEX_TTL seconds
+# (default one day) or when RFM_MODULE_INDEX_REFRESH is set, e.g. after
+# installing new modules:
+#
+#   RFM_MODULE_INDEX_REFRESH=1 reframe -C settings.py -c checks/ -R -n HDF5 -r
+
+import json
+import os
+import tempfile
+import time
+
+import reframe.core.runtime as rt
+import reframe.utility as util
+
+
+MODULE_INDEX_DIR = os.path.join(
+    os.getenv('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'),
+                                             '.cache')),
+    'reframe-checks'
+)
+
+#: Default lifetime of the index entries in seconds
+MODULE_INDEX_TTL = 24 * 3600
+
+# keys looked up by this process, refreshed at most once per run
+_refreshed = set()
+
+
+def module_index_file(system):
+    return os.path.join(os.getenv('RFM_MODULE_INDEX_DIR', MODULE_INDEX_DIR),
+                        f'modules_{system}.json')
+
+
+def _load_index(filename):
+    try:
+        with open(filename) as fp:
+            return json.load(fp)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_index(filename, index):
+    # replace the file at once, other ReFrame instances may read it
+    dirname = os.path.dirname(filename)
+    os.makedirs(dirname, exist_ok=True)
+    fd, tmpname = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    with os.fdopen(fd, 'w') as fp:
+        json.dump(index, fp, indent=4)
+
+    os.replace(tmpname, filename)
+
+
+def find_modules(substr, environ_mapping=None):
+    '''The cached result of :func:`reframe.utility.find_modules`.
+
+    Returns a list of ``(partition, environ, module)`` tuples.
+    '''
+    filename = module_index_file(rt.runtime().system.name)
+    key = f'{substr} {json.dumps(environ_mapping, sort_keys=True)}'
+    ttl = float(os.getenv('RFM_MODULE_INDEX_TTL', MODULE_INDEX_TTL))
+    index = _load_index(filename)
+    entry = index.get(key)
+    refresh = (os.getenv('RFM_MODULE_INDEX_REFRESH') and
+               key not in _refreshed)
+    if entry is None or refresh or time.time() - entry['created'] > ttl:
+        entry = {
+            'created': time.time(),
+            'modules': [list(tup) for tup in
+                        util.find_modules(substr, environ_mapping)]
+        }
+        # entries of other lookups may have been added in the meantime
+        index = _load_index(filename)
+        index[key] = entry
+        _save_index(filename, index)
+        _refreshed.add(key)
+
+    return [tuple(tup) for tup in entry['modules']]
+
+
+def latest_module(substr, partition, environ, environ_mapping=None):
+    '''The latest module matching ``substr`` for a partition and
+    programming environment, None if there is none.'''
+    env_mods = sorted(mod for part, env, mod in
+                      find_modules(substr, environ_mapping)
+                      if part == partition and env.startswith(environ))
+    return env_mods[-1] if env_mods else None
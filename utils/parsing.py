@@ -0,0 +1,102 @@
+# Single-pass parsing of check output files.
+#
+# Every sn.extractsingle, sn.findall or sn.assert_found call reads and
+# scans its file again, which is slow for checks with many performance
+# variables or assertions on large outputs. An OutputParser reads its file
+# once, matches every line against all of its patterns and keeps the
+# matches; the sanity and performance expressions are then evaluated from
+# this result.
+
+import os
+import re
+
+import reframe.utility.sanity as sn
+from reframe.core.exceptions import SanityError
+
+
+class OutputParser:
+    '''Match all lines of an output file against a set of patterns once.
+
+    ``patterns`` maps names to regular expressions, which are matched
+    against single lines (``re.search``). The methods return deferred
+    expressions like their counterparts in ``reframe.utility.sanity``; the
+    file is parsed at the first evaluation and again only if it changes.
+    The keyword arguments select matches whose named groups fully match
+    the given regular expressions::
+
+        out = OutputParser(self.stdout, {
+            'time': r'^(?P<host>\\S+): time=(?P<time>\\S+)'
+        })
+        out.extractsingle('time', 'time', float, host='bnode001')
+    '''
+
+    def __init__(self, filename, patterns):
+        self.filename = filename
+        self.patterns = {name: re.compile(regex)
+                         for name, regex in patterns.items()}
+        self._state = None
+        self._matches = {}
+
+    def matches(self, name, **where):
+        '''All matches of a pattern, parsing the file if needed.'''
+        filename = sn.evaluate(self.filename)
+        stat = os.stat(filename)
+        state = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+        if state != self._state:
+            self._matches = {name: [] for name in self.patterns}
+            with open(filename) as fp:
+                for line in fp:
+                    for pattern_name, pattern in self.patterns.items():
+                        match = pattern.search(line)
+                        if match:
+                            self._matches[pattern_name].append(match)
+
+            self._state = state
+
+        matches = self._matches[name]
+        if where:
+            conditions = {tag: re.compile(regex)
+                          for tag, regex in where.items()}
+            matches = [m for m in matches
+                       if all(cond.fullmatch(m.group(tag) or '')
+                              for tag, cond in conditions.items())]
+
+        return matches
+
+    def _values(self, name, tag, conv, where):
+        conv = conv or (lambda x: x)
+        return [conv(m.group(tag)) for m in self.matches(name, **where)]
+
+    def _not_found(self, name, where):
+        return (f'{self.patterns[name].pattern!r} with {where} not found in '
+                f'{sn.evaluate(self.filename)}')
+
+    @sn.deferrable
+    def extractall(self, name, tag=0, conv=None, **where):
+        return self._values(name, tag, conv, where)
+
+    @sn.deferrable
+    def extractsingle(self, name, tag=0, conv=None, item=0, **where):
+        values = self._values(name, tag, conv, where)
+        if not values:
+            raise SanityError(self._not_found(name, where))
+
+        return values[item]
+
+    @sn.deferrable
+    def lookup(self, name, key_tag, tag, conv=None):
+        '''The values of a pattern as a dict keyed by another group.'''
+        conv = conv or (lambda x: x)
+        return {m.group(key_tag): conv(m.group(tag))
+                for m in self.matches(name)}
+
+    @sn.deferrable
+    def count(self, name, **where):
+        return len(self.matches(name, **where))
+
+    @sn.deferrable
+    def assert_found(self, name, msg=None, **where):
+        if not self.matches(name, **where):
+            raise SanityError(msg or self._not_found(name, where))
+
+        return True
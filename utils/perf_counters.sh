@@ -0,0 +1,26 @@
+#!/bin/bash
+#
+# Hardware performance counters of a command with perf stat. Used by
+# utils.counters.
+#
+# Usage: perf_counters.sh <comma separated events> <command> [args...]
+#
+# The counters are written to stderr in the CSV format of perf stat -x,:
+#
+#   123456789,,instructions:u,1000000,100.00,,
+#
+# Without perf the command runs unmeasured and
+#
+#   perf: host=bnode001 unavailable
+#
+# is written to stderr.
+
+events=$1
+shift
+
+if ! command -v perf > /dev/null 2>&1; then
+    echo "perf: host=$(hostname -s) unavailable" >&2
+    exec "$@"
+fi
+
+exec perf stat -x, -e "$events" -- "$@"
@@ -0,0 +1,58 @@
+#!/bin/bash
+#
+# Energy of the RAPL domains of the node (packages and DRAM) while a
+# command runs, read from /sys/class/powercap. Used by utils.energy.
+#
+# Usage: rapl_energy.sh <command> [args...]
+#
+# Output after the output of the command:
+#
+#   rapl: host=bnode001 domain=package-0 energy_j=1234.567 time_s=10.123
+#   rapl: host=bnode001 domain=dram energy_j=123.456 time_s=10.123
+#
+# Without readable counters the command runs unmeasured and
+#
+#   rapl: host=bnode001 unavailable
+#
+# is printed.
+
+powercap=${RAPL_POWERCAP_DIR:-/sys/class/powercap}
+host=$(hostname -s)
+domains=()
+for domain in "$powercap"/intel-rapl:*; do
+    if [ -r "$domain/energy_uj" ]; then
+        domains+=("$domain")
+    fi
+done
+
+if [ ${#domains[@]} -eq 0 ]; then
+    echo "rapl: host=${host} unavailable"
+    exec "$@"
+fi
+
+before=()
+for domain in "${domains[@]}"; do
+    before+=("$(cat "$domain/energy_uj")")
+done
+t0=$(date +%s%N)
+
+"$@"
+status=$?
+
+t1=$(date +%s%N)
+for i in "${!domains[@]}"; do
+    domain=${domains[$i]}
+    after=$(cat "$domain/energy_uj")
+    delta=$((after - before[i]))
+    if [ $delta -lt 0 ]; then
+        # the counter wrapped around
+        delta=$((delta + $(cat "$domain/max_energy_range_uj")))
+    fi
+
+    awk -v host="$host" -v name="$(cat "$domain/name")" -v uj="$delta" \
+        -v ns=$((t1 - t0)) \
+        'BEGIN { printf "rapl: host=%s domain=%s energy_j=%.3f time_s=%.3f\n",
+                 host, name, uj * 1.0e-6, ns * 1.0e-9 }'
+done
+
+exit $status
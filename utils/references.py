@@ -0,0 +1,79 @@
+# Performance references generated from the perflog history.
+#
+# tools/generate_references.py writes one JSON file per system, by default
+# references/<system>.json at the top of the repository:
+#
+#   {
+#       "system": "ubelix",
+#       "generated": "2026-10-19T03:00:00",
+#       "references": {
+#           "<check name>": {
+#               "<environ>": {
+#                   "<partition>": {
+#                       "<perf_var>": [value, lower, upper, unit]
+#                   }
+#               }
+#           }
+#       }
+#   }
+#
+# Checks deriving from GeneratedReferencesMixin use these values instead of
+# their hand-coded references. Performance variables without generated data
+# keep their hand-coded reference.
+
+import functools
+import json
+import os
+
+import reframe as rfm
+
+
+REFERENCES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'references'
+)
+
+
+def reference_file(system):
+    return os.path.join(os.getenv('RFM_REFERENCES_DIR', REFERENCES_DIR),
+                        f'{system}.json')
+
+
+@functools.lru_cache(maxsize=None)
+def load_references(filename):
+    '''Return the references of a data file, empty if it does not exist.'''
+    try:
+        with open(filename) as fp:
+            return json.load(fp).get('references', {})
+    except FileNotFoundError:
+        return {}
+
+
+def lookup_references(system, partition, environ, check):
+    '''Generated references of a check as {perf_var: (value, l, u, unit)}.'''
+    refs = load_references(reference_file(system))
+    refs = refs.get(check, {}).get(environ, {}).get(partition, {})
+    return {var: tuple(ref) for var, ref in refs.items()}
+
+
+class GeneratedReferencesMixin(rfm.RegressionMixin):
+    '''Take the performance references from the generated data file.
+
+    The lookup happens just before the performance stage, so references set
+    by the check itself in any earlier stage (also per hostname in the
+    sanity stage like DGEMMTest) serve as fallback.
+    '''
+
+    #: Use the generated references if available
+    use_generated_references = variable(bool, value=True)
+
+    @run_before('performance')
+    def set_generated_references(self):
+        if not self.use_generated_references:
+            return
+
+        refs = lookup_references(self.current_system.name,
+                                 self.current_partition.name,
+                                 self.current_environ.name, self.name)
+        partition_name = self.current_partition.fullname
+        for perf_var, ref in refs.items():
+            self.reference[f'{partition_name}:{perf_var}'] = ref
@@ -0,0 +1,77 @@
+# Repeated runs of a benchmark within one job.
+#
+# A single run is often too noisy for tight reference tolerances. The
+# executable is run num_repeats times in the job and the performance
+# variables are the median of the samples after outlier rejection,
+# accompanied by their spread.
+
+import reframe as rfm
+import reframe.utility.sanity as sn
+from reframe.core.launchers import LauncherWrapper
+
+from utils.stats import cv, iqr, median, reject_outliers
+
+
+class RepeatedRunMixin(rfm.RegressionMixin):
+    '''Run the executable several times and aggregate the samples.
+
+    Checks extract all samples of a quantity, e.g. with ``sn.extractall``,
+    and pass them to :meth:`repeated_perf_variable`, which adds the
+    performance variables
+
+    - ``<name>``: the median of the samples without outliers
+    - ``<name>_iqr``: their interquartile range
+    - ``<name>_cv``: their coefficient of variation in percent
+
+    The reference of ``<name>`` is the one of the check.
+
+    Only the launcher command is repeated, the ``prerun_cmds`` and
+    ``postrun_cmds`` run once. Checks that replace ``self.job.launcher``
+    must do so before the ``run`` stage hooks of this mixin. The
+    ``time_limit`` of the check is multiplied by :attr:`num_repeats`; if it
+    is not set, the time limit of the partition applies to all runs.
+    '''
+
+    #: Number of runs of the executable within the job
+    num_repeats = variable(int, value=5)
+
+    #: Samples with a modified z-score above this value are rejected
+    outlier_threshold = variable(float, value=3.5)
+
+    def repeated_perf_variable(self, name, samples, unit):
+        if getattr(self, 'perf_patterns', None) is None:
+            self.perf_patterns = {}
+
+        kept = reject_outliers(samples, self.outlier_threshold)
+        self.perf_patterns[name] = median(kept)
+        self.perf_patterns[f'{name}_iqr'] = iqr(kept)
+        self.perf_patterns[f'{name}_cv'] = cv(kept)
+        if not hasattr(self, '_repeated_units'):
+            self._repeated_units = {}
+
+        self._repeated_units[name] = unit
+
+    @run_before('run')
+    def repeat_executable(self):
+        # the references of the spread are added here, after the checks
+        # have set their own references
+        for name, unit in getattr(self, '_repeated_units', {}).items():
+            self.reference[f'*:{name}_iqr'] = (0, None, None, unit)
+            self.reference[f'*:{name}_cv'] = (0, None, None, '%')
+
+        if self.num_repeats > 1:
+            # bash runs the launcher command, passed as its arguments, in
+            # the loop
+            loop = (f'for _rfm_repeat in $(seq {self.num_repeats}); do '
+                    f'echo "Repetition $_rfm_repeat"; "$@"; done')
+            self.job.launcher = LauncherWrapper(
+                self.job.launcher, 'bash', ['-c', f"'{loop}'", 'rfm_repeat']
+            )
+            if self.time_limit:
+                self.time_limit = self.time_limit * self.num_repeats
+
+    @sn.deferrable
+    def assert_samples(self, samples):
+        '''Assert that there is one sample per run.'''
+        return sn.assert_eq(sn.count(samples), max(self.num_repeats, 1),
+                            msg='expected {1} samples, found {0}')
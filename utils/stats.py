@@ -0,0 +1,60 @@
+# Deferrable statistics helpers for performance variables.
+
+import math
+import statistics
+
+import reframe.utility.sanity as sn
+
+
+@sn.deferrable
+def percentile(samples, q):
+    '''Nearest-rank percentile of the samples.'''
+    samples = sorted(samples)
+    rank = max(math.ceil(q / 100.0 * len(samples)), 1)
+    return samples[rank - 1]
+
+
+@sn.deferrable
+def median(samples):
+    return statistics.median(samples)
+
+
+@sn.deferrable
+def reject_outliers(samples, threshold=3.5):
+    '''The samples without outliers.
+
+    A sample is an outlier if its modified z-score, the distance to the
+    median in units of the scaled median absolute deviation, is larger than
+    threshold.
+    '''
+    samples = list(samples)
+    if len(samples) < 3:
+        return samples
+
+    med = statistics.median(samples)
+    mad = 1.4826 * statistics.median(abs(x - med) for x in samples)
+    if mad == 0:
+        return samples
+
+    return [x for x in samples if abs(x - med) / mad <= threshold]
+
+
+@sn.deferrable
+def iqr(samples):
+    '''Interquartile range of the samples.'''
+    samples = list(samples)
+    if len(samples) < 2:
+        return 0.0
+
+    q1, _, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+    return q3 - q1
+
+
+@sn.deferrable
+def cv(samples):
+    '''Coefficient of variation of the samples in percent.'''
+    samples = list(samples)
+    if len(samples) < 2 or statistics.mean(samples) == 0:
+        return 0.0
+
+    return 100.0 * statistics.stdev(samples) / abs(statistics.mean(samples))
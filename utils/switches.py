@@ -0,0 +1,59 @@
+# Network switch topology of the cluster.
+#
+# The leaf switches and their nodes are read from the Slurm tree topology
+# file (topology.conf):
+#
+#   SwitchName=leaf01 Nodes=bnode[001-024]
+#   SwitchName=leaf02 Nodes=bnode[025-048]
+#   SwitchName=spine01 Switches=leaf[01-02]
+#
+# Switches with Nodes= are leaves, the others are ignored.
+
+import re
+
+
+SLURM_TOPOLOGY_FILE = '/etc/slurm/topology.conf'
+
+
+def expand_hostlist(hostlist):
+    '''Expand a Slurm hostlist, e.g. 'bnode[001-003,010],gnode01'.
+
+    Hosts with several brackets, e.g. 'r[1-2]n[01-04]', are expanded
+    recursively, the first bracket varies slowest.
+    '''
+    hosts = []
+    for host in re.findall(r'(?:[^,\[]|\[[^\]]*\])+', hostlist):
+        match = re.match(r'([^\[]*)\[([^\]]*)\](.*)', host)
+        if not match:
+            hosts.append(host)
+            continue
+
+        prefix, ranges, rest = match.groups()
+        for item in ranges.split(','):
+            first, _, last = item.partition('-')
+            last = last or first
+            width = len(first)
+            for i in range(int(first), int(last) + 1):
+                hosts += expand_hostlist(f'{prefix}{i:0{width}d}{rest}')
+
+    return hosts
+
+
+def read_leaf_switches(filename=SLURM_TOPOLOGY_FILE):
+    '''Return the leaf switches of a topology file as {switch: [nodes]}.'''
+    leaves = {}
+    with open(filename) as fp:
+        for line in fp:
+            line = line.split('#', 1)[0]
+            fields = dict(re.findall(r'(\w+)=(\S+)', line))
+            if 'SwitchName' in fields and 'Nodes' in fields:
+                leaves[fields['SwitchName']] = expand_hostlist(
+                    fields['Nodes'])
+
+    return leaves
+
+
+def leaf_of_nodes(leaves):
+    '''Invert the leaf switches to {node: switch}.'''
+    return {node: switch
+            for switch, nodes in leaves.items() for node in nodes}
@@ -0,0 +1,85 @@
+# Job sizing from the processor topology of the partitions.
+#
+# The topology (sockets, NUMA domains, cores, SMT) is declared in the
+# 'processor' entry of the partitions in settings.py or auto-detected by
+# ReFrame. A partition may limit the cores a job can use with the
+# 'max_cpus_per_node' entry of its 'extras' (e.g. the gpu partition).
+
+import reframe as rfm
+
+
+class TopologyJobSizeMixin(rfm.RegressionMixin):
+    '''Size the tasks and threads of a check to fill nodes or domains.
+
+    One task is placed on every ``task_domain`` of a node and its threads
+    fill the cores of that domain:
+
+    - ``'node'``: one task per node using all cores
+    - ``'socket'``: one task per socket
+    - ``'numa'``: one task per NUMA domain
+    - ``'core'``: one single-threaded task per core
+
+    With ``domains_per_node`` only that many domains of every node are
+    used, e.g. ``task_domain = 'numa'`` and ``domains_per_node = 1`` runs a
+    single task on one NUMA domain.
+
+    Checks on partitions without topology information are skipped.
+    '''
+
+    #: The domain of a node every task fills
+    task_domain = variable(str, value='node')
+
+    #: Number of nodes of the job, 0 takes all nodes of the partition and
+    #: -N at least N nodes (flexible node allocation, see
+    #: ``--flex-alloc-nodes``)
+    num_job_nodes = variable(int, value=1)
+
+    #: Number of domains used per node, 0 uses all of them
+    domains_per_node = variable(int, value=0)
+
+    def _domains(self, processor):
+        if self.task_domain == 'node':
+            return 1
+        elif self.task_domain == 'socket':
+            return processor.num_sockets
+        elif self.task_domain == 'numa':
+            return processor.num_numa_nodes
+        elif self.task_domain == 'core':
+            return processor.num_cores
+        else:
+            raise ValueError(f'unknown task domain: {self.task_domain!r}')
+
+    @run_after('setup')
+    def set_job_size_from_topology(self):
+        processor = self.current_partition.processor
+        max_cpus = self.current_partition.extras.get('max_cpus_per_node')
+        num_cores = processor.num_cores or max_cpus
+        self.skip_if(
+            num_cores is None,
+            f'no processor topology for {self.current_partition.fullname}'
+        )
+        domains = self._domains(processor) or 1
+        if max_cpus:
+            # the job may only use part of the node, place all tasks there
+            num_cores = min(num_cores, max_cpus)
+            domains = min(domains, num_cores)
+
+        cores_per_domain = max(num_cores // domains, 1)
+        if self.domains_per_node:
+            domains = min(domains, self.domains_per_node)
+
+        cpus_per_task = cores_per_domain
+        if self.use_multithreading and processor.num_cpus_per_core:
+            cpus_per_task *= processor.num_cpus_per_core
+
+        self.num_tasks_per_node = domains
+        if self.num_job_nodes == 0:
+            # flexible allocation of all nodes, ReFrame sets num_tasks from
+            # num_tasks_per_node and the nodes found
+            self.num_tasks = 0
+        else:
+            # negative for a flexible allocation of at least that many nodes
+            self.num_tasks = domains * self.num_job_nodes
+
+        self.num_cpus_per_task = cpus_per_task
+        self.variables['OMP_NUM_THREADS'] = str(cpus_per_task)